@@ -0,0 +1,399 @@
+"""
+Headless benchmarks of the ScenePilotPro hot paths.
+
+Runs under QT_QPA_PLATFORM=offscreen in a temporary working directory (so the
+real spaces/ folder is never touched) and writes the timings as JSON:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --sizes 10 1000 --repeat 3 --only scene gallery
+"""
+import time
+
+PROCESS_START = time.perf_counter()  # Reference point of the cold start measurement
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.generate_spaces import generate_photo, generate_spaces
+
+DEFAULT_SIZES = (10, 1000, 10000)
+BENCHMARKS = ("scene", "gallery", "thumbnails", "save", "startup")
+
+def timed(function, repeat):
+    """Run function repeat times and return the durations in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+def result(name, times, **params):
+    """Summarize a list of durations (seconds) as a JSON-ready record in milliseconds."""
+    times_ms = [t * 1000.0 for t in times]
+    return {
+        "name": name,
+        "params": params,
+        "times_ms": [round(t, 4) for t in times_ms],
+        "min_ms": round(min(times_ms), 4),
+        "median_ms": round(statistics.median(times_ms), 4),
+        "max_ms": round(max(times_ms), 4),
+    }
+
+def wait_until(app, condition, timeout=120.0):
+    """Process events until condition() is true; return False on timeout."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.0005)
+    return True
+
+def silence_dialogs():
+    """Make the message boxes answer immediately, as a user clicking Yes/OK would."""
+    from PyQt6.QtWidgets import QMessageBox
+    QMessageBox.information = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Ok)
+    QMessageBox.warning = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Ok)
+    QMessageBox.critical = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Ok)
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Yes)
+
+def bench_scene(app, args):
+    """Scene builds: legacy plot_room/create_door into a cleared view, and the editor's RoomScene."""
+    import pyqtgraph.opengl as gl
+    from components.space.room_plot import plot_room, create_door
+    from components.space.room_scene import RoomScene
+
+    view = gl.GLViewWidget()
+    dimensions = {"width": 6.0, "length": 4.0, "height": 3.0}
+    color = {"hue": 200, "saturation": 50, "value": 90}
+
+    def build_legacy():
+        view.clear()
+        plot_room(view, 6.0, 4.0, 3.0, None, h=0.55, s=0.5, v=0.9)
+        create_door(view, 1.0, 2.0, 0.5, 1, dimensions, color)
+
+    scene = RoomScene(gl.GLViewWidget())
+    sizes = iter(range(10 ** 9))
+
+    def update_scene():
+        k = next(sizes) % 10
+        scene.update(5.0 + k * 0.1, 4.0, 3.0, h=0.55, s=0.5, v=0.9)
+        scene.set_door(1.0, 2.0, 0.5, 1)
+
+    hues = iter(range(10 ** 9))
+
+    def recolor_scene():
+        scene.set_color((next(hues) % 360) / 360.0, 0.5, 0.9)
+
+    # Hover picking on a 10 x 10 grid of rooms with one door each
+    import numpy as np
+    from components.space.space_model import SpaceModel
+    model = SpaceModel()
+    for index in range(1, 100):
+        model.add_room(3.0, 3.0, 2.0, ((index % 10) * 3.0, (index // 10) * 3.0, 0.0))
+    for room in range(100):
+        model.openings.append({"room": room, "width": 1.0, "height": 1.8, "offset": 1.0, "wall_index": room % 4})
+    rng = np.random.default_rng(0)
+    targets = iter(rng.uniform((0, 0, 0), (30, 30, 2), (10 ** 5, 3)))
+
+    def pick_surface():
+        target = next(targets)
+        origin = np.array([-10.0, -10.0, 15.0])
+        model.pick_surface(origin, (target - origin) / np.linalg.norm(target - origin))
+
+    # 500 markers added one by one to the editor scene (one instanced item per primitive)
+    object_scene = RoomScene(gl.GLViewWidget())
+    primitives = iter(["box", "sphere", "arrow"] * 10 ** 6)
+    positions = iter(rng.uniform((0, 0, 0), (30, 30, 2), (10 ** 5, 3)))
+
+    def add_objects():
+        object_scene.objects.clear()
+        for _ in range(500):
+            object_scene.objects.add(next(primitives), next(positions), (0.9, 0.6, 0.2, 1.0), yaw=45.0)
+
+    # A 200-step slider drag recorded into the undo history (merged into one entry)
+    from components.space.edit_history import EditCommand, EditHistory
+    history = EditHistory()
+
+    def record_drag():
+        history.seal()
+        for hue in range(200):
+            history.push(EditCommand("state", 0, {"hue": float(hue)}, {"hue": float(hue + 1)}, "color"))
+
+    return [
+        result("plot_room_create_door", timed(build_legacy, args.repeat * 10)),
+        result("room_scene_update", timed(update_scene, args.repeat * 10)),
+        result("room_scene_set_color", timed(recolor_scene, args.repeat * 10)),
+        result("space_model_pick_surface", timed(pick_surface, args.repeat * 100), rooms=len(model.rooms)),
+        result("scene_objects_add", timed(add_objects, args.repeat), objects=500, items=len(object_scene.objects.items)),
+        result("edit_history_slider_drag", timed(record_drag, args.repeat * 10), steps=200, entries=len(history), history_bytes=history.bytes),
+    ]
+
+def bench_gallery(app, args):
+    """Gallery loading at several library sizes, cold (empty catalog) and warm."""
+    from localization.language import Language
+    from components.space.space_catalog import get_space_catalog
+    from widgets.create_space_widget import CreateSpaceWidget
+    from widgets.edit_space_widget import EditSpaceWidget
+
+    language = Language()
+    results = []
+    for size in args.sizes:
+        spaces_directory = os.path.join(os.getcwd(), "spaces")
+        shutil.rmtree(spaces_directory, ignore_errors=True)
+        generate_spaces(spaces_directory, size, seed=size)
+
+        create_widget = CreateSpaceWidget(language, None)
+        properties = create_widget.right_frame
+        wait_until(app, lambda: not properties.space_loader.loading)
+
+        for state in ("cold", "warm"):
+            first, total = [], []
+            for _ in range(args.repeat):
+                if state == "cold":
+                    shutil.rmtree(os.path.join(spaces_directory, ".cache"), ignore_errors=True)
+                    get_space_catalog("spaces").entries = None  # Forget the in-memory copy too
+                start = time.perf_counter()
+                properties.load_saved_spaces()
+                wait_until(app, lambda: properties.gallery_model.rowCount() > 0 or not properties.space_loader.loading)
+                first.append(time.perf_counter() - start)
+                wait_until(app, lambda: not properties.space_loader.loading)
+                total.append(time.perf_counter() - start)
+            results.append(result("properties_load_saved_spaces_first_batch", first, spaces=size, catalog=state))
+            results.append(result("properties_load_saved_spaces", total, spaces=size, catalog=state))
+        create_widget.deleteLater()
+
+        edit_widget = EditSpaceWidget(language, "spaces")
+        wait_until(app, lambda: not edit_widget.space_loader.loading)
+        spaces = list(edit_widget.spaces)
+
+        def display():
+            edit_widget.display_spaces(spaces)
+            app.processEvents()
+
+        results.append(result("edit_space_display_spaces", timed(display, args.repeat), spaces=size))
+        edit_widget.deleteLater()
+        app.processEvents()
+    return results
+
+def bench_thumbnails(app, args):
+    """Photo thumbnail decoding: the pooled reduced-size decoder (cold and disk-cached) against a full decode."""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QPixmap
+    from components.space.photo_thumbnails import PhotoThumbnailService
+
+    photos_directory = os.path.join(os.getcwd(), "photos")
+    os.makedirs(photos_directory, exist_ok=True)
+    paths = []
+    rng = random.Random(0)
+    for i in range(args.photos):
+        path = os.path.join(photos_directory, f"photo_{i}.jpg")
+        generate_photo(path, 4000, 3000, rng)
+        paths.append(path)
+
+    def full_decode():
+        for path in paths:
+            QPixmap(path).scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio)
+
+    def pooled(cache_dir):
+        service = PhotoThumbnailService(cache_dir=cache_dir)
+        for path in paths:
+            service.thumbnail(path, 200, 200)
+        wait_until(app, lambda: not service.pending)
+
+    cold, cached = [], []
+    for _ in range(args.repeat):
+        cache_dir = tempfile.mkdtemp(dir=os.getcwd())
+        cold += timed(lambda: pooled(cache_dir), 1)
+        cached += timed(lambda: pooled(cache_dir), 1)
+
+    # Background import of the same photos into two spaces: the GUI thread only queues them
+    from components.space.image_store import ImageImporter, ImageStore
+    submitted, imported = [], []
+    for _ in range(args.repeat):
+        store_directory = tempfile.mkdtemp(dir=os.getcwd())
+        importer = ImageImporter(ImageStore(os.path.join(store_directory, ".store")))
+        folders = [os.path.join(store_directory, name, "images") for name in ("A", "B")]
+        start = time.perf_counter()
+        submitted += timed(lambda: [importer.import_images(paths, folder) for folder in folders], 1)
+        wait_until(app, lambda: not importer.is_busy(), timeout=600)
+        imported.append(time.perf_counter() - start)
+    objects = sum(len(files) for _, _, files in os.walk(os.path.join(store_directory, ".store", "objects")))
+
+    return [
+        result("photo_full_decode_scaled", timed(full_decode, args.repeat), photos=len(paths), size="4000x3000"),
+        result("photo_thumbnails_pooled_cold", cold, photos=len(paths), size="4000x3000"),
+        result("photo_thumbnails_pooled_disk_cache", cached, photos=len(paths), size="4000x3000"),
+        result("photo_import_submit", submitted, photos=2 * len(paths)),
+        result("photo_import_two_spaces", imported, photos=2 * len(paths), stored=objects),
+    ]
+
+def bench_save(app, args):
+    """SaveSpaceFrame.save_model for a new space and for an overwrite."""
+    from localization.language import Language
+    from widgets.create_space_widget import CreateSpaceWidget
+
+    silence_dialogs()
+    os.makedirs("spaces", exist_ok=True)
+    widget = CreateSpaceWidget(Language(), None)
+    save_frame = widget.save_space_frame
+    save_frame.description_input.setText("Benchmark room")
+    counter = iter(range(10 ** 9))
+
+    def save_new():
+        save_frame.name_input.setText(f"Saved Space {next(counter)}")
+        save_frame.save_model()
+
+    def save_overwrite():
+        save_frame.name_input.setText("Saved Space 0")
+        save_frame.save_model()
+
+    def save_written():
+        save_new()
+        save_frame.writer.wait_for_done()  # Until the file is fsynced and renamed into place
+
+    # Rapid repeated saves of one space are coalesced by the background writer
+    writes = []
+    save_frame.writer.saved.connect(lambda name, path: writes.append(name))
+
+    def save_burst():
+        save_frame.writer.wait_for_done()
+        app.processEvents()
+        writes.clear()
+        for _ in range(20):
+            save_overwrite()
+        save_frame.writer.wait_for_done()
+        app.processEvents()
+
+    results = [
+        result("save_model_new", timed(save_new, args.repeat * 5)),  # Time the editor is blocked
+        result("save_model_overwrite", timed(save_overwrite, args.repeat * 5)),
+        result("save_model_written", timed(save_written, args.repeat * 5)),
+    ]
+    results.append(result("save_model_burst_20", timed(save_burst, args.repeat), writes=len(writes)))
+    return results
+
+def cold_start_child():
+    """Child process: build the MainWindow and report the time to its first frame and to the ready editor."""
+    from PyQt6 import QtWidgets
+    imported = time.perf_counter()
+    app = QtWidgets.QApplication(sys.argv[:1])
+    from localization.language import Language
+    from components.main_window import MainWindow
+    from components.startup_profiler import get_startup_profiler
+
+    profiler = get_startup_profiler()
+    profiler.origin = PROCESS_START
+    window = MainWindow(Language())
+    constructed = time.perf_counter()
+    window.ready.connect(lambda: profiler.mark("editor_ready"))
+    window.show()
+    wait_until(app, lambda: profiler.elapsed("editor_ready") is not None, timeout=60)
+    print(json.dumps({
+        "imports_ms": (imported - PROCESS_START) * 1000.0,
+        "main_window_ms": (constructed - PROCESS_START) * 1000.0,
+        "first_frame_ms": profiler.elapsed("first_frame"),
+        "editor_ready_ms": profiler.elapsed("editor_ready"),
+    }))
+
+def bench_startup(app, args):
+    """Cold start to the first frame of the MainWindow and to the ready editor, each run in a fresh interpreter."""
+    runs = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--cold-start-child"],
+            cwd=os.getcwd(), capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return [
+        result(f"cold_start_{key[:-3]}", [run[key] / 1000.0 for run in runs])
+        for key in ("imports_ms", "main_window_ms", "first_frame_ms", "editor_ready_ms")
+    ]
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ScenePilotPro benchmarks headless and write JSON results.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Library sizes for the gallery benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of each measurement")
+    parser.add_argument("--photos", type=int, default=8, help="Photos decoded by the thumbnail benchmark")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--cold-start-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start_child:
+        cold_start_child()
+        return
+
+    output = os.path.abspath(args.output)
+    workdir = tempfile.mkdtemp(prefix="scenepilot_bench_")
+    os.chdir(workdir)  # Relative paths ("spaces", caches) land in the scratch directory
+
+    from PyQt6 import QtWidgets
+    from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+    import numpy
+    import pyqtgraph
+    app = QtWidgets.QApplication(sys.argv[:1])
+
+    functions = {
+        "scene": bench_scene,
+        "gallery": bench_gallery,
+        "thumbnails": bench_thumbnails,
+        "save": bench_save,
+        "startup": bench_startup,
+    }
+    results = []
+    try:
+        for name in args.only:
+            print(f"Running {name}...", file=sys.stderr)
+            results += functions[name](app, args)
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "pyqtgraph": pyqtgraph.__version__,
+            "numpy": numpy.__version__,
+            "qpa_platform": os.environ.get("QT_QPA_PLATFORM"),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(output, "w") as file:
+        json.dump(report, file, indent=4)
+    for entry in results:
+        params = ", ".join(f"{k}={v}" for k, v in entry["params"].items())
+        print(f"{entry['name']:<45} {params:<28} median {entry['median_ms']:>10.3f} ms", file=sys.stderr)
+    print(f"Results written to {output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,17 @@
 import os  # Add this import
-import sys  # Add this import
-from PyQt6.QtWidgets import QMainWindow, QMenuBar, QWidget, QVBoxLayout, QMessageBox
+from PyQt6.QtWidgets import QMainWindow, QMenuBar, QWidget, QVBoxLayout, QMessageBox, QLabel
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from localization.language import Language
 from config.constants import PROGRAM_NAME
+from components.startup_profiler import get_startup_profiler
 
-# Import widgets from their respective files
-from widgets.create_scene_widget import CreateSceneWidget
-from widgets.load_scene_widget import LoadSceneWidget
-from widgets.edit_space_widget import EditSpaceWidget
+# The widgets (and pyqtgraph.opengl behind them) are imported when first shown,
+# so the window can paint before the heavy modules are loaded
 
 class MainWindow(QMainWindow):
+    ready = pyqtSignal()  # Emitted once the initial widget is built after the first frame
+
     def __init__(self, language):
         super().__init__()
         self.setWindowTitle(PROGRAM_NAME)
@@ -23,30 +23,30 @@ class MainWindow(QMainWindow):
         menu_bar = self.menuBar()
         
         # Add Scene menu
-        scene_menu = menu_bar.addMenu(self.language.get("menu_scene"))
-        create_scene_action = QAction(self.language.get("action_create_scene"), self)
-        load_scene_action = QAction(self.language.get("action_load_scene"), self)
-        scene_menu.addAction(create_scene_action)
-        scene_menu.addAction(load_scene_action)
+        self.scene_menu = menu_bar.addMenu("")
+        self.create_scene_action = QAction(self)
+        self.load_scene_action = QAction(self)
+        self.scene_menu.addAction(self.create_scene_action)
+        self.scene_menu.addAction(self.load_scene_action)
         
         # Add 3D Space menu
-        space_menu = menu_bar.addMenu(self.language.get("menu_3d_space"))
-        create_space_action = QAction(self.language.get("action_create_space"), self)
+        self.space_menu = menu_bar.addMenu("")
+        self.create_space_action = QAction(self)
         # edit_space_action = QAction(self.language.get("action_edit_space"), self)
-        space_menu.addAction(create_space_action)
+        self.space_menu.addAction(self.create_space_action)
         # space_menu.addAction(edit_space_action)
         
         # Add Language menu
-        language_menu = menu_bar.addMenu(self.language.get("menu_language"))
+        self.language_menu = menu_bar.addMenu("")
         english_action = QAction("English", self)
         italian_action = QAction("Italiano", self)
-        language_menu.addAction(english_action)
-        language_menu.addAction(italian_action)
+        self.language_menu.addAction(english_action)
+        self.language_menu.addAction(italian_action)
 
         # Connect actions to methods
-        create_scene_action.triggered.connect(self.show_create_scene_widget)
-        load_scene_action.triggered.connect(self.show_load_scene_widget)
-        create_space_action.triggered.connect(self.show_create_space_widget)
+        self.create_scene_action.triggered.connect(self.show_create_scene_widget)
+        self.load_scene_action.triggered.connect(self.show_load_scene_widget)
+        self.create_space_action.triggered.connect(self.show_create_space_widget)
         # edit_space_action.triggered.connect(self.show_edit_space_widget)
         
         # Connect language actions to methods
@@ -61,8 +61,31 @@ class MainWindow(QMainWindow):
         # Cache for widgets
         self.widget_cache = {}
 
-        # Simulate pressing "action_create_space" at startup
-        self.show_create_space_widget()
+        # Placeholder painted in the first frame, replaced by the space editor right after
+        self.loading_label = QLabel()
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.central_layout.addWidget(self.loading_label)
+        self.first_frame_painted = False
+
+        # Apply the strings now and again whenever the language changes
+        self.retranslate_ui()
+        self.language.language_changed.connect(self.retranslate_ui)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_frame_painted:
+            self.first_frame_painted = True
+            get_startup_profiler().mark("first_frame")
+            QTimer.singleShot(0, self.show_initial_widget)
+
+    def show_initial_widget(self):
+        """Simulate pressing "action_create_space" once the window is on screen."""
+        profiler = get_startup_profiler()
+        with profiler.phase("editor_modules"):
+            import widgets.create_space_widget  # pyqtgraph.opengl and the space frames
+        with profiler.phase("create_space_widget"):
+            self.show_create_space_widget()
+        self.ready.emit()
 
     def set_central_widget(self, widget):
         """Set the central widget dynamically."""
@@ -81,7 +104,7 @@ class MainWindow(QMainWindow):
         widget_key = widget_class.__name__  # Use the class name as the key
         if widget_key not in self.widget_cache:
             # Pass the language argument if the widget is EditSpaceWidget
-            if widget_class == EditSpaceWidget:
+            if widget_key == "EditSpaceWidget":
                 self.widget_cache[widget_key] = widget_class(self.language, *args)
             else:
                 self.widget_cache[widget_key] = widget_class(*args)
@@ -89,12 +112,14 @@ class MainWindow(QMainWindow):
 
     def show_create_scene_widget(self):
         """Show the CreateSceneWidget as the central widget."""
+        from widgets.create_scene_widget import CreateSceneWidget
         widget = self.get_or_create_widget(CreateSceneWidget)
         widget.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.set_central_widget(widget)
 
     def show_load_scene_widget(self):
         """Show the LoadSceneWidget as the central widget."""
+        from widgets.load_scene_widget import LoadSceneWidget
         widget = self.get_or_create_widget(LoadSceneWidget)
         widget.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.set_central_widget(widget)
@@ -108,7 +133,8 @@ class MainWindow(QMainWindow):
 
     def show_edit_space_widget(self):
         """Show the EditSpaceWidget as the central widget and reload the gallery."""
-        widget = self.get_or_create_widget(EditSpaceWidget, self.language)
+        from widgets.edit_space_widget import EditSpaceWidget
+        widget = self.get_or_create_widget(EditSpaceWidget)
         self.set_central_widget(widget)
         widget.load_saved_spaces()  # Reload the gallery whenever this action is triggered
 
@@ -141,10 +167,9 @@ class MainWindow(QMainWindow):
             self.switch_language(language_code)
 
     def switch_language(self, language_code):
-        """Switch the application language."""
+        """Switch the application language in place; every widget retranslates itself."""
         self.language.set_language(language_code)
         self.write_language_to_file(language_code)  # Save the language to the file
-        self.restart_application(language_code)
 
     def write_language_to_file(self, language_code):
         """Write the selected language to the file."""
@@ -152,22 +177,12 @@ class MainWindow(QMainWindow):
         with open(language_file, "w", encoding="utf-8") as file:
             file.write(language_code)
 
-    def restart_application(self, language_code):
-        """Restart the application with the updated language."""
-        from PyQt6.QtWidgets import QApplication
-
-        # Ensure the environment variable is set during the restart
-        os.environ["OBJC_DISABLE_INITIALIZE_FORK_SAFETY"] = "YES"
-
-        os.execl(
-            sys.executable,
-            sys.executable,
-            *sys.argv,
-            f"--language={language_code}"  # Pass the selected language as an argument
-        )
-        QApplication.quit()
-
     def retranslate_ui(self):
         """Retranslate the UI elements to the current language."""
-        self.menuBar().clear()
-        self.__init__(self.language)  # Reinitialize the menu bar with the new language
+        self.scene_menu.setTitle(self.language.get("menu_scene"))
+        self.create_scene_action.setText(self.language.get("action_create_scene"))
+        self.load_scene_action.setText(self.language.get("action_load_scene"))
+        self.space_menu.setTitle(self.language.get("menu_3d_space"))
+        self.create_space_action.setText(self.language.get("action_create_space"))
+        self.language_menu.setTitle(self.language.get("menu_language"))
+        self.loading_label.setText(self.language.get("label_loading_editor"))
@@ -0,0 +1,158 @@
+"""
+Bounding-volume hierarchy over axis-aligned boxes.
+
+The tree is stored in flat NumPy arrays (node bounds, children, leaf ranges)
+and built by median splits along the longest axis, so queries for boxes,
+points, rays and view frustums visit O(log N) nodes for well-spread rooms.
+Like geometry.py it only depends on NumPy.
+"""
+import numpy as np
+
+LEAF_SIZE = 4  # Boxes per leaf; small leaves are tested together in one NumPy call
+EPSILON = 1e-9  # Boxes that only touch (shared walls) do not overlap
+
+class BoundingVolumeHierarchy:
+    """Static BVH over N boxes given as bounds of shape (N, 2, 3) (minimum, maximum)."""
+
+    def __init__(self, bounds, leaf_size=LEAF_SIZE):
+        self.bounds = np.asarray(bounds, dtype=float).reshape(-1, 2, 3)
+        self.leaf_size = max(1, leaf_size)
+        self.order = np.arange(len(self.bounds))  # Box indices, grouped by leaf
+
+        # Flat node arrays, filled by build(); children are -1 for leaves
+        self.node_bounds = []
+        self.node_left = []
+        self.node_right = []
+        self.node_start = []
+        self.node_count = []
+        if len(self.bounds):
+            self.build(0, len(self.bounds))
+        self.node_bounds = np.array(self.node_bounds, dtype=float).reshape(-1, 2, 3)
+        self.node_left = np.array(self.node_left, dtype=int)
+        self.node_right = np.array(self.node_right, dtype=int)
+        self.node_start = np.array(self.node_start, dtype=int)
+        self.node_count = np.array(self.node_count, dtype=int)
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def build(self, start, end):
+        """Build the subtree over order[start:end] and return its node index."""
+        boxes = self.bounds[self.order[start:end]]
+        node = len(self.node_left)
+        self.node_bounds.append((boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)))
+        self.node_left.append(-1)
+        self.node_right.append(-1)
+        self.node_start.append(start)
+        self.node_count.append(end - start)
+        if end - start <= self.leaf_size:
+            return node
+
+        # Split at the median centre along the longest axis of the centres
+        centers = boxes.sum(axis=1) / 2
+        axis = int(np.argmax(centers.max(axis=0) - centers.min(axis=0)))
+        middle = (end - start) // 2
+        split = np.argpartition(centers[:, axis], middle)
+        self.order[start:end] = self.order[start:end][split]
+
+        self.node_left[node] = self.build(start, start + middle)
+        self.node_right[node] = self.build(start + middle, end)
+        return node
+
+    @property
+    def root_bounds(self):
+        """Bounds enclosing every box, or None when the hierarchy is empty."""
+        return self.node_bounds[0] if len(self.node_bounds) else None
+
+    def traverse(self, node_test, leaf_test):
+        """Walk the nodes accepted by node_test and return the leaf boxes accepted by leaf_test."""
+        if not len(self.node_bounds):
+            return np.zeros(0, dtype=int)
+        hits = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not node_test(self.node_bounds[node]):
+                continue
+            if self.node_left[node] < 0:
+                start = self.node_start[node]
+                indices = self.order[start:start + self.node_count[node]]
+                hits.append(indices[leaf_test(self.bounds[indices])])
+            else:
+                stack.append(self.node_left[node])
+                stack.append(self.node_right[node])
+        return np.sort(np.concatenate(hits)) if hits else np.zeros(0, dtype=int)
+
+    def query_box(self, box_min, box_max, strict=True):
+        """Return the indices of the boxes intersecting [box_min, box_max] (touching only counts if not strict)."""
+        box_min = np.asarray(box_min, dtype=float)
+        box_max = np.asarray(box_max, dtype=float)
+        eps = EPSILON if strict else -EPSILON
+
+        def overlaps(bounds):
+            bounds = bounds.reshape(-1, 2, 3)
+            return np.all((bounds[:, 0] < box_max - eps) & (bounds[:, 1] > box_min + eps), axis=1)
+
+        return self.traverse(lambda node: overlaps(node)[0], overlaps)
+
+    def query_point(self, point):
+        """Return the indices of the boxes containing point (boundary included)."""
+        point = np.asarray(point, dtype=float)
+        return self.query_box(point, point, strict=False)
+
+    def query_ray(self, origin, direction, max_distance=np.inf):
+        """
+        Return (indices, distances) of the boxes hit by a ray, nearest first.
+
+        The distance is where the ray enters the box (0 if it starts inside).
+        """
+        origin = np.asarray(origin, dtype=float)
+        direction = np.asarray(direction, dtype=float)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / direction
+
+        def entry(bounds):
+            bounds = bounds.reshape(-1, 2, 3)
+            with np.errstate(invalid="ignore"):
+                t0 = (bounds[:, 0] - origin) * inverse
+                t1 = (bounds[:, 1] - origin) * inverse
+            # A zero direction component gives nan when the origin lies on a slab plane:
+            # minimum/maximum keep the nan and fmax/fmin skip it, so that axis does not limit the interval
+            near = np.fmax.reduce(np.minimum(t0, t1), axis=1)
+            far = np.fmin.reduce(np.maximum(t0, t1), axis=1)
+            return np.maximum(near, 0.0), far
+
+        def hit(bounds):
+            near, far = entry(bounds)
+            return (near <= far) & (near <= max_distance)
+
+        indices = self.traverse(lambda node: hit(node)[0], hit)
+        distances = entry(self.bounds[indices])[0]
+        order = np.argsort(distances, kind="stable")
+        return indices[order], distances[order]
+
+    def query_frustum(self, planes):
+        """
+        Return the indices of the boxes at least partly inside a convex volume.
+
+        Parameters:
+            planes: Array of shape (P, 4) with inward-facing planes (a, b, c, d),
+                a point p being inside when a*x + b*y + c*z + d >= 0 for every plane.
+        """
+        planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+        normals, offsets = planes[:, :3], planes[:, 3]
+
+        def visible(bounds):
+            bounds = bounds.reshape(-1, 2, 3)
+            # Corner of each box furthest along each plane normal
+            positive = np.where(normals[None, :, :] >= 0, bounds[:, 1][:, None, :], bounds[:, 0][:, None, :])
+            return np.all(np.einsum("bpk,pk->bp", positive, normals) + offsets >= 0, axis=1)
+
+        return self.traverse(lambda node: visible(node)[0], visible)
+
+    def overlapping_pairs(self):
+        """Return the pairs (i, j), i < j, of boxes whose interiors overlap."""
+        pairs = []
+        for i, (box_min, box_max) in enumerate(self.bounds):
+            pairs.extend((i, int(j)) for j in self.query_box(box_min, box_max) if j > i)
+        return pairs
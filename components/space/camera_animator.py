@@ -0,0 +1,117 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, QEasingCurve, Qt
+from PyQt6.QtGui import QVector3D
+
+CAMERA_KEYS = ("distance", "elevation", "azimuth", "center")
+FRAME_INTERVAL_MS = 16  # Tick of the animation timer; progress itself follows the clock
+
+class CameraAnimator(QObject):
+    """
+    Time-based camera transitions for a GLViewWidget.
+
+    The progress of an animation is the elapsed monotonic time over its
+    duration, shaped by a QEasingCurve, so a transition lasts the same on a
+    busy machine (it just shows fewer frames). Calling animate_to() while an
+    animation runs restarts it from the current camera state toward the new
+    target, and stop() leaves the camera where it is, so user input can take
+    over at any moment.
+    """
+
+    def __init__(self, view, duration=0.35, easing=QEasingCurve.Type.InOutCubic, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.duration = duration  # Seconds
+        self.easing = QEasingCurve(easing)
+        self.start_state = {}
+        self.target_state = {}
+        self.start_time = 0.0
+        self.current_duration = duration
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(FRAME_INTERVAL_MS)
+        self.timer.timeout.connect(self.step)
+
+    @property
+    def running(self):
+        return self.timer.isActive()
+
+    def camera_state(self):
+        """Return the current camera parameters of the view."""
+        opts = self.view.opts
+        return {
+            "distance": opts['distance'],
+            "elevation": opts['elevation'],
+            "azimuth": opts['azimuth'],
+            "center": QVector3D(opts['center']),
+        }
+
+    def target(self, key):
+        """Return where a camera parameter is heading (its current value when idle)."""
+        if self.running and key in self.target_state:
+            return self.target_state[key]
+        return self.camera_state()[key]
+
+    def animate_to(self, duration=None, easing=None, **target):
+        """Animate some camera parameters (distance, elevation, azimuth, center) toward target."""
+        unknown = set(target) - set(CAMERA_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown camera parameters: {sorted(unknown)}")
+
+        # Parameters still in flight keep heading to their previous target
+        pending = dict(self.target_state) if self.running else {}
+        pending.update(target)
+        self.start_state = self.camera_state()
+        self.target_state = pending
+        self.current_duration = self.duration if duration is None else duration
+        if easing is not None:
+            self.easing = QEasingCurve(easing)
+        self.start_time = time.monotonic()
+        if self.current_duration <= 0:
+            self.apply(1.0)
+            self.finish()
+            return
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def retarget(self, **target):
+        """Change the destination of the running animation without restarting its clock."""
+        if self.running:
+            self.target_state.update(target)
+
+    def step(self):
+        elapsed = time.monotonic() - self.start_time
+        t = min(1.0, elapsed / self.current_duration)
+        self.apply(self.easing.valueForProgress(t))
+        if t >= 1.0:
+            self.finish()
+
+    def apply(self, k):
+        """Set the camera to the interpolation at eased progress k."""
+        state = {}
+        for key, end in self.target_state.items():
+            start = self.start_state[key]
+            if key in ("azimuth", "elevation"):
+                # Normalize angle difference to shortest path
+                delta = (end - start + 180) % 360 - 180
+                state[key] = start + k * delta
+            elif key == "center":
+                state[key] = start + (end - start) * k
+            else:
+                state[key] = start + k * (end - start)
+
+        if "center" in state:
+            self.view.opts['center'] = state.pop("center")
+        if state:
+            self.view.setCameraPosition(**state)  # Also requests the repaint
+        else:
+            self.view.update()
+
+    def finish(self):
+        self.timer.stop()
+        self.target_state = {}
+
+    def stop(self):
+        """Stop where the camera currently is (e.g. when the user grabs the view)."""
+        if self.timer.isActive():
+            self.timer.stop()
+            self.target_state = {}
@@ -0,0 +1,137 @@
+"""
+Undo/redo history of the space editor.
+
+Every edit is stored as a compact delta: only the fields it changed, each
+with its value before and after. The entries live in a ring buffer bounded
+by an approximate memory cap, so the oldest edits are forgotten first, and
+consecutive edits of the same kind (a slider drag, a run of spinbox steps)
+merge into a single entry until the history is sealed or the edits pause.
+"""
+import sys
+import time
+from collections import deque
+
+DEFAULT_MEMORY_CAP = 1 << 20  # Bytes of deltas kept (about 1 MiB)
+MERGE_WINDOW = 1.0  # Seconds; edits of the same kind closer than this merge into one entry
+
+def estimate_size(value):
+    """Approximate memory used by a delta (containers and their items)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+class EditCommand:
+    """One undoable edit: a kind (what to replay), a target and the changed fields before/after."""
+
+    def __init__(self, kind, target, before, after, merge_key=None):
+        self.kind = kind  # "state" (room fields), "add_room" or "remove_room"
+        self.target = target  # Room index
+        self.before = before  # {field: value} restored by undo
+        self.after = after  # {field: value} restored by redo
+        self.merge_key = merge_key  # Edits with the same key may merge, None never merges
+        self.time = time.monotonic()
+        self.size = estimate_size(before) + estimate_size(after) + sys.getsizeof(self)
+
+    def merge(self, command):
+        """Absorb a later edit of the same kind: keep the oldest before and the newest after."""
+        for field, value in command.before.items():
+            self.before.setdefault(field, value)
+        self.after.update(command.after)
+        # Fields that went back to their starting value are no change at all
+        for field in [field for field in self.after if self.after[field] == self.before.get(field)]:
+            del self.after[field]
+            del self.before[field]
+        self.time = command.time
+        self.size = estimate_size(self.before) + estimate_size(self.after) + sys.getsizeof(self)
+
+    def is_empty(self):
+        return self.kind == "state" and not self.after
+
+class EditHistory:
+    """
+    Ring buffer of EditCommand with an undo cursor.
+
+    Pushing an edit drops the redo entries after the cursor; when the deltas
+    exceed max_bytes the oldest entries are evicted.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_CAP, merge_window=MERGE_WINDOW):
+        self.max_bytes = max_bytes
+        self.merge_window = merge_window
+        self.entries = deque()
+        self.cursor = 0  # Entries before the cursor can be undone, the ones after it redone
+        self.bytes = 0
+        self.sealed = True  # The last entry accepts merges only while unsealed
+
+    def __len__(self):
+        return len(self.entries)
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < len(self.entries)
+
+    def push(self, command):
+        """Record an edit, merging it into the previous one when they belong together."""
+        self.drop_redo()
+        last = self.entries[-1] if self.entries else None
+        if (
+            last is not None and not self.sealed and command.merge_key is not None
+            and command.merge_key == last.merge_key and command.time - last.time <= self.merge_window
+        ):
+            self.bytes -= last.size
+            last.merge(command)
+            if last.is_empty():
+                self.entries.pop()
+                self.cursor -= 1
+                # The entry the edit belonged to is gone: the next edit must not merge into the unrelated one now last
+                self.sealed = True
+            else:
+                self.bytes += last.size
+                self.sealed = False
+        elif not command.is_empty():
+            self.entries.append(command)
+            self.cursor += 1
+            self.bytes += command.size
+            self.sealed = command.merge_key is None
+        else:
+            self.sealed = True  # A no-op edit opens no group to merge into
+
+        # Forget the oldest edits beyond the memory cap (the newest one is always kept)
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            self.bytes -= self.entries.popleft().size
+            self.cursor -= 1
+
+    def seal(self):
+        """End the current merge group, e.g. when a slider is released."""
+        self.sealed = True
+
+    def drop_redo(self):
+        while len(self.entries) > self.cursor:
+            self.bytes -= self.entries.pop().size
+
+    def undo(self):
+        """Return the command to revert (apply its before), or None."""
+        if not self.can_undo():
+            return None
+        self.seal()
+        self.cursor -= 1
+        return self.entries[self.cursor]
+
+    def redo(self):
+        """Return the command to apply again (apply its after), or None."""
+        if not self.can_redo():
+            return None
+        self.seal()
+        self.cursor += 1
+        return self.entries[self.cursor - 1]
+
+    def clear(self):
+        self.entries.clear()
+        self.cursor = 0
+        self.bytes = 0
+        self.sealed = True
@@ -0,0 +1,260 @@
+"""
+Vectorized geometry for rooms, walls and doors.
+
+Every function works on arrays of rooms at once, so building the geometry for
+thousands of spaces is a single NumPy pass. The module only depends on NumPy
+and can be shared by the GUI and by headless tools.
+"""
+import numpy as np
+
+# Corners of the unit box, bottom ring first, then the top ring
+UNIT_BOX_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=float)
+
+# The 12 box edges as pairs of corner indices (bottom, top, verticals)
+BOX_EDGE_INDEX = np.array([
+    0, 1, 1, 2, 2, 3, 3, 0,
+    4, 5, 5, 6, 6, 7, 7, 4,
+    0, 4, 1, 5, 2, 6, 3, 7,
+])
+
+# The four base walls as quads of corner indices (bottom-start, bottom-end, top-end, top-start)
+BOX_WALL_INDEX = np.array([
+    [0, 1, 5, 4],  # Wall 0 (front, along the width)
+    [1, 2, 6, 5],  # Wall 1 (right, along the length)
+    [2, 3, 7, 6],  # Wall 2 (back, along the width)
+    [3, 0, 4, 7],  # Wall 3 (left, along the length)
+])
+
+FLOOR_INDEX = np.array([0, 1, 2, 3])
+
+# Two triangles per quad
+QUAD_FACES = np.array([[0, 1, 2], [0, 2, 3]])
+
+DEFAULT_HSV = (0.6, 0.5, 1.0)
+
+class RoomGeometry:
+    """Packed vertex, index and colour arrays for a batch of rooms and doors."""
+
+    def __init__(self, edge_vertices, edge_colors, floor_vertices, floor_faces, floor_colors,
+                 wall_vertices, wall_faces, door_vertices, door_faces, door_colors, door_rooms):
+        self.edge_vertices = edge_vertices  # (N * 24, 3), drawn as line segments
+        self.edge_colors = edge_colors  # (N * 24, 4)
+        self.floor_vertices = floor_vertices  # (N * 4, 3)
+        self.floor_faces = floor_faces  # (N * 2, 3)
+        self.floor_colors = floor_colors  # (N * 2, 4), one per face
+        self.wall_vertices = wall_vertices  # (N * 16, 3), four quads per room
+        self.wall_faces = wall_faces  # (N * 8, 3)
+        self.door_vertices = door_vertices  # (M * 4, 3)
+        self.door_faces = door_faces  # (M * 2, 3)
+        self.door_colors = door_colors  # (M * 2, 4), one per face
+        self.door_rooms = door_rooms  # (M,), index of the room of each door
+
+def as_dimensions(dimensions):
+    """Return room dimensions as a float array of shape (N, 3) (width, length, height)."""
+    return np.asarray(dimensions, dtype=float).reshape(-1, 3)
+
+def as_origins(origins, count):
+    """Return room origins (minimum corner) as a float array of shape (N, 3); None means all at zero."""
+    if origins is None:
+        return np.zeros((count, 3))
+    return np.asarray(origins, dtype=float).reshape(-1, 3)
+
+def box_corners(dimensions, origins=None):
+    """Return the 8 corners of each room box, shape (N, 8, 3)."""
+    dims = as_dimensions(dimensions)
+    return UNIT_BOX_CORNERS[None, :, :] * dims[:, None, :] + as_origins(origins, len(dims))[:, None, :]
+
+def box_bounds(dimensions, origins=None):
+    """Return the axis-aligned bounds of each room, shape (N, 2, 3) (minimum, maximum)."""
+    dims = as_dimensions(dimensions)
+    mins = as_origins(origins, len(dims))
+    return np.stack([mins, mins + dims], axis=1)
+
+def box_edges(dimensions, origins=None):
+    """Return the 12 edges of each room as segment end points, shape (N, 24, 3)."""
+    return box_corners(dimensions, origins)[:, BOX_EDGE_INDEX]
+
+def box_floors(dimensions, origins=None):
+    """Return the floor quad of each room, shape (N, 4, 3)."""
+    return box_corners(dimensions, origins)[:, FLOOR_INDEX]
+
+def box_walls(dimensions, origins=None):
+    """Return the four base wall quads of each room, shape (N, 4, 4, 3)."""
+    return box_corners(dimensions, origins)[:, BOX_WALL_INDEX]
+
+def door_quads(dimensions, doors, origins=None):
+    """
+    Compute the door quads for a batch of door records.
+
+    Parameters:
+        dimensions: Room dimensions, shape (N, 3).
+        doors: Door records, shape (M, 5): room index, width, height, offset, wall index.
+        origins: Optional room origins, shape (N, 3).
+
+    Returns:
+        A tuple (quads, valid) where quads has shape (K, 4, 3) and valid is the
+        boolean mask over the M records that were placed on a valid wall.
+    """
+    doors = np.asarray(doors, dtype=float).reshape(-1, 5)
+    rooms = doors[:, 0].astype(int)
+    width, height, offset = doors[:, 1], doors[:, 2], doors[:, 3]
+    walls = doors[:, 4].astype(int)
+
+    valid = (walls >= 0) & (walls < 4) & (rooms >= 0) & (rooms < len(as_dimensions(dimensions)))
+    rooms, walls = rooms[valid], walls[valid]
+    width, height, offset = width[valid], height[valid], offset[valid]
+
+    # Each wall runs from one floor corner to the next, counter-clockwise
+    floors = box_floors(dimensions, origins)
+    start = floors[rooms, walls]
+    end = floors[rooms, (walls + 1) % 4]
+    direction = end - start
+    length = np.linalg.norm(direction, axis=1, keepdims=True)
+    direction = np.divide(direction, length, out=np.zeros_like(direction), where=length > 0)
+
+    p0 = start + direction * offset[:, None]
+    p1 = start + direction * (offset + width)[:, None]
+    up = np.zeros_like(p0)
+    up[:, 2] = height
+
+    return np.stack([p0, p1, p1 + up, p0 + up], axis=1), valid
+
+def ray_quad_distances(origin, direction, quads, inside_only=False):
+    """
+    Intersect one ray with many planar quads (rectangles or parallelograms) in one pass.
+
+    Parameters:
+        origin: Ray origin, shape (3,).
+        direction: Ray direction, shape (3,), not necessarily normalized.
+        quads: Quads as corners p0, p1, p2, p3 in order, shape (K, 4, 3).
+        inside_only: Only hit quads seen from their inner side, the outer side
+            being the one (p1 - p0) x (p3 - p0) points to, as for box_walls.
+
+    Returns:
+        Array of shape (K,) with the ray parameter t of each hit (the distance
+        when direction is a unit vector), np.inf where the ray misses the quad.
+    """
+    origin = np.asarray(origin, dtype=float)
+    direction = np.asarray(direction, dtype=float)
+    quads = np.asarray(quads, dtype=float).reshape(-1, 4, 3)
+
+    # Moller-Trumbore on the parallelogram p0 + u * (p1 - p0) + v * (p3 - p0)
+    edge_u = quads[:, 1] - quads[:, 0]
+    edge_v = quads[:, 3] - quads[:, 0]
+    p = np.cross(direction, edge_v)
+    det = np.einsum("kj,kj->k", edge_u, p)
+    parallel = np.abs(det) < 1e-12  # Ray parallel to the quad plane (or degenerate quad)
+    inverse = 1.0 / np.where(parallel, 1.0, det)
+
+    offset = origin - quads[:, 0]
+    u = np.einsum("kj,kj->k", offset, p) * inverse
+    q = np.cross(offset, edge_u)
+    v = (q @ direction) * inverse
+    t = np.einsum("kj,kj->k", edge_v, q) * inverse
+
+    hit = ~parallel & (u >= 0) & (u <= 1) & (v >= 0) & (v <= 1) & (t > 0)
+    if inside_only:
+        hit &= det < 0  # det = -direction . normal
+    return np.where(hit, t, np.inf)
+
+def hsv_to_rgba(hsv, alpha=1.0):
+    """
+    Convert HSV colours in [0, 1] to RGBA, shape (N, 4).
+
+    Matches QColor.fromHsvF for the same inputs.
+    """
+    hsv = np.asarray(hsv, dtype=float).reshape(-1, 3)
+    h, s, v = hsv[:, 0] % 1.0, hsv[:, 1], hsv[:, 2]
+
+    h6 = h * 6.0
+    sector = np.floor(h6).astype(int) % 6
+    f = h6 - np.floor(h6)
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+
+    # Rows of the classic lookup table, picked per sector
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    a = np.broadcast_to(np.asarray(alpha, dtype=float), h.shape)
+
+    return np.stack([r, g, b, a], axis=1)
+
+def quad_faces(count):
+    """Return triangle indices for `count` consecutive quads, shape (count * 2, 3)."""
+    offsets = np.arange(count)[:, None, None] * 4
+    return (QUAD_FACES[None, :, :] + offsets).reshape(-1, 3)
+
+def build_room_geometry(dimensions, colors=None, doors=None, floor_alpha=0.3, door_alpha=0.5, origins=None):
+    """
+    Build the packed geometry of many rooms and their doors in one call.
+
+    Parameters:
+        dimensions: Room dimensions, shape (N, 3) (width, length, height).
+        colors: HSV colours in [0, 1], shape (N, 3). Defaults to the editor colour.
+        doors: Optional door records, shape (M, 5): room index, width, height, offset, wall index.
+        floor_alpha: Transparency of the floors.
+        door_alpha: Transparency of the doors.
+        origins: Optional room origins (minimum corner), shape (N, 3). Defaults to zero.
+
+    Returns:
+        A RoomGeometry with all arrays packed room after room.
+    """
+    dims = as_dimensions(dimensions)
+    count = len(dims)
+    if colors is None:
+        colors = np.tile(DEFAULT_HSV, (count, 1))
+    colors = np.asarray(colors, dtype=float).reshape(-1, 3)
+
+    corners = box_corners(dims, origins)
+    edge_vertices = corners[:, BOX_EDGE_INDEX].reshape(-1, 3)
+    edge_colors = np.repeat(hsv_to_rgba(colors), len(BOX_EDGE_INDEX), axis=0)
+
+    floor_vertices = corners[:, FLOOR_INDEX].reshape(-1, 3)
+    floor_colors = np.repeat(hsv_to_rgba(colors, floor_alpha), 2, axis=0)
+
+    wall_vertices = corners[:, BOX_WALL_INDEX].reshape(-1, 3)
+
+    if doors is None:
+        doors = np.zeros((0, 5))
+    quads, valid = door_quads(dims, doors, origins)
+    door_rooms = np.asarray(doors, dtype=float).reshape(-1, 5)[valid, 0].astype(int)
+    door_colors = np.repeat(hsv_to_rgba(colors[door_rooms], door_alpha), 2, axis=0)
+
+    return RoomGeometry(
+        edge_vertices=edge_vertices,
+        edge_colors=edge_colors,
+        floor_vertices=floor_vertices,
+        floor_faces=quad_faces(count),
+        floor_colors=floor_colors,
+        wall_vertices=wall_vertices,
+        wall_faces=quad_faces(count * 4),
+        door_vertices=quads.reshape(-1, 3),
+        door_faces=quad_faces(len(quads)),
+        door_colors=door_colors,
+        door_rooms=door_rooms,
+    )
+
+def space_records(spaces):
+    """
+    Convert a list of space dictionaries (as saved in the JSON files) to kernel inputs.
+
+    Returns:
+        A tuple (dimensions, colors, doors) ready for build_room_geometry.
+    """
+    dimensions = np.zeros((len(spaces), 3))
+    colors = np.zeros((len(spaces), 3))
+    doors = []
+    for i, space in enumerate(spaces):
+        coordinates = space.get("coordinates", {})
+        color = space.get("color", {})
+        dimensions[i] = (coordinates.get("width", 0), coordinates.get("length", 0), coordinates.get("height", 0))
+        colors[i] = (color.get("hue", 0) / 360.0, color.get("saturation", 0) / 100.0, color.get("value", 0) / 100.0)
+        door = space.get("door")
+        if door:
+            doors.append((i, door.get("width", 0), door.get("height", 0), door.get("offset", 0), door.get("wall_index", 0)))
+    return dimensions, colors, np.array(doors, dtype=float).reshape(-1, 5)
@@ -2,6 +2,7 @@ import numpy as np
 from pyqtgraph.opengl import GLLinePlotItem
 
 def create_axes(view):
+    """Add the axes gizmo to the view as a single line item and return it in a list."""
     axis_length = 0.5
     arrow_length = 0.1
     axes = [
@@ -19,17 +20,11 @@ def create_axes(view):
     ]
     colors = [(0.8, 0, 0, 1), (0, 0.8, 0, 1), (0, 0, 0.8, 1)]  # Reduced intensity of colors
 
-    axes_items = []
-    for i, (start, end) in enumerate(axes):
-        pts = np.array([start, end])
-        axis_item = GLLinePlotItem(pos=pts, color=colors[i], width=5, antialias=True)  # Increased width to 5
-        view.addItem(axis_item)
-        axes_items.append(axis_item)
+    # All nine segments go into one item drawn in "lines" mode, coloured per vertex
+    segments = np.array(axes + arrow_heads, dtype=float).reshape(-1, 3)
+    segment_colors = [colors[i] for i in range(3)] + [colors[i // 2] for i in range(6)]
+    vertex_colors = np.repeat(np.array(segment_colors, dtype=float), 2, axis=0)
+    axes_item = GLLinePlotItem(pos=segments, color=vertex_colors, width=5, mode='lines', antialias=True)  # Increased width to 5
+    view.addItem(axes_item)
 
-    for i, (start, end) in enumerate(arrow_heads):
-        pts = np.array([start, end])
-        arrow_item = GLLinePlotItem(pos=pts, color=colors[i // 2], width=5, antialias=True)  # Increased width to 5
-        view.addItem(arrow_item)
-        axes_items.append(arrow_item)
-
-    return axes_items
+    return [axes_item]
@@ -0,0 +1,307 @@
+"""
+Content-addressed store of the space photos, with background import.
+
+Every photo is stored once under spaces/.store, named by the SHA-256 of its
+bytes; a space refers to it through a hard link in its images folder, so the
+same photo attached to several spaces takes its disk space once and the
+images folders keep working with the gallery, the catalog and older
+versions. Where hard links are not available (another drive, FAT) the
+photo is copied instead, and the copy is listed next to the object so the
+object is kept while the copy exists. Preview sizes are rendered while importing, and
+the thumbnail service decodes those instead of the full-resolution photo.
+
+Layout:
+    objects/ab/<sha256><ext>        the photos
+    objects/ab/<sha256><ext>.copies paths of the copies made instead of links
+    previews/ab/<id>_<size>.jpg     reduced copies, <id> being the digest
+                                    prefix that also ends the name of every
+                                    link to the photo (<name>_<id><ext>)
+"""
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+from PyQt6.QtCore import Qt, QCoreApplication, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt6.QtGui import QImageReader
+
+IMAGE_STORE_DIR = os.path.join("spaces", ".store")
+PREVIEW_SIZES = (256, 1024)  # Longest edge in pixels of the previews rendered on import
+IMAGE_ID_LENGTH = 12  # Hex digits of the digest appended to the name of a linked photo
+HASH_CHUNK_SIZE = 1 << 20  # Bytes read at a time while hashing
+IMPORT_THREADS = 2  # Photos imported side by side (hashing and decoding are disk and CPU bound)
+COLLECT_GRACE = 60.0  # Seconds; younger objects may be waiting for their first link and are kept
+COPIES_SUFFIX = ".copies"  # Appended to an object path for the list of its copies
+
+copies_lock = threading.Lock()  # Guards the copies lists, appended to from the import threads
+
+LINKED_NAME = re.compile(rf"_([0-9a-f]{{{IMAGE_ID_LENGTH}}})\.[^.]+$")
+
+def file_digest(path):
+    """SHA-256 of a file, read in chunks so large photos are never loaded at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def save_image(image, path, quality=90):
+    """Write a JPEG through a temporary file so a crash or a concurrent write never leaves a truncated one."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        if not image.save(temp_path, "JPG", quality):
+            raise OSError(f"Could not write {path}")
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def image_id(path):
+    """The store id at the end of the name of a linked photo, or None for other files."""
+    match = LINKED_NAME.search(os.path.basename(path))
+    return match.group(1) if match else None
+
+class ImageStore:
+    """Objects and previews of the store; safe to use from any thread."""
+
+    def __init__(self, directory=IMAGE_STORE_DIR):
+        self.directory = directory
+
+    def object_path(self, digest, extension):
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}{extension.lower()}")
+
+    def preview_path(self, identifier, size):
+        return os.path.join(self.directory, "previews", identifier[:2], f"{identifier}_{size}.jpg")
+
+    def preview_for(self, path, width, height):
+        """Return the smallest preview of a linked photo covering width x height, or None."""
+        identifier = image_id(path)
+        if identifier is None:
+            return None
+        for size in PREVIEW_SIZES:
+            if size >= max(width, height):
+                preview = self.preview_path(identifier, size)
+                if os.path.isfile(preview):
+                    return preview
+        return None
+
+    def add(self, source):
+        """Store a photo (once per content) with its previews and return (digest, object path)."""
+        digest = file_digest(source)
+        path = self.object_path(digest, os.path.splitext(source)[1])
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file, open(source, "rb") as original:
+                    shutil.copyfileobj(original, file, HASH_CHUNK_SIZE)
+                os.replace(temp_path, path)  # A concurrent import of the same photo writes the same bytes
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        else:
+            os.utime(path)  # Restart the collection grace period: the object is about to be linked again
+        self.render_previews(path, digest[:IMAGE_ID_LENGTH])
+        return digest, path
+
+    def render_previews(self, path, identifier):
+        """Write the missing preview sizes of a stored photo."""
+        for size in PREVIEW_SIZES:
+            preview = self.preview_path(identifier, size)
+            if os.path.exists(preview):
+                continue
+            reader = QImageReader(path)
+            reader.setAutoTransform(True)  # Honour the EXIF orientation of camera photos
+            original = reader.size()
+            if original.isValid() and max(original.width(), original.height()) > size:
+                # The decoder skips the full-resolution pass when it can (e.g. JPEG DCT scaling)
+                reader.setScaledSize(original.scaled(QSize(size, size), Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if image.isNull():
+                return  # Not decodable: the photo is kept, the gallery shows it as it does today
+            os.makedirs(os.path.dirname(preview), exist_ok=True)
+            save_image(image, preview)
+
+    def link(self, source, images_folder):
+        """Import a photo into a space and return its path in the images folder."""
+        digest, path = self.add(source)
+        name, extension = os.path.splitext(os.path.basename(source))
+        # The name carries the content id: no probing for a free name, and the same photo added twice is one file
+        target = os.path.join(images_folder, f"{name}_{digest[:IMAGE_ID_LENGTH]}{extension.lower()}")
+        os.makedirs(images_folder, exist_ok=True)
+        if os.path.exists(target):
+            return target
+        try:
+            os.link(path, target)
+        except FileExistsError:
+            pass  # Linked meanwhile by another import of the same photo
+        except OSError:
+            shutil.copyfile(path, target)  # No hard links across drives or on FAT
+            self.record_copy(path, target)
+        return target
+
+    def record_copy(self, path, target):
+        """List a copy of an object, which its link count does not show."""
+        with copies_lock:
+            with open(path + COPIES_SUFFIX, "a", encoding="utf-8") as file:
+                file.write(os.path.abspath(target) + "\n")
+
+    def has_copies(self, path):
+        """Return whether a copy of an object is still in a space."""
+        with copies_lock:
+            try:
+                with open(path + COPIES_SUFFIX, encoding="utf-8") as file:
+                    return any(os.path.exists(line.rstrip("\n")) for line in file if line.strip())
+            except FileNotFoundError:
+                return False
+
+    def collect(self, identifier=None):
+        """Delete the objects (of one id, or all) that only the store still links to, with their previews."""
+        objects = os.path.join(self.directory, "objects")
+        if not os.path.isdir(objects):
+            return 0
+        folders = [identifier[:2]] if identifier is not None else os.listdir(objects)
+        removed = 0
+        for folder in folders:
+            folder_path = os.path.join(objects, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            for entry in os.scandir(folder_path):
+                if identifier is not None and not entry.name.startswith(identifier):
+                    continue
+                if entry.name.startswith(".") or entry.name.endswith(COPIES_SUFFIX):
+                    continue
+                info = os.stat(entry.path)  # DirEntry.stat() reports no link count on Windows
+                if info.st_nlink > 1 or time.time() - info.st_mtime < COLLECT_GRACE or self.has_copies(entry.path):
+                    continue
+                os.remove(entry.path)
+                if os.path.exists(entry.path + COPIES_SUFFIX):
+                    os.remove(entry.path + COPIES_SUFFIX)
+                for size in PREVIEW_SIZES:
+                    preview = self.preview_path(entry.name[:IMAGE_ID_LENGTH], size)
+                    if os.path.exists(preview):
+                        os.remove(preview)
+                removed += 1
+        return removed
+
+class ImageImportSignals(QObject):
+    imported = pyqtSignal(str, str)  # Images folder, path of the imported photo in it
+    failed = pyqtSignal(str, str)  # Source path, error message
+
+class ImageImportTask(QRunnable):
+    """Hash, store, preview and link one photo on a worker thread."""
+
+    def __init__(self, store, source, images_folder):
+        super().__init__()
+        self.store = store
+        self.source = source
+        self.images_folder = images_folder
+        self.signals = ImageImportSignals()
+
+    def run(self):
+        try:
+            path = self.store.link(self.source, self.images_folder)
+        except Exception as error:
+            traceback.print_exc()
+            self.signals.failed.emit(self.source, str(error))
+        else:
+            self.signals.imported.emit(self.images_folder, path)
+
+class StoreCollectTask(QRunnable):
+    """Delete the stored photos no space links to anymore, on a worker thread."""
+
+    def __init__(self, importer):
+        super().__init__()
+        self.importer = importer
+
+    def run(self):
+        with self.importer.lock:
+            self.importer.collect_queued = False  # A deletion from now on queues another pass
+        try:
+            self.importer.store.collect()
+        except OSError:
+            traceback.print_exc()  # Left for the next collection
+
+class ImageImporter(QObject):
+    """
+    Imports photos into spaces on a thread pool, off the GUI thread.
+
+    Each photo is reported through imported (or failed) as soon as it is in
+    the space; finished is emitted once every photo queued for a folder has
+    been handled. Unused photos are collected from the store on the same pool.
+    """
+    imported = pyqtSignal(str, str)  # Images folder, photo path
+    failed = pyqtSignal(str, str)  # Source path, error message
+    finished = pyqtSignal(str)  # Images folder
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else ImageStore()
+        self.lock = threading.Lock()
+        self.pending = {}  # Images folder -> photos still being imported
+        self.collect_queued = False  # A store collection is waiting to run
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(IMPORT_THREADS)
+
+        # Imports still running when the application quits complete before it exits
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.wait_for_done)
+
+    def import_images(self, sources, images_folder):
+        """Queue photos for import into a space's images folder."""
+        for source in sources:
+            with self.lock:
+                self.pending[images_folder] = self.pending.get(images_folder, 0) + 1
+            task = ImageImportTask(self.store, source, images_folder)
+            task.signals.imported.connect(self.task_imported)
+            task.signals.failed.connect(lambda source, error, folder=images_folder: self.task_failed(folder, source, error))
+            self.pool.start(task)
+
+    def collect_unused(self):
+        """Queue a pass deleting the stored photos no space uses anymore (e.g. after deleting a space)."""
+        with self.lock:
+            if self.collect_queued:
+                return  # The queued pass sees this deletion too
+            self.collect_queued = True
+        self.pool.start(StoreCollectTask(self))
+
+    def is_busy(self, images_folder=None):
+        with self.lock:
+            return bool(self.pending) if images_folder is None else images_folder in self.pending
+
+    def wait_for_done(self, timeout_ms=-1):
+        """Block until every queued photo has been imported (used at exit and by tests)."""
+        return self.pool.waitForDone(timeout_ms)
+
+    def task_imported(self, images_folder, path):
+        self.imported.emit(images_folder, path)
+        self.task_done(images_folder)
+
+    def task_failed(self, images_folder, source, error):
+        self.failed.emit(source, error)
+        self.task_done(images_folder)
+
+    def task_done(self, images_folder):
+        with self.lock:
+            self.pending[images_folder] -= 1
+            done = not self.pending[images_folder]
+            if done:
+                del self.pending[images_folder]
+        if done:
+            self.finished.emit(images_folder)
+
+_importer = None
+
+def get_image_importer():
+    """Return the photo importer shared by all widgets."""
+    global _importer
+    if _importer is None:
+        _importer = ImageImporter()
+    return _importer
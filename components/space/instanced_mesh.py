@@ -0,0 +1,324 @@
+"""
+Many identical primitives (boxes, spheres, arrows) drawn by one GL item.
+
+Loudspeakers, listener seats and markers share a handful of shapes. Instead
+of one pyqtgraph item per object, each shape is a template mesh copied once
+per instance with its own position, scale, heading and colour, and the
+copies are packed into a single vertex buffer drawn with one draw call.
+pyqtgraph's GL items use the legacy GLSL 1.20 / ES2 pipeline without
+instanced drawing, so the instances are expanded with NumPy into the
+packed buffer. The item keeps its vertex buffer objects allocated at full
+capacity: the slots of the instances that changed are rewritten in memory,
+and on the next paint only that range is written to the GPU, whatever the
+number of edits made since the previous frame. That relies on the vertex
+buffer objects of pyqtgraph 0.14's GLMeshItem; with older versions the
+instances are handed over through setMeshData on every change instead.
+"""
+import numpy as np
+import pyqtgraph.opengl as gl
+try:
+    from pyqtgraph.opengl.items.GLMeshItem import DirtyFlag
+except ImportError:
+    DirtyFlag = None  # pyqtgraph < 0.14
+
+# GLMeshItem keeps its own vertex buffer objects (pyqtgraph >= 0.14), which the item fills directly
+VERTEX_BUFFERS = DirtyFlag is not None and hasattr(gl.GLMeshItem, "upload_vertex_buffers")
+
+LIGHT_DIRECTION = np.array([0.3, 0.5, 0.8]) / np.linalg.norm([0.3, 0.5, 0.8])
+AMBIENT = 0.45  # Shade of the faces turned away from the light
+INITIAL_CAPACITY = 16  # Instances allocated up front; the buffers double when full
+
+def _shade(normals):
+    """Baked diffuse light of the template vertices, from their normals."""
+    return AMBIENT + (1.0 - AMBIENT) * np.clip(normals @ LIGHT_DIRECTION, 0.0, 1.0)
+
+def _flat_mesh(triangles):
+    """Vertices, faces and shades of a flat-shaded mesh given as triangles of shape (F, 3, 3)."""
+    triangles = np.asarray(triangles, dtype=float).reshape(-1, 3, 3)
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    vertices = triangles.reshape(-1, 3)
+    faces = np.arange(len(vertices)).reshape(-1, 3)
+    return vertices, faces, np.repeat(_shade(normals), 3)
+
+def _prism_triangles(points):
+    """Triangles of a prism given as a bottom and a top ring, counter-clockwise seen from the top, facing outwards."""
+    bottom, top = points
+    count = len(bottom)
+    triangles = []
+    for i in range(count):
+        j = (i + 1) % count
+        triangles += [(bottom[i], bottom[j], top[j]), (bottom[i], top[j], top[i])]
+    for i in range(1, count - 1):
+        triangles += [(bottom[0], bottom[i + 1], bottom[i]), (top[0], top[i], top[i + 1])]
+    return triangles
+
+def box_template():
+    """Unit cube centred on the origin."""
+    square = [(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)]
+    return _flat_mesh(_prism_triangles([
+        [(x, y, -0.5) for x, y in square],
+        [(x, y, 0.5) for x, y in square],
+    ]))
+
+def sphere_template(rows=8, cols=12):
+    """Sphere of radius 0.5 centred on the origin, smooth-shaded."""
+    theta = np.linspace(0, np.pi, rows + 1)[:, None]
+    phi = np.linspace(0, 2 * np.pi, cols, endpoint=False)[None, :]
+    normals = np.stack([
+        np.sin(theta) * np.cos(phi),
+        np.sin(theta) * np.sin(phi),
+        np.cos(theta) * np.ones_like(phi),
+    ], axis=-1).reshape(-1, 3)
+
+    faces = []
+    for row in range(rows):
+        for col in range(cols):
+            a = row * cols + col
+            b = row * cols + (col + 1) % cols
+            faces += [(a, a + cols, b + cols), (a, b + cols, b)]
+    return normals * 0.5, np.array(faces), _shade(normals)
+
+def arrow_template(shaft_width=0.1, head_width=0.3, head_length=0.3):
+    """Arrow of length 1 from the origin along +x (square shaft, pyramid head)."""
+    shaft_end = 1.0 - head_length
+
+    def ring(x, half):
+        return [(x, -half, -half), (x, half, -half), (x, half, half), (x, -half, half)]
+
+    shaft = _prism_triangles([ring(0.0, shaft_width / 2), ring(shaft_end, shaft_width / 2)])
+    base = ring(shaft_end, head_width / 2)
+    tip = (1.0, 0.0, 0.0)
+    head = [(base[i], base[(i + 1) % 4], tip) for i in range(4)]  # Sides
+    head += [(base[0], base[1], base[2]), (base[0], base[2], base[3])]  # Base, facing back
+    return _flat_mesh(shaft + head)
+
+PRIMITIVES = {
+    "box": box_template,
+    "sphere": sphere_template,
+    "arrow": arrow_template,
+}
+
+def yaw_matrices(yaws):
+    """Rotations about +z for headings in degrees, shape (N, 3, 3)."""
+    radians = np.radians(np.asarray(yaws, dtype=float).reshape(-1))
+    cos, sin = np.cos(radians), np.sin(radians)
+    matrices = np.zeros((len(radians), 3, 3))
+    matrices[:, 0, 0], matrices[:, 0, 1] = cos, -sin
+    matrices[:, 1, 0], matrices[:, 1, 1] = sin, cos
+    matrices[:, 2, 2] = 1.0
+    return matrices
+
+class InstancedMeshItem(gl.GLMeshItem):
+    """
+    One GL mesh item drawing any number of copies of a template mesh.
+
+    Instances live in consecutive slots of packed float32 buffers; removing
+    one moves the last instance into its slot, so the buffers stay dense and
+    the draw covers exactly the live instances.
+
+    The buffers are handed to pyqtgraph's paint() directly instead of going
+    through MeshData: vertexes, colors and faces are views on the live part
+    of them, and the uploads are done by upload_vertex_buffers(), whole
+    buffers after a reallocation and otherwise only the dirty slot range.
+    Without VERTEX_BUFFERS the live part is copied into setMeshData instead.
+    """
+
+    def __init__(self, vertices, faces, shades=None, capacity=INITIAL_CAPACITY):
+        super().__init__(smooth=True, computeNormals=False)
+        self.template = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        self.template_faces = np.asarray(faces, dtype=np.uint32).reshape(-1, 3)
+        self.shades = np.ones(len(self.template)) if shades is None else np.asarray(shades, dtype=float)
+        self.count = 0
+        self.dirty = None  # (first, end) slots written since the last upload, or None
+        self.allocate(capacity)
+        self.setVisible(False)
+
+    def allocate(self, capacity):
+        """Grow the packed buffers to hold capacity instances, keeping the live ones."""
+        per_vertex = len(self.template)
+        vertices = np.zeros((capacity * per_vertex, 3), dtype=np.float32)
+        colors = np.zeros((capacity * per_vertex, 4), dtype=np.float32)
+        if self.count:
+            vertices[:self.count * per_vertex] = self.vertex_buffer[:self.count * per_vertex]
+            colors[:self.count * per_vertex] = self.color_buffer[:self.count * per_vertex]
+        self.vertex_buffer, self.color_buffer = vertices, colors
+        # Face indices of every slot are fixed, so they are computed once per allocation
+        offsets = (np.arange(capacity, dtype=np.uint32) * per_vertex)[:, None, None]
+        self.face_buffer = (self.template_faces[None] + offsets).reshape(-1, 3)
+        self.capacity = capacity
+        self.reallocated = True  # The GPU buffers are reallocated and filled on the next paint
+
+    def __len__(self):
+        return self.count
+
+    def write(self, slots, positions, colors, scales=1.0, yaws=0.0):
+        """Expand the template into the given slots (vectorized over the instances)."""
+        slots = np.asarray(slots, dtype=int).reshape(-1)
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        scales = np.asarray(scales, dtype=float)
+        if scales.ndim < 2:
+            scales = scales.reshape(-1, 1)  # One size per instance (or for all of them)
+        scales = np.broadcast_to(scales, (len(slots), 3))
+        transforms = yaw_matrices(np.broadcast_to(yaws, len(slots))) * scales[:, None, :]
+        colors = np.broadcast_to(np.asarray(colors, dtype=float).reshape(-1, 4), (len(slots), 4))
+
+        per_vertex = len(self.template)
+        rows = (slots[:, None] * per_vertex + np.arange(per_vertex)[None, :]).reshape(-1)
+        self.vertex_buffer[rows] = (np.einsum("nij,vj->nvi", transforms, self.template) + positions[:, None, :]).reshape(-1, 3)
+        shaded = colors[:, None, :].repeat(per_vertex, axis=1)
+        shaded[:, :, :3] *= self.shades[None, :, None]
+        self.color_buffer[rows] = shaded.reshape(-1, 4)
+        if len(slots):
+            self.mark_dirty(int(slots.min()), int(slots.max()) + 1)
+
+    def mark_dirty(self, first, end):
+        """Extend the slot range to upload on the next paint."""
+        if self.dirty is not None:
+            first, end = min(first, self.dirty[0]), max(end, self.dirty[1])
+        self.dirty = (first, end)
+
+    def set_instances(self, positions, colors, scales=1.0, yaws=0.0):
+        """Replace all instances at once."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if len(positions) > self.capacity:
+            self.count = 0
+            self.allocate(max(len(positions), 2 * self.capacity))
+        self.count = len(positions)
+        if self.count:
+            self.write(np.arange(self.count), positions, colors, scales, yaws)
+        self.commit()
+
+    def append(self, position, color, scale=1.0, yaw=0.0):
+        """Add one instance and return its slot."""
+        if self.count == self.capacity:
+            self.allocate(2 * self.capacity)
+        slot = self.count
+        self.count += 1
+        self.write([slot], [position], [color], np.reshape(scale, (1, -1)), [yaw])
+        self.commit()
+        return slot
+
+    def replace(self, slot, position, color, scale=1.0, yaw=0.0):
+        """Move, resize, turn or recolour one instance."""
+        self.write([slot], [position], [color], np.reshape(scale, (1, -1)), [yaw])
+        self.commit()
+
+    def remove(self, slot):
+        """Remove one instance; the last instance moves into its slot, whose index is returned (None if none moved)."""
+        last = self.count - 1
+        per_vertex = len(self.template)
+        moved = None
+        if slot != last:
+            target, source = slice(slot * per_vertex, (slot + 1) * per_vertex), slice(last * per_vertex, (last + 1) * per_vertex)
+            self.vertex_buffer[target] = self.vertex_buffer[source]
+            self.color_buffer[target] = self.color_buffer[source]
+            self.mark_dirty(slot, slot + 1)
+            moved = last
+        self.count = last
+        self.commit()
+        return moved
+
+    def commit(self):
+        """Point the item at the live part of the buffers (views, no copy) and schedule a repaint."""
+        vertices = self.count * len(self.template)
+        if not VERTEX_BUFFERS:
+            self.setMeshData(
+                vertexes=self.vertex_buffer[:vertices].copy(),
+                faces=self.face_buffer[:self.count * len(self.template_faces)].copy(),
+                vertexColors=self.color_buffer[:vertices].copy(),
+            )
+            self.reallocated = False
+            self.dirty = None
+            self.setVisible(self.count > 0)
+            return
+        self.vertexes = self.vertex_buffer[:vertices]
+        self.colors = self.color_buffer[:vertices]
+        self.faces = self.face_buffer[:self.count * len(self.template_faces)]
+        self.normals = None  # Shading is baked into the colours
+        self.setVisible(self.count > 0)
+        self.update()
+
+    def parseMeshData(self):
+        """Report pending uploads; the buffers are maintained by write() and commit(), not parsed from MeshData."""
+        if not VERTEX_BUFFERS:
+            return super().parseMeshData()
+        return DirtyFlag.POSITION if self.reallocated or self.dirty is not None else DirtyFlag(0)
+
+    def upload_vertex_buffers(self, dirty_bits):
+        """Upload whole buffers after a reallocation, otherwise only the slots written since the last paint."""
+        buffers = ((self.m_vbo_position, self.vertex_buffer), (self.m_vbo_color, self.color_buffer))
+        if self.reallocated:
+            for vbo, array in buffers + ((self.m_ibo_faces, self.face_buffer),):
+                if not vbo.isCreated():
+                    vbo.create()
+                vbo.bind()
+                vbo.allocate(array, array.nbytes)
+                vbo.release()
+        elif self.dirty is not None:
+            per_vertex = len(self.template)
+            first, end = self.dirty
+            for vbo, array in buffers:
+                chunk = array[first * per_vertex:end * per_vertex]
+                vbo.bind()
+                vbo.write(first * per_vertex * array.strides[0], chunk, chunk.nbytes)
+                vbo.release()
+        self.reallocated = False
+        self.dirty = None
+
+class SceneObjects:
+    """
+    Markers, loudspeakers and seats of a scene, one InstancedMeshItem per primitive.
+
+    Objects are referred to by ids that stay valid when other objects are
+    removed. The item of a primitive is added to the view with its first
+    object; any later object only adds an instance to it.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self.items = {}  # Primitive -> InstancedMeshItem
+        self.slots = {}  # Object id -> (primitive, slot)
+        self.slot_ids = {}  # Primitive -> list of object ids by slot
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def item(self, primitive):
+        if primitive not in self.items:
+            vertices, faces, shades = PRIMITIVES[primitive]()
+            item = InstancedMeshItem(vertices, faces, shades)
+            self.view.addItem(item)
+            self.items[primitive] = item
+            self.slot_ids[primitive] = []
+        return self.items[primitive]
+
+    def add(self, primitive, position, color=(1.0, 1.0, 1.0, 1.0), scale=0.3, yaw=0.0):
+        """Add an object (scale is one size or per-axis sizes, yaw a heading in degrees) and return its id."""
+        slot = self.item(primitive).append(position, color, scale, yaw)
+        object_id = self.next_id
+        self.next_id += 1
+        self.slots[object_id] = (primitive, slot)
+        self.slot_ids[primitive].append(object_id)
+        return object_id
+
+    def update(self, object_id, position, color=(1.0, 1.0, 1.0, 1.0), scale=0.3, yaw=0.0):
+        primitive, slot = self.slots[object_id]
+        self.items[primitive].replace(slot, position, color, scale, yaw)
+
+    def remove(self, object_id):
+        primitive, slot = self.slots.pop(object_id)
+        ids = self.slot_ids[primitive]
+        moved = self.items[primitive].remove(slot)
+        if moved is not None:
+            ids[slot] = ids[moved]
+            self.slots[ids[slot]] = (primitive, slot)
+        ids.pop()
+
+    def clear(self):
+        for item in self.items.values():
+            item.set_instances(np.zeros((0, 3)), np.zeros((0, 4)))
+        self.slots.clear()
+        for ids in self.slot_ids.values():
+            ids.clear()
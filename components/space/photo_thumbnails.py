@@ -0,0 +1,127 @@
+import hashlib
+import os
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+from components.space.image_store import ImageStore, save_image
+
+PHOTO_CACHE_DIR = os.path.join("spaces", ".cache", "photos")
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024  # Budget of the in-memory LRU
+
+class PhotoTaskSignals(QObject):
+    finished = pyqtSignal(str, QImage)  # Cache key, decoded thumbnail (null on failure)
+
+class PhotoTask(QRunnable):
+    """Decode one photo at reduced size on a worker thread, going through the disk cache."""
+
+    def __init__(self, key, path, size, cache_path, image_store=None):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.size = size
+        self.cache_path = cache_path
+        self.image_store = image_store  # Previews rendered on import are decoded instead of the photo
+        self.signals = PhotoTaskSignals()
+
+    def run(self):
+        image = QImage(self.cache_path) if os.path.isfile(self.cache_path) else QImage()
+        if image.isNull():
+            image = self.decode()
+            if not image.isNull():
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                try:
+                    save_image(image, self.cache_path)  # Temporary file and rename: never a truncated cache entry
+                except OSError:
+                    pass  # Decoded again next time
+        self.signals.finished.emit(self.key, image)
+
+    def decode(self):
+        preview = self.image_store.preview_for(self.path, self.size.width(), self.size.height()) if self.image_store else None
+        reader = QImageReader(preview or self.path)
+        reader.setAutoTransform(True)  # Honour the EXIF orientation of camera photos
+        original = reader.size()
+        if original.isValid():
+            # The decoder skips the full-resolution pass when it can (e.g. JPEG DCT scaling)
+            reader.setScaledSize(original.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatio))
+        return reader.read()
+
+class PhotoThumbnailService(QObject):
+    """
+    Thread-pooled thumbnails of the space photos.
+
+    thumbnail() answers from a memory LRU when it can; otherwise it returns None
+    and queues a background task that decodes the photo at reduced size (or
+    reads it back from the disk cache). thumbnail_ready is emitted on the GUI
+    thread once the pixmap is available, so callers can show a placeholder and
+    fill it in later.
+    """
+    thumbnail_ready = pyqtSignal(str, int, int)  # Photo path, requested width, requested height
+
+    def __init__(self, cache_dir=PHOTO_CACHE_DIR, memory_bytes=MEMORY_CACHE_BYTES, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.memory_bytes = memory_bytes
+        self.pixmaps = OrderedDict()  # Key -> QPixmap, least recently used first
+        self.used_bytes = 0
+        self.pending = {}  # Key -> (path, width, height)
+        self.failed = set()  # Keys of photos that could not be decoded
+        self.image_store = ImageStore()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThreadPool.globalInstance().maxThreadCount())))
+
+    def cache_key(self, path, width, height):
+        """Key of a thumbnail: the photo path, its modification time and the requested size."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        payload = f"{os.path.abspath(path)}:{mtime}".encode("utf-8")
+        return f"{hashlib.sha1(payload).hexdigest()}_{width}x{height}"
+
+    def cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.jpg")
+
+    def thumbnail(self, path, width, height):
+        """Return the thumbnail as a QPixmap, or None if it is still being loaded."""
+        width, height = max(1, int(width)), max(1, int(height))
+        key = self.cache_key(path, width, height)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        if key in self.failed:
+            return QPixmap()
+        if key not in self.pending:
+            self.pending[key] = (path, width, height)
+            task = PhotoTask(key, path, QSize(width, height), self.cache_path(key), self.image_store)
+            task.signals.finished.connect(self.task_finished)
+            self.pool.start(task)
+        return None
+
+    def task_finished(self, key, image):
+        request = self.pending.pop(key, None)
+        if request is None:
+            return
+        path, width, height = request
+        if image.isNull():
+            self.failed.add(key)
+        else:
+            self.store(key, QPixmap.fromImage(image))
+        self.thumbnail_ready.emit(path, width, height)
+
+    def store(self, key, pixmap):
+        """Insert a pixmap in the LRU, evicting the oldest ones past the memory budget."""
+        self.pixmaps[key] = pixmap
+        self.used_bytes += pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+        while self.used_bytes > self.memory_bytes and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.used_bytes -= evicted.width() * evicted.height() * max(1, evicted.depth() // 8)
+
+_service = None
+
+def get_photo_thumbnails():
+    """Return the thumbnail service shared by all widgets."""
+    global _service
+    if _service is None:
+        _service = PhotoThumbnailService()
+    return _service
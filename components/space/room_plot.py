@@ -1,52 +1,19 @@
 import numpy as np
 import pyqtgraph.opengl as gl
 import pyqtgraph as pg
-from PyQt6.QtGui import QColor
+from components.space.geometry import build_room_geometry, box_walls, door_quads, hsv_to_rgba, QUAD_FACES
 
 def plot_room(view, Lx, Ly, Lz, axes_items, h=0.6, s=0.5, v=1.0, set_center=True, door=True):
     view.clear()
 
-    edges = [
-        [(0, 0, 0), (Lx, 0, 0)],
-        [(Lx, 0, 0), (Lx, Ly, 0)],
-        [(Lx, Ly, 0), (0, Ly, 0)],
-
-        [(0, Ly, 0), (0, 0, 0)],
-        [(0, 0, Lz), (Lx, 0, Lz)],
-        [(Lx, 0, Lz), (Lx, Ly, Lz)],
-
-        [(Lx, Ly, Lz), (0, Ly, Lz)],
-        [(0, Ly, Lz), (0, 0, Lz)],
-        [(0, 0, 0), (0, 0, Lz)],
-        
-        [(Lx, 0, 0), (Lx, 0, Lz)],
-        [(Lx, Ly, 0), (Lx, Ly, Lz)],
-        [(0, Ly, 0), (0, Ly, Lz)],
-    ]
-
-    color = QColor.fromHsvF(h, s, v)
-    r, g, b, a = color.redF(), color.greenF(), color.blueF(), color.alphaF()
-
-    # Draw edges
-    for start, end in edges:
-        pts = np.array([start, end])
-        plt = gl.GLLinePlotItem(pos=pts, color=(r, g, b, a), width=3, antialias=True)  # Increased width to 3
-        view.addItem(plt)
-
-    # Draw base area
-    base_color = QColor.fromHsvF(h, s, v, alpha=0.3)  # Semi-transparent base
-    r_base, g_base, b_base, a_base = base_color.redF(), base_color.greenF(), base_color.blueF(), base_color.alphaF()
-    vertices = np.array([
-        [0, 0, 0],
-        [Lx, 0, 0],
-        [Lx, Ly, 0],
-        [0, Ly, 0]
-    ])
-    faces = np.array([
-        [0, 1, 2],
-        [0, 2, 3]
-    ])
-    base_mesh = gl.GLMeshItem(vertexes=vertices, faces=faces, faceColors=[(r_base, g_base, b_base, a_base)] * 2, smooth=False)
+    geometry = build_room_geometry([(Lx, Ly, Lz)], colors=[(h, s, v)])
+
+    # Draw all edges with a single line item
+    edges = gl.GLLinePlotItem(pos=geometry.edge_vertices, color=geometry.edge_colors, mode='lines', width=3, antialias=True)
+    view.addItem(edges)
+
+    # Draw base area (semi-transparent)
+    base_mesh = gl.GLMeshItem(vertexes=geometry.floor_vertices, faces=geometry.floor_faces, faceColors=geometry.floor_colors, smooth=False)
     base_mesh.setGLOptions('additive')  # Enable blending and disable depth testing
     view.addItem(base_mesh)
 
@@ -90,26 +57,13 @@ def create_translucent_wall(view, wall_index, Lx, Ly, Lz, h=0.6, s=0.5, v=1.0, a
         h, s, v: HSV color values for the wall.
         alpha: Transparency of the wall.
     """
-    walls = [
-        [(0, 0, 0), (Lx, 0, 0), (Lx, 0, Lz), (0, 0, Lz)],  # Wall 0
-        [(Lx, 0, 0), (Lx, Ly, 0), (Lx, Ly, Lz), (Lx, 0, Lz)],  # Wall 1
-        [(Lx, Ly, 0), (0, Ly, 0), (0, Ly, Lz), (Lx, Ly, Lz)],  # Wall 2
-        [(0, Ly, 0), (0, 0, 0), (0, 0, Lz), (0, Ly, Lz)],  # Wall 3
-    ]
-
-    if wall_index < 0 or wall_index >= len(walls):
+    if wall_index < 0 or wall_index >= 4:
         raise ValueError("Invalid wall index")
 
-    vertices = np.array(walls[wall_index])
-    faces = np.array([
-        [0, 1, 2],
-        [0, 2, 3]
-    ])
-
-    color = QColor.fromHsvF(h, s, v, alpha)
-    r, g, b, a = color.redF(), color.greenF(), color.blueF(), color.alphaF()
+    vertices = box_walls([(Lx, Ly, Lz)])[0, wall_index]
+    color = tuple(hsv_to_rgba([(h, s, v)], alpha)[0])
 
-    wall_mesh = gl.GLMeshItem(vertexes=vertices, faces=faces, faceColors=[(r, g, b, a)] * 2, smooth=False)
+    wall_mesh = gl.GLMeshItem(vertexes=vertices, faces=QUAD_FACES, faceColors=[color] * 2, smooth=False)
     wall_mesh.setGLOptions('additive')  # Enable blending and disable depth testing
     view.addItem(wall_mesh)
 
@@ -132,49 +86,20 @@ def create_door(view, width, height, offset, wall_index, room_dims, room_color):
         The created door surface (GLMeshItem).
     """
     # Calculate door vertices based on the selected wall
-    if wall_index == 0:  # Front wall (width)
-        vertices = [
-            (offset, 0, 0),
-            (offset + width, 0, 0),
-            (offset + width, 0, height),
-            (offset, 0, height)
-        ]
-    elif wall_index == 1:  # Right wall (length)
-        vertices = [
-            (room_dims["width"], offset, 0),
-            (room_dims["width"], offset + width, 0),
-            (room_dims["width"], offset + width, height),
-            (room_dims["width"], offset, height)
-        ]
-    elif wall_index == 2:  # Bottom wall (width)
-        vertices = [
-            (room_dims["width"] - offset, room_dims["length"], 0),
-            (room_dims["width"] - offset - width, room_dims["length"], 0),
-            (room_dims["width"] - offset - width, room_dims["length"], height),
-            (room_dims["width"] - offset, room_dims["length"], height)
-        ]
-    elif wall_index == 3:  # Left wall (length)
-        vertices = [
-            (0, room_dims["length"] - offset, 0),
-            (0, room_dims["length"] - offset - width, 0),
-            (0, room_dims["length"] - offset - width, height),
-            (0, room_dims["length"] - offset, height)
-        ]
-    else:
+    dims = [(room_dims.get("width", 0), room_dims.get("length", 0), room_dims.get("height", 0))]
+    quads, valid = door_quads(dims, [(0, width, height, offset, wall_index)])
+    if not valid[0]:
         return None
 
-    # Calculate door color based on room color
-    h = room_color["hue"] / 360.0
-    s = room_color["saturation"] / 100.0
-    v = room_color["value"] / 100.0
-    color = QColor.fromHsvF(h, s, v, 0.5)  # 50% transparency
-    r, g, b, a = color.redF(), color.greenF(), color.blueF(), color.alphaF()
+    # Calculate door color based on room color (50% transparency)
+    hsv = (room_color.get("hue", 0) / 360.0, room_color.get("saturation", 0) / 100.0, room_color.get("value", 0) / 100.0)
+    color = tuple(hsv_to_rgba([hsv], 0.5)[0])
 
     # Create the door surface
     door_surface = gl.GLMeshItem(
-        vertexes=np.array(vertices),
-        faces=np.array([[0, 1, 2], [0, 2, 3]]),
-        faceColors=[(r, g, b, a)] * 2,  # Color based on the room
+        vertexes=quads[0],
+        faces=QUAD_FACES,
+        faceColors=[color] * 2,  # Color based on the room
         smooth=False
     )
     door_surface.setGLOptions('additive')  # Enable blending
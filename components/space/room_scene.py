@@ -0,0 +1,174 @@
+import numpy as np
+import pyqtgraph.opengl as gl
+from components.space.geometry import build_room_geometry, box_walls, door_quads, hsv_to_rgba, quad_faces, QUAD_FACES
+from components.space.instanced_mesh import SceneObjects
+from components.space.space_model import SpaceModel
+
+class RoomScene:
+    """
+    Persistent set of GL items showing the rooms of a space in the editor.
+
+    The edges, floors, grid, doors and wall overlay are created once and added
+    to the view; later changes only push new vertex data into the same items
+    instead of clearing the view and allocating a new scene. All rooms share
+    one edge item and one floor mesh, and all openings one door mesh; markers,
+    loudspeakers and seats go to one instanced item per shape. Each
+    item has a single colour, drawn as a constant attribute rather than
+    per-vertex arrays, so a colour change never touches the geometry buffers.
+    """
+
+    def __init__(self, view, model=None):
+        self.view = view
+        self.model = model if model is not None else SpaceModel()
+        self.wall = None  # (room, wall index) of the highlighted wall or None
+        self.hover = None  # Key of the surface under the cursor or None
+
+        # All edges share a single line item drawn in "lines" mode
+        self.edges = gl.GLLinePlotItem(pos=np.zeros((24, 3)), mode='lines', width=3, antialias=True)
+
+        # Semi-transparent floors
+        self.floor = self._create_quad()
+
+        # Floor grid, resized and re-centred in place
+        self.grid = gl.GLGridItem()
+        self.grid.setSpacing(x=1, y=1)
+
+        # Door surfaces (hidden while the space has no openings)
+        self.door_mesh = self._create_quad()
+        self.door_mesh.setVisible(False)
+
+        # Translucent overlay for the selected wall (hidden until shown)
+        self.wall_mesh = self._create_quad()
+        self.wall_mesh.setVisible(False)
+
+        # Overlay for the wall or door under the cursor (hidden until hovered)
+        self.hover_mesh = self._create_quad()
+        self.hover_mesh.setVisible(False)
+
+        for item in (self.edges, self.floor, self.grid, self.door_mesh, self.wall_mesh, self.hover_mesh):
+            self.view.addItem(item)
+
+        # Objects placed in the space, drawn by one item per primitive (box, sphere, arrow)
+        self.objects = SceneObjects(self.view)
+
+    def _create_quad(self):
+        """Create an additive quad mesh that will be filled in by update()."""
+        mesh = gl.GLMeshItem(vertexes=np.zeros((4, 3)), faces=QUAD_FACES, color=(0, 0, 0, 0), smooth=False)
+        mesh.setGLOptions('additive')  # Enable blending and disable depth testing
+        return mesh
+
+    def _set_quads(self, mesh, quads):
+        quads = np.asarray(quads, dtype=float).reshape(-1, 4, 3)
+        mesh.setMeshData(vertexes=quads.reshape(-1, 3), faces=quad_faces(len(quads)), smooth=False)
+
+    def _rgba(self, alpha=1.0):
+        return tuple(float(c) for c in hsv_to_rgba([self.model.hsv()], alpha)[0])
+
+    @property
+    def dimensions(self):
+        """Dimensions of the first room (the whole space for single-room spaces)."""
+        return dict(self.model.rooms[0]["coordinates"])
+
+    def set_model(self, model):
+        """Show another space, reusing the existing GL items."""
+        self.model = model
+        if self.wall is not None and self.wall[0] >= len(model.rooms):
+            self.hide_wall()
+        self.refresh()
+
+    def update(self, Lx, Ly, Lz, h=0.6, s=0.5, v=1.0, room=0):
+        """Update the dimensions of a room and the colour, reusing the existing GL items."""
+        self.model.set_room(room, Lx, Ly, Lz)
+        self.model.color = {"hue": h * 360.0, "saturation": s * 100.0, "value": v * 100.0}
+        self.refresh()
+
+    def refresh(self):
+        """Push the geometry of every room and opening of the model into the items."""
+        dims, origins = self.model.dimensions(), self.model.origins()
+        geometry = build_room_geometry(dims, origins=origins)
+        self.edges.setData(pos=geometry.edge_vertices)
+        self.floor.setMeshData(vertexes=geometry.floor_vertices, faces=geometry.floor_faces, smooth=False)
+
+        # The grid covers the floor plan of the whole space
+        (x0, y0, _), (x1, y1, _) = self.model.bounds()
+        self.grid.setSize(x=x1 - x0, y=y1 - y0)
+        self.grid.resetTransform()
+        self.grid.translate((x0 + x1) / 2, (y0 + y1) / 2, 0)
+
+        self._update_doors()
+        self._update_wall()
+        self._apply_color()
+
+    def set_color(self, h, s, v):
+        """Change only the colour; the geometry of the items is left untouched."""
+        self.model.color = {"hue": h * 360.0, "saturation": s * 100.0, "value": v * 100.0}
+        self._apply_color()
+
+    def _apply_color(self):
+        self.edges.setData(color=self._rgba())
+        self.floor.setColor(self._rgba(0.3))
+        self.door_mesh.setColor(self._rgba(0.5))  # 50% transparency
+        self.wall_mesh.setColor(self._rgba(0.3))
+        self.hover_mesh.setColor(self._rgba(0.15))
+
+    def set_door(self, width, height, offset, wall_index, room=0):
+        """Give a room a single door on the given wall and return the door item."""
+        self.model.set_opening(room, width, height, offset, wall_index)
+        self._update_doors()
+
+        # Keep the door parameters on the item for later use
+        self.door_mesh.width = width
+        self.door_mesh.height = height
+        self.door_mesh.offset = offset
+        self.door_mesh.wall_index = wall_index
+        return self.door_mesh
+
+    def clear_door(self, room=0):
+        """Remove the doors of a room."""
+        self.model.clear_openings(room)
+        self._update_doors()
+
+    def _update_doors(self):
+        self.hide_hover()  # Surfaces may have moved; the next mouse move picks again
+        quads, _ = door_quads(self.model.dimensions(), self.model.door_records(), self.model.origins())
+        if not len(quads):
+            self.door_mesh.setVisible(False)
+            return
+        self._set_quads(self.door_mesh, quads)
+        self.door_mesh.setVisible(True)
+
+    def show_wall(self, wall_index, room=0):
+        """Highlight a wall of a room with the translucent overlay."""
+        self.wall = (room, wall_index)
+        self._update_wall()
+        return self.wall_mesh
+
+    def hide_wall(self):
+        """Hide the translucent wall overlay."""
+        self.wall = None
+        self.wall_mesh.setVisible(False)
+
+    def _update_wall(self):
+        if self.wall is None:
+            return
+        room, wall_index = self.wall
+        walls = box_walls(self.model.dimensions()[room], self.model.origins()[room])
+        self._set_quads(self.wall_mesh, walls[0, wall_index])
+        self.wall_mesh.setVisible(True)
+
+    def show_hover(self, key, quad):
+        """Highlight the surface under the cursor; key identifies it so an unchanged hover costs nothing."""
+        if key == self.hover:
+            return False
+        self.hover = key
+        self._set_quads(self.hover_mesh, quad)
+        self.hover_mesh.setVisible(True)
+        return True
+
+    def hide_hover(self):
+        """Hide the hover overlay; return True if it was visible."""
+        if self.hover is None:
+            return False
+        self.hover = None
+        self.hover_mesh.setVisible(False)
+        return True
@@ -0,0 +1,194 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from components.space.space_file import read_space, space_file_path
+
+CATALOG_PATH = os.path.join(".cache", "catalog.sqlite")  # Relative to the spaces directory
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+REFRESH_BATCH_SIZE = 100  # Spaces checked per step of refresh_batches()
+
+class SpaceCatalog:
+    """
+    Persistent catalog of the saved spaces, stored in SQLite next to them.
+
+    For every space it keeps the parsed data, the list of photos and the
+    modification times of the space file (binary, or JSON for spaces saved by
+    older versions; the json_mtime column holds either) and of the images folder. A refresh
+    only stats the space folders and re-reads the entries whose mtime changed,
+    so reloading the galleries costs O(changed) instead of O(library).
+
+    One catalog is shared by every gallery, whose loaders refresh it on their
+    own worker threads while the GUI thread may remove entries: each thread
+    opens its own SQLite connection, and the lock serializes the transactions
+    and every access to the in-memory copy.
+    """
+
+    def __init__(self, spaces_directory="spaces", path=None):
+        self.spaces_directory = str(spaces_directory)
+        self.path = path or os.path.join(self.spaces_directory, CATALOG_PATH)
+        self.entries = None  # In-memory copy: name -> (space_data, image_paths)
+        self.lock = threading.RLock()  # Held per transaction, never across a yield of refresh_batches()
+
+    @contextmanager
+    def connect(self):
+        """Open a transaction on the catalog (one connection per call, so any thread can use it)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                # Cheap when the table exists; recreates the catalog if the cache folder was deleted
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS spaces ("
+                    " name TEXT PRIMARY KEY,"
+                    " json_mtime INTEGER,"
+                    " images_mtime INTEGER,"
+                    " image_count INTEGER,"
+                    " images TEXT,"
+                    " data TEXT)"
+                )
+                yield connection
+        finally:
+            connection.close()
+
+    def scan(self):
+        """Return {name: (json_path, json_mtime, images_path, images_mtime)} for the space folders on disk."""
+        entries = {}
+        if not os.path.isdir(self.spaces_directory):
+            return entries
+        with os.scandir(self.spaces_directory) as iterator:
+            for entry in iterator:
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                json_path = space_file_path(entry.path, entry.name)
+                try:
+                    json_mtime = os.stat(json_path).st_mtime_ns
+                except OSError:
+                    continue  # Not a saved space
+                images_path = os.path.join(entry.path, "images")
+                try:
+                    images_mtime = os.stat(images_path).st_mtime_ns
+                except OSError:
+                    images_mtime = None
+                entries[entry.name] = (json_path, json_mtime, images_path, images_mtime)
+        return entries
+
+    def refresh(self):
+        """Bring the catalog up to date with the disk and return the names that changed."""
+        changed = []
+        for _ in self.refresh_batches(changed=changed):
+            pass
+        return changed
+
+    def refresh_batches(self, batch_size=REFRESH_BATCH_SIZE, changed=None):
+        """
+        Refresh the catalog a few spaces at a time.
+
+        Yields the up-to-date [(space_data, image_paths)] of each batch in name
+        order, so a caller can show the first spaces before the whole library
+        has been checked. The names that changed are appended to changed.
+        """
+        on_disk = self.scan()
+        with self.lock:
+            with self.connect() as connection:
+                stored = {
+                    name: (json_mtime, images_mtime)
+                    for name, json_mtime, images_mtime in connection.execute("SELECT name, json_mtime, images_mtime FROM spaces")
+                }
+
+                # Forget spaces removed from disk
+                removed = [name for name in stored if name not in on_disk]
+                connection.executemany("DELETE FROM spaces WHERE name = ?", [(name,) for name in removed])
+
+            # Keep the in-memory copy in sync without re-parsing unchanged spaces
+            if self.entries is None:
+                self.read_entries()
+            for name in removed:
+                self.entries.pop(name, None)
+
+        names = sorted(on_disk)
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            with self.lock, self.connect() as connection:
+                for name in batch:
+                    json_path, json_mtime, images_path, images_mtime = on_disk[name]
+                    previous = stored.get(name)
+                    if previous == (json_mtime, images_mtime):
+                        continue
+                    if changed is not None:
+                        changed.append(name)
+
+                    if previous is None or previous[0] != json_mtime:
+                        data = self.read_json(json_path)
+                    else:
+                        data = connection.execute("SELECT data FROM spaces WHERE name = ?", (name,)).fetchone()[0]
+
+                    if previous is None or previous[1] != images_mtime:
+                        images = self.scan_images(images_path)
+                    else:
+                        images = json.loads(connection.execute("SELECT images FROM spaces WHERE name = ?", (name,)).fetchone()[0])
+
+                    connection.execute(
+                        "INSERT OR REPLACE INTO spaces (name, json_mtime, images_mtime, image_count, images, data) VALUES (?, ?, ?, ?, ?, ?)",
+                        (name, json_mtime, images_mtime, len(images), json.dumps(images), data),
+                    )
+                    self.set_entry(name, data, images)
+                loaded = [self.entries[name] for name in batch if name in self.entries]
+            yield loaded
+
+    def set_entry(self, name, data, images):
+        if data is None:
+            self.entries.pop(name, None)
+        else:
+            images_folder = os.path.join(self.spaces_directory, name, "images")
+            self.entries[name] = (json.loads(data), [os.path.join(images_folder, img) for img in images])
+
+    def read_entries(self):
+        """Load every readable space stored in the catalog."""
+        with self.lock, self.connect() as connection:
+            self.entries = {}
+            for name, images, data in connection.execute("SELECT name, images, data FROM spaces WHERE data IS NOT NULL"):
+                self.set_entry(name, data, json.loads(images))
+            return self.entries
+
+    def read_json(self, json_path):
+        """Return the space as JSON text (binary files are converted), or None if it cannot be read."""
+        try:
+            return json.dumps(read_space(json_path))
+        except (OSError, ValueError, KeyError):
+            return None  # Stored as unreadable until the file changes again
+
+    def scan_images(self, images_path):
+        """Return the sorted photo names of an images folder."""
+        if not os.path.isdir(images_path):
+            return []
+        return sorted(img for img in os.listdir(images_path) if img.lower().endswith(IMAGE_EXTENSIONS))
+
+    def spaces(self):
+        """Return (space_data, image_paths) for every readable space, sorted by name."""
+        with self.lock:
+            if self.entries is None:
+                self.read_entries()
+            return [self.entries[name] for name in sorted(self.entries)]
+
+    def load(self):
+        """Refresh the catalog and return all spaces (see spaces())."""
+        self.refresh()
+        return self.spaces()
+
+    def remove(self, name):
+        """Drop a space from the catalog (after it has been deleted from disk)."""
+        with self.lock, self.connect() as connection:
+            connection.execute("DELETE FROM spaces WHERE name = ?", (name,))
+            if self.entries is not None:
+                self.entries.pop(name, None)
+
+_catalogs = {}
+
+def get_space_catalog(spaces_directory="spaces"):
+    """Return the catalog shared by all widgets for a spaces directory."""
+    key = os.path.abspath(str(spaces_directory))
+    if key not in _catalogs:
+        _catalogs[key] = SpaceCatalog(spaces_directory)
+    return _catalogs[key]
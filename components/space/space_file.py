@@ -0,0 +1,193 @@
+"""
+Binary space files (.spb): a small header, a section table and typed sections.
+
+Layout (little endian):
+    header          magic, format version, section count, table offset
+    section table   one entry per section: name, dtype, shape, offset, size
+    sections        raw array bytes, each starting on a SECTION_ALIGNMENT boundary
+
+The "metadata" section holds UTF-8 JSON (name, description, colour and any
+field without a better home); rooms and openings are float64 arrays, and
+meshes, point clouds or simulation results can be stored as extra sections.
+A reader memory-maps the file and returns the arrays as read-only NumPy
+views on the mapping, so large sections are never copied or parsed. The JSON
+files of older versions stay readable and can still be exported.
+"""
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from components.space.space_model import SpaceModel
+
+SPACE_FILE_EXTENSION = ".spb"
+SPACE_FILE_MAGIC = b"SPCB"
+SPACE_FILE_VERSION = 1  # Readers refuse files of a newer version
+SECTION_ALIGNMENT = 64  # Bytes; keeps every array aligned for NumPy and SIMD loads
+MAX_DIMENSIONS = 4
+MMAP_THRESHOLD = 1 << 16  # Smaller files are read into memory at once, mapping them costs more than it saves
+
+# magic, version, section count, offset of the section table
+HEADER = struct.Struct("<4sIIQ")
+# name, dtype (NumPy type string), number of dimensions, shape, offset, size in bytes
+SECTION = struct.Struct(f"<32s8sI{MAX_DIMENSIONS}QQQ")
+
+METADATA_SECTION = "metadata"
+ROOMS_SECTION = "rooms"  # (N, 6): origin x, y, z, width, length, height
+OPENINGS_SECTION = "openings"  # (M, 5): room, width, height, offset, wall index
+
+def aligned(offset):
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+def encode_space_file(metadata, arrays=None):
+    """Return the bytes of a space file holding metadata (a JSON-serializable dict) and named arrays."""
+    sections = [(METADATA_SECTION, np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8))]
+    for name, array in (arrays or {}).items():
+        array = np.ascontiguousarray(array)
+        if array.ndim > MAX_DIMENSIONS or array.dtype.kind not in "biufc":
+            raise ValueError(f"Section '{name}' must be a numeric array with at most {MAX_DIMENSIONS} dimensions.")
+        sections.append((name, array.astype(array.dtype.newbyteorder("<"), copy=False)))
+
+    table_offset = HEADER.size
+    offset = aligned(table_offset + len(sections) * SECTION.size)
+    entries, chunks = [], []
+    for name, array in sections:
+        shape = list(array.shape) + [0] * (MAX_DIMENSIONS - array.ndim)
+        entries.append(SECTION.pack(name.encode("utf-8"), array.dtype.str.encode("ascii"), array.ndim, *shape, offset, array.nbytes))
+        chunks.append((offset, array.tobytes()))
+        offset = aligned(offset + array.nbytes)
+
+    data = bytearray(offset)
+    data[:HEADER.size] = HEADER.pack(SPACE_FILE_MAGIC, SPACE_FILE_VERSION, len(sections), table_offset)
+    data[table_offset:table_offset + len(entries) * SECTION.size] = b"".join(entries)
+    for start, chunk in chunks:
+        data[start:start + len(chunk)] = chunk
+    return bytes(data)
+
+def space_sections(space_data):
+    """Split a space dict (as saved in JSON) into metadata and the room and opening arrays."""
+    model = SpaceModel.from_dict(space_data)
+    metadata = {key: value for key, value in space_data.items() if key not in ("coordinates", "door", "rooms", "openings")}
+    metadata["color"] = model.to_dict()["color"]
+    arrays = {
+        ROOMS_SECTION: np.hstack([model.origins(), model.dimensions()]),
+        OPENINGS_SECTION: model.door_records(),
+    }
+    return metadata, arrays
+
+def write_space_file(path, space_data, arrays=None):
+    """Write a space dict, plus optional extra arrays (meshes, results), as a space file."""
+    metadata, sections = space_sections(space_data)
+    sections.update(arrays or {})
+    with open(path, "wb") as file:
+        file.write(encode_space_file(metadata, sections))
+
+class SpaceFile:
+    """
+    A space file opened for reading; arrays are zero-copy views on a memory mapping
+    (or, for files of a few kilobytes, on the bytes read at once).
+
+    Use it as a context manager, or call close() once the arrays are no
+    longer needed (views still in use keep the mapping alive).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+                self.buffer = file.read()
+            else:
+                self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._metadata = None
+        try:
+            self.sections = self.read_table()
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    def read_table(self):
+        """Check the header and return the sections: name -> (dtype, shape, offset, size)."""
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"'{self.path}' is not a space file.")
+        magic, self.version, count, table_offset = HEADER.unpack_from(self.buffer, 0)
+        if magic != SPACE_FILE_MAGIC:
+            raise ValueError(f"'{self.path}' is not a space file.")
+        if self.version > SPACE_FILE_VERSION:
+            raise ValueError(f"'{self.path}' was written by a newer version (format {self.version}).")
+
+        sections = {}
+        for index in range(count):
+            name, dtype, ndim, *rest = SECTION.unpack_from(self.buffer, table_offset + index * SECTION.size)
+            shape, (offset, size) = tuple(rest[:ndim]), rest[MAX_DIMENSIONS:]
+            if offset + size > len(self.buffer):
+                raise ValueError(f"'{self.path}' is truncated.")
+            sections[name.rstrip(b"\0").decode("utf-8")] = (np.dtype(dtype.rstrip(b"\0").decode("ascii")), shape, offset, size)
+        return sections
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def array(self, name):
+        """Return a section as a read-only array backed by the file mapping."""
+        dtype, shape, offset, size = self.sections[name]
+        return np.frombuffer(self.buffer, dtype=dtype, count=size // dtype.itemsize, offset=offset).reshape(shape)
+
+    @property
+    def metadata(self):
+        if self._metadata is None:
+            self._metadata = json.loads(self.array(METADATA_SECTION).tobytes().decode("utf-8"))
+        return self._metadata
+
+    def space_model(self):
+        rooms = self.array(ROOMS_SECTION) if ROOMS_SECTION in self else np.zeros((0, 6))
+        openings = self.array(OPENINGS_SECTION) if OPENINGS_SECTION in self else np.zeros((0, 5))
+        return SpaceModel(
+            [
+                {"origin": dict(zip("xyz", map(float, room[:3]))), "coordinates": dict(zip(("width", "length", "height"), map(float, room[3:])))}
+                for room in rooms
+            ] or None,
+            [
+                {"room": int(room), "width": float(width), "height": float(height), "offset": float(offset), "wall_index": int(wall_index)}
+                for room, width, height, offset, wall_index in openings
+            ],
+            dict(self.metadata.get("color", {})) or None,
+        )
+
+    def to_dict(self):
+        """Return the space as the dict saved in the JSON format."""
+        return {**self.metadata, **self.space_model().to_dict()}
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            try:
+                self.buffer.close()
+            except BufferError:
+                pass  # Arrays handed out still use the mapping; it is released with them
+        self.buffer = None
+
+def read_space(path):
+    """Read a saved space, binary or JSON, as the dict of the JSON format."""
+    if path.endswith(SPACE_FILE_EXTENSION):
+        with SpaceFile(path) as space_file:
+            return space_file.to_dict()
+    with open(path, "r") as file:
+        return json.load(file)
+
+def export_space_json(path, json_path):
+    """Export a binary space file to the JSON format (indented like the files of older versions)."""
+    with open(json_path, "w") as file:
+        json.dump(read_space(path), file, indent=4)
+
+def space_file_path(space_folder, name):
+    """Path of the saved file of a space: the binary file, or the JSON file of older versions if only that exists."""
+    binary_path = os.path.join(space_folder, f"{name}{SPACE_FILE_EXTENSION}")
+    json_path = os.path.join(space_folder, f"{name}.json")
+    if not os.path.exists(binary_path) and os.path.exists(json_path):
+        return json_path
+    return binary_path
@@ -0,0 +1,70 @@
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from components.space.space_catalog import get_space_catalog
+
+class SpaceLoadSignals(QObject):
+    batch_loaded = pyqtSignal(int, list)  # Generation, [(space_data, image_paths)]
+    finished = pyqtSignal(int)  # Generation
+
+class SpaceLoadTask(QRunnable):
+    """Refresh the catalog on a worker thread and stream the spaces back in batches."""
+
+    def __init__(self, loader, catalog, generation):
+        super().__init__()
+        self.loader = loader
+        self.catalog = catalog
+        self.generation = generation
+        self.signals = SpaceLoadSignals()
+
+    def run(self):
+        try:
+            for batch in self.catalog.refresh_batches():
+                if self.loader.generation != self.generation:
+                    return  # A newer load (or a cancel) made this one stale
+                self.signals.batch_loaded.emit(self.generation, batch)
+        except Exception:
+            traceback.print_exc()  # Keep the spaces loaded so far; the gallery must not wait forever
+        self.signals.finished.emit(self.generation)
+
+class SpaceLoader(QObject):
+    """
+    Loads the saved spaces off the GUI thread.
+
+    JSON parsing and image folder scans run in a worker; the spaces arrive on
+    the GUI thread through batch_loaded, in name order, as soon as each batch
+    is ready. Every load gets a new generation number, so batches of a
+    cancelled or superseded load are dropped.
+    """
+    batch_loaded = pyqtSignal(list)  # [(space_data, image_paths)]
+    finished = pyqtSignal()
+
+    def __init__(self, spaces_directory="spaces", parent=None):
+        super().__init__(parent)
+        self.spaces_directory = spaces_directory
+        self.generation = 0
+        self.loading = False
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)  # A stale load stops at its next batch before the new one starts
+
+    def load(self):
+        """Start a new load, cancelling the one in progress."""
+        self.generation += 1
+        self.loading = True
+        task = SpaceLoadTask(self, get_space_catalog(self.spaces_directory), self.generation)
+        task.signals.batch_loaded.connect(self.task_batch_loaded)
+        task.signals.finished.connect(self.task_finished)
+        self.pool.start(task)
+
+    def cancel(self):
+        """Drop the load in progress, if any."""
+        self.generation += 1
+        self.loading = False
+
+    def task_batch_loaded(self, generation, batch):
+        if generation == self.generation:
+            self.batch_loaded.emit(batch)
+
+    def task_finished(self, generation):
+        if generation == self.generation:
+            self.loading = False
+            self.finished.emit()
@@ -0,0 +1,266 @@
+"""
+Space made of several rooms and openings.
+
+The JSON format stays readable by older versions: "coordinates", "color" and
+"door" always describe the first room and its first opening, and the extra
+"rooms" and "openings" lists are only written when a space has more than
+that. Rooms are axis-aligned boxes placed by their minimum corner; a
+bounding-volume hierarchy over them answers picking, overlap and visibility
+queries without testing every room.
+"""
+import numpy as np
+from components.space.bvh import BoundingVolumeHierarchy
+from components.space.geometry import box_bounds, box_walls, door_quads, ray_quad_distances
+
+DEFAULT_ROOM = {"width": 3.0, "length": 3.0, "height": 2.0}
+DEFAULT_COLOR = {"hue": 216, "saturation": 50, "value": 100}
+OPENING_KEYS = ("width", "height", "offset", "wall_index")
+DOOR_PICK_BIAS = 1e-6  # Doors lie in their wall plane: on a tie the door wins
+
+class SpaceModel:
+    """Rooms (origin + dimensions) and openings (doors on a room wall) of one space, sharing one colour."""
+
+    def __init__(self, rooms=None, openings=None, color=None):
+        self.rooms = rooms if rooms is not None else [
+            {"origin": {"x": 0.0, "y": 0.0, "z": 0.0}, "coordinates": dict(DEFAULT_ROOM)}
+        ]
+        self.openings = openings if openings is not None else []  # {"room", "width", "height", "offset", "wall_index"}
+        self.color = color if color is not None else dict(DEFAULT_COLOR)
+        self._bvh = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Read a space as saved in its JSON file (single-room files included)."""
+        color = dict(DEFAULT_COLOR, **data.get("color", {}))
+        if data.get("rooms"):
+            rooms = [
+                {
+                    "origin": {axis: float(room.get("origin", {}).get(axis, 0.0)) for axis in "xyz"},
+                    "coordinates": {key: float(room.get("coordinates", {}).get(key, 0.0)) for key in DEFAULT_ROOM},
+                }
+                for room in data["rooms"]
+            ]
+        else:
+            coordinates = data.get("coordinates", {})
+            rooms = [{
+                "origin": {"x": 0.0, "y": 0.0, "z": 0.0},
+                "coordinates": {key: float(coordinates.get(key, 0.0)) for key in DEFAULT_ROOM},
+            }]
+
+        if "openings" in data:
+            openings = [dict(opening) for opening in data["openings"]]
+        elif data.get("door"):
+            openings = [dict(data["door"], room=0)]
+        else:
+            openings = []
+        openings = [opening for opening in openings if 0 <= opening.get("room", 0) < len(rooms)]
+        for opening in openings:
+            opening.setdefault("room", 0)
+        return cls(rooms, openings, color)
+
+    def to_dict(self):
+        """Return the JSON fields of the space (without name and description), rounded like the editor."""
+        first = self.rooms[0]["coordinates"]
+        data = {
+            "coordinates": {key: round(first[key], 2) for key in DEFAULT_ROOM},
+            "color": {key: int(round(self.color[key])) for key in DEFAULT_COLOR},
+        }
+        first_doors = [opening for opening in self.openings if opening["room"] == 0]
+        if first_doors:
+            data["door"] = self.opening_dict(first_doors[0])
+
+        # Older versions only read the fields above; the full layout follows when there is more to it
+        if len(self.rooms) > 1 or len(self.openings) > len(first_doors[:1]):
+            data["rooms"] = [
+                {
+                    "origin": {axis: round(room["origin"][axis], 2) for axis in "xyz"},
+                    "coordinates": {key: round(room["coordinates"][key], 2) for key in DEFAULT_ROOM},
+                }
+                for room in self.rooms
+            ]
+            data["openings"] = [dict(self.opening_dict(opening), room=opening["room"]) for opening in self.openings]
+        return data
+
+    @staticmethod
+    def opening_dict(opening):
+        return {
+            "width": round(opening["width"], 2),
+            "height": round(opening["height"], 2),
+            "offset": round(opening["offset"], 2),
+            "wall_index": int(opening["wall_index"]),
+        }
+
+    # Arrays for the geometry kernel
+
+    def dimensions(self):
+        """Room dimensions, shape (N, 3) (width, length, height)."""
+        return np.array([[room["coordinates"][key] for key in DEFAULT_ROOM] for room in self.rooms], dtype=float).reshape(-1, 3)
+
+    def origins(self):
+        """Room origins (minimum corner), shape (N, 3)."""
+        return np.array([[room["origin"][axis] for axis in "xyz"] for room in self.rooms], dtype=float).reshape(-1, 3)
+
+    def door_records(self):
+        """Opening records for build_room_geometry, shape (M, 5): room, width, height, offset, wall index."""
+        return np.array(
+            [[opening["room"]] + [opening[key] for key in OPENING_KEYS] for opening in self.openings], dtype=float
+        ).reshape(-1, 5)
+
+    def hsv(self):
+        """The space colour as HSV in [0, 1]."""
+        return (self.color["hue"] / 360.0, self.color["saturation"] / 100.0, self.color["value"] / 100.0)
+
+    # Editing
+
+    def changed(self):
+        """Drop the spatial index after the rooms moved or were resized."""
+        self._bvh = None
+
+    def set_room(self, index, width=None, length=None, height=None, origin=None):
+        room = self.rooms[index]
+        for key, value in (("width", width), ("length", length), ("height", height)):
+            if value is not None:
+                room["coordinates"][key] = float(value)
+        if origin is not None:
+            room["origin"] = {axis: float(value) for axis, value in zip("xyz", origin)}
+        self.changed()
+
+    def add_room(self, width, length, height, origin):
+        """Append a room and return its index."""
+        self.rooms.append({
+            "origin": {axis: float(value) for axis, value in zip("xyz", origin)},
+            "coordinates": {"width": float(width), "length": float(length), "height": float(height)},
+        })
+        self.changed()
+        return len(self.rooms) - 1
+
+    def remove_room(self, index):
+        """Remove a room with its openings (the last room is kept)."""
+        if len(self.rooms) <= 1:
+            return
+        del self.rooms[index]
+        self.openings = [
+            dict(opening, room=opening["room"] - (opening["room"] > index))
+            for opening in self.openings if opening["room"] != index
+        ]
+        self.changed()
+
+    def insert_room(self, index, room, openings=()):
+        """Put a removed room back at its index with its openings (undo of remove_room)."""
+        self.openings = [
+            dict(opening, room=opening["room"] + (opening["room"] >= index)) for opening in self.openings
+        ] + [dict(opening, room=index) for opening in openings]
+        self.rooms.insert(index, {"origin": dict(room["origin"]), "coordinates": dict(room["coordinates"])})
+        self.changed()
+
+    def room_openings(self, room):
+        return [opening for opening in self.openings if opening["room"] == room]
+
+    def set_opening(self, room, width, height, offset, wall_index):
+        """Give a room a single opening, replacing the ones it had."""
+        self.clear_openings(room)
+        opening = {"room": room, "width": width, "height": height, "offset": offset, "wall_index": wall_index}
+        self.openings.append(opening)
+        return opening
+
+    def clear_openings(self, room):
+        self.openings = [opening for opening in self.openings if opening["room"] != room]
+
+    def wall_length(self, room, wall_index):
+        """Length of a room wall (walls 0 and 2 run along the width, 1 and 3 along the length)."""
+        coordinates = self.rooms[room]["coordinates"]
+        return coordinates["width"] if wall_index in (0, 2) else coordinates["length"]
+
+    def adjacent_origin(self, room, wall_index, width, length):
+        """Origin of a width x length room placed against the outside of a room wall."""
+        origin = self.origins()[room]
+        coordinates = self.rooms[room]["coordinates"]
+        if wall_index == 0:
+            return (origin[0], origin[1] - length, origin[2])
+        if wall_index == 1:
+            return (origin[0] + coordinates["width"], origin[1], origin[2])
+        if wall_index == 2:
+            return (origin[0], origin[1] + coordinates["length"], origin[2])
+        return (origin[0] - width, origin[1], origin[2])
+
+    # Spatial queries
+
+    @property
+    def bvh(self):
+        if self._bvh is None:
+            self._bvh = BoundingVolumeHierarchy(self.room_bounds())
+        return self._bvh
+
+    def room_bounds(self):
+        return box_bounds(self.dimensions(), self.origins())
+
+    def bounds(self):
+        """Bounds (minimum, maximum) enclosing the whole space."""
+        return self.bvh.root_bounds
+
+    def center(self):
+        box_min, box_max = self.bounds()
+        return (box_min + box_max) / 2
+
+    def overlapping_rooms(self):
+        """Pairs of rooms whose volumes overlap (rooms sharing a wall are fine)."""
+        return self.bvh.overlapping_pairs()
+
+    def room_overlaps(self, width, length, height, origin, ignore=None):
+        """Return the rooms a box at origin would overlap, optionally ignoring one room (the one being edited)."""
+        origin = np.asarray(origin, dtype=float)
+        hits = self.bvh.query_box(origin, origin + (width, length, height))
+        return [int(room) for room in hits if room != ignore]
+
+    def rooms_at(self, point):
+        return [int(room) for room in self.bvh.query_point(point)]
+
+    def rooms_on_ray(self, origin, direction):
+        """Rooms whose box the ray crosses, nearest first, with their entry distances."""
+        return self.bvh.query_ray(origin, direction)
+
+    def visible_rooms(self, planes):
+        return [int(room) for room in self.bvh.query_frustum(planes)]
+
+    def pick_surface(self, origin, direction):
+        """
+        Return the wall or door nearest along a ray, or None if the ray misses them all.
+
+        Only the rooms whose box the ray crosses are tested; their walls and
+        openings are intersected with the ray in one NumPy pass. Surfaces are
+        only hit from inside their room, like the far walls of a dollhouse, so
+        the walls drawn behind the near ones can be picked from outside.
+
+        The result is a dict with "kind" ("wall" or "door"), "room",
+        "wall_index", "opening" (index in self.openings, None for walls),
+        "distance" and "quad" (4, 3).
+        """
+        rooms, _ = self.rooms_on_ray(origin, direction)
+        if not len(rooms):
+            return None
+
+        dims, origins = self.dimensions(), self.origins()
+        walls = box_walls(dims[rooms], origins[rooms]).reshape(-1, 4, 3)
+        wall_rooms = np.repeat(rooms, 4)
+        wall_indices = np.tile(np.arange(4), len(rooms))
+
+        records = self.door_records()
+        openings = np.flatnonzero(np.isin(records[:, 0].astype(int), rooms))
+        doors, valid = door_quads(dims, records[openings], origins)
+        openings = openings[valid]
+
+        distances = ray_quad_distances(origin, direction, np.concatenate([walls, doors]), inside_only=True)
+        distances[len(walls):] -= DOOR_PICK_BIAS
+        nearest = int(np.argmin(distances))
+        if not np.isfinite(distances[nearest]):
+            return None
+        if nearest < len(walls):
+            return {
+                "kind": "wall", "room": int(wall_rooms[nearest]), "wall_index": int(wall_indices[nearest]),
+                "opening": None, "distance": float(distances[nearest]), "quad": walls[nearest],
+            }
+        opening = int(openings[nearest - len(walls)])
+        return {
+            "kind": "door", "room": int(self.openings[opening]["room"]), "wall_index": int(self.openings[opening]["wall_index"]),
+            "opening": opening, "distance": float(distances[nearest] + DOOR_PICK_BIAS), "quad": doors[nearest - len(walls)],
+        }
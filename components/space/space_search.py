@@ -0,0 +1,84 @@
+from collections import defaultdict
+
+GRAM_SIZE = 3  # Trigrams, plus shorter grams for short queries
+SEARCH_DEBOUNCE_MS = 150  # Delay between the last keystroke and the search
+
+def normalize(text):
+    return " ".join(str(text).casefold().split())
+
+def grams(text, size):
+    """Return the set of substrings of the given size."""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class SpaceSearchIndex:
+    """
+    In-memory search index over the name and description of the spaces.
+
+    Every text is split into grams of 1 to 3 characters. A query of up to three
+    characters is answered with a single lookup; longer queries intersect the
+    sets of their trigrams and confirm the few candidates left with a
+    substring check.
+    """
+
+    def __init__(self):
+        self.texts = {}  # Key -> normalized searchable text
+        self.postings = defaultdict(set)  # Gram -> keys whose text contains it
+
+    @staticmethod
+    def space_text(space):
+        return normalize(f"{space.get('name', '')} {space.get('description', '')}")
+
+    def update(self, spaces):
+        """Synchronize the index with a list of spaces, re-indexing only the texts that changed."""
+        current = {space.get("name", ""): self.space_text(space) for space in spaces}
+        for key in [key for key in self.texts if key not in current]:
+            self.remove(key)
+        for key, text in current.items():
+            if self.texts.get(key) != text:
+                self.add(key, text)
+
+    def merge(self, spaces):
+        """Add or re-index some spaces, leaving the other entries untouched."""
+        for space in spaces:
+            key, text = space.get("name", ""), self.space_text(space)
+            if self.texts.get(key) != text:
+                self.add(key, text)
+
+    def add(self, key, text):
+        """Index (or re-index) a single entry."""
+        self.remove(key)
+        self.texts[key] = text
+        for size in range(1, GRAM_SIZE + 1):
+            for gram in grams(text, size):
+                self.postings[gram].add(key)
+
+    def remove(self, key):
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        for size in range(1, GRAM_SIZE + 1):
+            for gram in grams(text, size):
+                keys = self.postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[gram]
+
+    def search(self, query):
+        """Return the set of matching keys, or None when the query matches everything."""
+        query = normalize(query)
+        if not query:
+            return None
+        if len(query) <= GRAM_SIZE:
+            return set(self.postings.get(query, ()))
+
+        # Intersect the rarest trigrams first, then confirm the candidates
+        candidates = None
+        for gram in sorted(grams(query, GRAM_SIZE), key=lambda g: len(self.postings.get(g, ()))):
+            keys = self.postings.get(gram)
+            if not keys:
+                return set()
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                return set()
+        return {key for key in candidates if query in self.texts[key]}
@@ -0,0 +1,184 @@
+import os
+import shutil
+import tempfile
+import threading
+import traceback
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+from components.space.image_store import ImageStore, get_image_importer
+from components.space.space_catalog import get_space_catalog
+from components.space.space_file import SPACE_FILE_EXTENSION, encode_space_file, space_sections
+
+def fsync_directory(directory):
+    """Flush a directory entry (the rename of a file into it) to disk, where the platform allows it."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows: directories cannot be opened, NTFS journals the rename
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Some file systems do not support it
+    finally:
+        os.close(fd)
+
+def atomic_write(path, data):
+    """
+    Replace path with data so that a crash leaves either the old or the new file, never a torn one.
+
+    The bytes go to a temporary file in the same folder, which is fsynced and
+    then renamed over path; the rename itself is flushed with the folder.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+
+def delete_space_files(spaces_directory, name):
+    """Delete a saved space: its folder, its catalog entry and, in the background, the stored photos only it used."""
+    space_folder = os.path.join(spaces_directory, name)
+    if os.path.exists(space_folder):
+        shutil.rmtree(space_folder)
+    get_space_catalog(spaces_directory).remove(name)
+    get_image_importer().collect_unused()
+
+class SpaceWriteJob:
+    """Everything needed to save one space, captured on the GUI thread."""
+
+    def __init__(self, name, space_folder, space_data, reset_images=False):
+        self.name = name
+        self.space_folder = space_folder
+        self.space_data = space_data
+        self.reset_images = reset_images  # Empty the images folder (the space was saved without photos)
+
+    def run(self):
+        """Write the space file and return its path."""
+        os.makedirs(self.space_folder, exist_ok=True)
+        path = os.path.join(self.space_folder, f"{self.name}{SPACE_FILE_EXTENSION}")
+        atomic_write(path, encode_space_file(*space_sections(self.space_data)))
+
+        # The binary file replaces the JSON file of older versions
+        legacy_path = os.path.join(self.space_folder, f"{self.name}.json")
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
+        if self.reset_images:
+            images_folder = os.path.join(self.space_folder, "images")
+            shutil.rmtree(images_folder, ignore_errors=True)
+            os.makedirs(images_folder, exist_ok=True)
+            ImageStore().collect()  # Photos no other space links to
+        return path
+
+class SpaceWriteSignals(QObject):
+    saved = pyqtSignal(str, str)  # Name, path
+    failed = pyqtSignal(str, str)  # Name, error message
+
+class SpaceWriteTask(QRunnable):
+    """Write the pending saves of one space until none is left."""
+
+    def __init__(self, writer, name):
+        super().__init__()
+        self.writer = writer
+        self.name = name
+        self.signals = SpaceWriteSignals()
+
+    def run(self):
+        while True:
+            job = self.writer.take(self.name)
+            if job is None:
+                return
+            try:
+                path = job.run()
+            except Exception as error:
+                traceback.print_exc()
+                self.signals.failed.emit(job.name, str(error))
+            else:
+                self.signals.saved.emit(job.name, path)
+
+class SpaceWriter(QObject):
+    """
+    Saves spaces on a background thread.
+
+    A save submitted while an earlier save of the same space is still waiting
+    replaces it, so rapid repeated saves write the file once with the latest
+    data. Saves of one space are never written concurrently, and each file
+    is replaced atomically (temporary file, fsync, rename). Completion is
+    reported on the GUI thread through saved or failed.
+    """
+    saved = pyqtSignal(str, str)  # Name, path
+    failed = pyqtSignal(str, str)  # Name, error message
+    idle = pyqtSignal()  # No save left to write
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        self.pending = {}  # Name -> latest SpaceWriteJob not started yet
+        self.active = set()  # Names with a task scheduled or running
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)  # Different spaces can be written side by side
+
+        # Saves still queued when the application quits are written before it exits
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.wait_for_done)
+
+    def submit(self, job):
+        """Queue a save; it replaces a save of the same space that has not started yet."""
+        with self.lock:
+            self.pending[job.name] = job
+            if job.name in self.active:
+                return  # The running task picks it up when its current write ends
+            self.active.add(job.name)
+        task = SpaceWriteTask(self, job.name)
+        task.signals.saved.connect(self.task_saved)
+        task.signals.failed.connect(self.task_failed)
+        self.pool.start(task)
+
+    def take(self, name):
+        """Return the next job of a space for its task, or None (and release the space) when there is none."""
+        with self.lock:
+            job = self.pending.pop(name, None)
+            if job is None:
+                self.active.discard(name)
+            return job
+
+    def has_pending(self, name):
+        """Return whether a save of the space is waiting to be written (a newer one than any running)."""
+        with self.lock:
+            return name in self.pending
+
+    def is_busy(self, name=None):
+        with self.lock:
+            return bool(self.active) if name is None else name in self.active
+
+    def wait_for_done(self, timeout_ms=-1):
+        """Block until every queued save has been written (used at exit and by tests)."""
+        return self.pool.waitForDone(timeout_ms)
+
+    def task_saved(self, name, path):
+        self.saved.emit(name, path)
+        if not self.is_busy():
+            self.idle.emit()
+
+    def task_failed(self, name, error):
+        self.failed.emit(name, error)
+        if not self.is_busy():
+            self.idle.emit()
+
+_writer = None
+
+def get_space_writer():
+    """Return the background writer shared by every save of the application."""
+    global _writer
+    if _writer is None:
+        _writer = SpaceWriter()
+    return _writer
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+import pyqtgraph.opengl as gl
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap, QPixmapCache, QVector3D
+from components.space.room_scene import RoomScene
+from components.space.space_model import SpaceModel
+
+THUMBNAIL_CACHE_DIR = os.path.join("spaces", ".cache", "thumbnails")
+
+MAX_PENDING = 64  # Queued previews; older requests (cards scrolled past) are dropped and asked again when painted
+
+# Camera used by the gallery previews
+PREVIEW_CAMERA = {"distance": 10, "elevation": 17, "azimuth": 295}
+
+class ThumbnailRenderer(QObject):
+    """
+    Shared offscreen renderer for gallery previews.
+
+    A single hidden GLViewWidget draws each space once; the result is stored as a
+    PNG on disk, keyed by a hash of the space JSON, and kept in QPixmapCache.
+
+    Painting code calls request(), which never renders: a preview that is not
+    in memory is queued and loaded (from disk, or drawn) one per pass of the
+    event loop, newest request first, and thumbnail_ready is emitted when it
+    is available. The GL context lives on the GUI thread, so the work is
+    spread over idle passes rather than moved to a worker.
+    """
+    thumbnail_ready = pyqtSignal(str, int)  # Space name, preview size
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.view = None  # Created on first render
+        self.scene = None
+        self.pending = OrderedDict()  # Key -> (space_data, size), oldest request first
+        self.failed = set()  # Keys of previews that could not be drawn (no OpenGL); not retried on every paint
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.render_next)
+
+    def cache_key(self, space_data, size):
+        """Return the cache key of a space preview of the given size."""
+        payload = json.dumps(space_data, sort_keys=True).encode("utf-8")
+        return f"{hashlib.sha1(payload).hexdigest()}_{size}"
+
+    def cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def request(self, space_data, size=200):
+        """Return the preview if it is in memory; otherwise queue it and return None (see thumbnail_ready)."""
+        key = self.cache_key(space_data, size)
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+        if key in self.failed:
+            return QPixmap()
+        self.pending[key] = (space_data, size)
+        self.pending.move_to_end(key)
+        while len(self.pending) > MAX_PENDING:
+            self.pending.popitem(last=False)
+        if not self.timer.isActive():
+            self.timer.start(0)
+        return None
+
+    def render_next(self):
+        """Load or draw the most recently requested preview, then yield to the event loop."""
+        if not self.pending:
+            return
+        key, (space_data, size) = self.pending.popitem()
+        if self.thumbnail(space_data, size).isNull():
+            self.failed.add(key)
+        self.thumbnail_ready.emit(space_data.get("name", ""), size)
+        if self.pending:
+            self.timer.start(0)
+
+    def thumbnail(self, space_data, size=200):
+        """Return the preview of a space as a QPixmap, rendering it now if it is not cached."""
+        key = self.cache_key(space_data, size)
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+
+        path = self.cache_path(key)
+        image = QImage(path) if os.path.isfile(path) else QImage()
+        if image.isNull():
+            image = self.render(space_data, size)
+            if not image.isNull():
+                os.makedirs(self.cache_dir, exist_ok=True)
+                image.save(path, "PNG")
+
+        pixmap = QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def render(self, space_data, size=200):
+        """Draw a space offscreen and return the image (null if OpenGL is unavailable)."""
+        view = self.get_view()
+        view.resize(size, size)
+
+        model = SpaceModel.from_dict(space_data)
+        self.scene.set_model(model)
+
+        view.setCameraPosition(**PREVIEW_CAMERA)
+        view.opts['center'] = QVector3D(*model.center())
+        return view.grabFramebuffer()
+
+    def get_view(self):
+        """Create the hidden view used for rendering on first use."""
+        if self.view is None:
+            self.view = gl.GLViewWidget()
+            self.view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+            self.view.show()  # Needed to create the GL context, the widget never reaches the screen
+            self.scene = RoomScene(self.view)
+        return self.view
+
+_renderer = None
+
+def get_thumbnail_renderer():
+    """Return the renderer shared by all galleries."""
+    global _renderer
+    if _renderer is None:
+        _renderer = ThumbnailRenderer()
+    return _renderer
@@ -0,0 +1,52 @@
+import time
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QGuiApplication
+
+DEFAULT_REFRESH_RATE = 60.0  # Used when the screen does not report one
+
+class SceneUpdateScheduler(QObject):
+    """
+    Coalesces scene edits into at most one update per displayed frame.
+
+    Edits only mark a flag (e.g. "geometry" or "color") as dirty. The first
+    edit after an idle period is applied on the next pass of the event loop;
+    edits arriving within the same frame are merged and applied together one
+    frame interval after the previous update. The callback receives the set
+    of dirty flags and reads the current state itself, so the work per frame
+    is bounded whatever the number of change events.
+    """
+
+    def __init__(self, callback, parent=None, frame_interval=None):
+        super().__init__(parent)
+        self.callback = callback
+        if frame_interval is None:
+            screen = QGuiApplication.primaryScreen()
+            rate = screen.refreshRate() if screen is not None else 0
+            frame_interval = 1.0 / (rate if rate > 0 else DEFAULT_REFRESH_RATE)
+        self.frame_interval = frame_interval  # Seconds
+        self.dirty = set()
+        self.last_flush = 0.0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def mark_dirty(self, flag):
+        """Record an edit; the update runs at the next frame boundary."""
+        self.dirty.add(flag)
+        if not self.timer.isActive():
+            elapsed = time.monotonic() - self.last_flush
+            self.timer.start(max(0, int((self.frame_interval - elapsed) * 1000)))
+
+    def flush(self):
+        """Apply the pending edits now (also used before reading the edited state)."""
+        self.timer.stop()
+        if not self.dirty:
+            return
+        dirty, self.dirty = self.dirty, set()
+        self.last_flush = time.monotonic()
+        self.callback(dirty)
+
+    def discard(self):
+        """Drop the pending edits, e.g. when a full update has just been applied."""
+        self.timer.stop()
+        self.dirty = set()
@@ -0,0 +1,83 @@
+import math
+import time
+from PyQt6.QtCore import QObject, QTimer, Qt
+from PyQt6.QtGui import QGuiApplication
+
+HOLD_SPEED = 2.0  # Zoom speed while "+"/"-" is held, in log-distance per second
+WHEEL_IMPULSE = 1.0  # Velocity added by one wheel notch (120 eighths of a degree)
+DECAY_TIME = 0.12  # Time constant of the inertia after a wheel flick, in seconds
+MIN_SPEED = 0.01  # Below this velocity the zoom comes to rest
+MIN_STEP = 1e-4  # Smaller changes of log-distance are not worth a repaint
+
+class ZoomController(QObject):
+    """
+    Inertial zoom driven by the display refresh.
+
+    Input only sets or adds a velocity in log-distance per second: holding a
+    zoom button or key keeps a constant velocity, wheel and trackpad events
+    add impulses that decay exponentially. A timer ticking once per frame
+    integrates the velocity over the real elapsed time and passes the
+    resulting factor to zoom(); it runs only while the zoom is moving, and
+    frames where the distance would not visibly change request no repaint.
+    """
+
+    def __init__(self, zoom, parent=None):
+        super().__init__(parent)
+        self.zoom = zoom  # Callable applying a distance factor
+        self.velocity = 0.0
+        self.hold_direction = 0  # -1 zooming in, 1 zooming out, 0 released
+        self.pending = 0.0  # Log-distance accumulated but not applied yet
+        self.last_time = None
+
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(max(1, int(1000 / (rate if rate > 0 else 60))))
+        self.timer.timeout.connect(self.step)
+
+    def hold(self, direction):
+        """Zoom continuously in ("in") or out ("out") until release()."""
+        self.hold_direction = -1 if direction == "in" else 1
+        self.start()
+
+    def release(self):
+        """Stop a held zoom; the motion eases out with the usual decay."""
+        self.hold_direction = 0
+
+    def impulse(self, notches):
+        """Add inertia for a wheel turn (positive notches zoom in)."""
+        self.velocity -= notches * WHEEL_IMPULSE
+        self.start()
+
+    def start(self):
+        if not self.timer.isActive():
+            self.last_time = time.monotonic()
+            self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.velocity = 0.0
+        self.hold_direction = 0
+        self.pending = 0.0
+
+    def step(self):
+        now = time.monotonic()
+        dt = now - self.last_time
+        self.last_time = now
+
+        if self.hold_direction:
+            self.velocity = self.hold_direction * HOLD_SPEED
+            self.pending += self.velocity * dt
+        else:
+            # Exact integral of v * exp(-t / tau) over the frame
+            decay = math.exp(-dt / DECAY_TIME)
+            self.pending += self.velocity * DECAY_TIME * (1 - decay)
+            self.velocity *= decay
+
+        if abs(self.pending) >= MIN_STEP:
+            self.zoom(math.exp(self.pending))
+            self.pending = 0.0
+
+        if not self.hold_direction and abs(self.velocity) < MIN_SPEED:
+            self.stop()
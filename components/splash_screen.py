@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QSplashScreen, QLabel, QVBoxLayout, QWidget
+from PyQt6.QtWidgets import QSplashScreen, QLabel, QVBoxLayout, QWidget, QProgressBar
 from PyQt6.QtGui import QGuiApplication
 from PyQt6.QtCore import Qt, QTimer
 from config.constants import PROGRAM_NAME, AUTHOR_NAME, COMPANY_NAME
@@ -40,9 +40,26 @@ class SplashScreen(QSplashScreen):
         author_label.setObjectName("authorLabel")  # Set object name for styling
         layout.addWidget(author_label)
 
+        # Startup progress, updated by main.py as each phase completes
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("statusLabel")  # Set object name for styling
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setObjectName("startupProgress")  # Set object name for styling
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setTextVisible(False)
+        layout.addWidget(self.progress_bar)
+
         content.setLayout(layout)
         content.setGeometry(0, 0, 400, 200)
 
     def show_splash(self, duration=3000):
         self.show()
-        QTimer.singleShot(duration, self.close)
\ No newline at end of file
+        QTimer.singleShot(duration, self.close)
+
+    def set_progress(self, value, message):
+        """Show the startup progress (0-100) and the phase being run."""
+        self.progress_bar.setValue(value)
+        self.status_label.setText(message)
+        self.repaint()  # The next phase blocks the event loop, paint now
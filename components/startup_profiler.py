@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+
+PROCESS_START = time.perf_counter()  # Imported first by main.py, so this is close to the process start
+
+class StartupProfiler:
+    """Wall-clock timings of the startup phases, printed with --profile-startup."""
+
+    def __init__(self, origin=PROCESS_START):
+        self.origin = origin
+        self.phases = []  # (name, start in ms from origin, duration in ms)
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a startup phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, (start - self.origin) * 1000.0, (end - start) * 1000.0))
+
+    def mark(self, name):
+        """Record a milestone (e.g. the first frame) as a phase of zero length."""
+        self.phases.append((name, (time.perf_counter() - self.origin) * 1000.0, 0.0))
+
+    def elapsed(self, name):
+        """Return the end of the first phase called name in ms from the origin, or None."""
+        for phase, start, duration in self.phases:
+            if phase == name:
+                return start + duration
+        return None
+
+    def report(self):
+        """Return the phases as a table ordered by start time."""
+        lines = [f"{'phase':<28}{'start ms':>10}{'duration ms':>13}"]
+        for name, start, duration in sorted(self.phases, key=lambda phase: phase[1]):
+            lines.append(f"{name:<28}{start:>10.1f}{duration:>13.1f}")
+        return "\n".join(lines)
+
+_profiler = None
+
+def get_startup_profiler():
+    """Return the profiler shared by main.py and the windows it builds."""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler
@@ -1,30 +1,57 @@
-import json
-import os
+import sys
+from PyQt6.QtCore import QObject, pyqtSignal
+from localization.translation_catalog import get_translation_catalog
+
+FALLBACK_LANGUAGE = "en"  # Keys missing in the current language are looked up here
+
+class Language(QObject):
+    # Emitted with the new code after set_language; widgets connect their retranslate_ui to it
+    language_changed = pyqtSignal(str)
 
-class Language:
     def __init__(self, default_language="en"):
+        super().__init__()
         self.current_language = default_language  # Add current_language attribute
-        self.translations = self.load_translations(default_language)
+        self.catalogs = self.load_chain(default_language)
+        self.missing_keys = {}  # Language code -> keys requested but not defined there
 
     def set_language(self, language_code):
-        """Set the current language and load its translations."""
+        """Set the current language, load its translations and notify the widgets."""
+        if language_code == self.current_language:
+            return
+        self.catalogs = self.load_chain(language_code)
         self.current_language = language_code  # Update current_language
-        self.translations = self.load_translations(language_code)
+        self.language_changed.emit(language_code)
 
     def get_current_language(self):
         """Get the current language code."""
         return self.current_language
 
     def get(self, key):
-        """Retrieve a translation for the given key."""
-        return self.translations.get(key, key)
+        """Retrieve a translation for the given key, falling back to English, then to the key itself."""
+        for catalog in self.catalogs:
+            text = catalog.lookup(key)
+            if text is not None:
+                if catalog is not self.catalogs[0]:
+                    self.report_missing(self.current_language, key)
+                return text
+        for catalog in self.catalogs:
+            self.report_missing(catalog.language_code, key)
+        return key
+
+    def report_missing(self, language_code, key):
+        """Remember a missing key and warn about it the first time it is requested."""
+        missing = self.missing_keys.setdefault(language_code, set())
+        if key not in missing:
+            missing.add(key)
+            print(f"Missing translation for '{key}' in '{language_code}'", file=sys.stderr)
+
+    def load_chain(self, language_code):
+        """Return the catalogs to search for a language: itself, then the fallback language."""
+        chain = [self.load_translations(language_code)]
+        if language_code != FALLBACK_LANGUAGE:
+            chain.append(self.load_translations(FALLBACK_LANGUAGE))
+        return chain
 
     def load_translations(self, language_code):
-        """Load translations for the given language code."""
-        base_path = os.path.dirname(__file__)
-        lang_file = os.path.join(base_path, f"{language_code}.json")
-        if os.path.exists(lang_file):
-            with open(lang_file, "r", encoding="utf-8") as file:
-                return json.load(file)
-        else:
-            raise FileNotFoundError(f"Language file '{language_code}.json' not found.")
+        """Load the compiled translations for the given language code (a mapping with get())."""
+        return get_translation_catalog(language_code)
@@ -0,0 +1,168 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+LOCALIZATION_DIR = os.path.dirname(__file__)
+CATALOG_CACHE_DIR = os.path.join(LOCALIZATION_DIR, ".cache")
+CATALOG_MAGIC = b"SPTC"
+CATALOG_VERSION = 1
+
+# magic, version, source mtime (ns), source size, number of keys, number of slots
+HEADER = struct.Struct("<4sIqqII")
+# key offset, key length, value offset, value length (key length 0 marks an empty slot)
+SLOT = struct.Struct("<IIII")
+
+def key_hash(key_bytes):
+    """Hash used by the slot table; crc32 is stable across processes and computed in C."""
+    return zlib.crc32(key_bytes)
+
+def compile_catalog(translations, source_mtime_ns=0, source_size=0):
+    """
+    Compile a {key: text} dictionary into the binary catalog format.
+
+    Layout: header, open-addressing slot table (power-of-two size, at most
+    half full, linear probing), then the UTF-8 keys and values.
+    """
+    items = [(str(key).encode("utf-8"), str(value).encode("utf-8")) for key, value in translations.items()]
+    slot_count = 1
+    while slot_count < 2 * max(1, len(items)):
+        slot_count *= 2
+    mask = slot_count - 1
+
+    strings = bytearray()
+    strings_start = HEADER.size + slot_count * SLOT.size
+    slots = [None] * slot_count
+    for key_bytes, value_bytes in items:
+        key_offset = strings_start + len(strings)
+        strings += key_bytes
+        value_offset = strings_start + len(strings)
+        strings += value_bytes
+        index = key_hash(key_bytes) & mask
+        while slots[index] is not None:
+            index = (index + 1) & mask
+        slots[index] = (key_offset, len(key_bytes), value_offset, len(value_bytes))
+
+    data = bytearray(HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, source_mtime_ns, source_size, len(items), slot_count))
+    for slot in slots:
+        data += SLOT.pack(*(slot or (0, 0, 0, 0)))
+    data += strings
+    return bytes(data)
+
+class TranslationCatalog:
+    """
+    Read-only translations of one language, looked up in a compiled binary catalog.
+
+    The catalog is compiled from localization/<code>.json the first time and
+    cached in localization/.cache/<code>.bin; the cache records the mtime and
+    size of its source, so an edited JSON file is recompiled on the next load.
+    The cache file is memory-mapped, so processes using the same language
+    share its pages, and a lookup only hashes the key and compares bytes.
+    """
+
+    def __init__(self, language_code, source_path, cache_dir=CATALOG_CACHE_DIR):
+        self.language_code = language_code
+        self.source_path = source_path
+        self.cache_path = os.path.join(cache_dir, f"{language_code}.bin")
+        self.memo = {}  # Key -> decoded text (None when missing), filled on first use
+        self.buffer = None
+        self.file = None
+
+        stat = os.stat(source_path)
+        self.buffer = self.open_cache(stat) or self.compile(stat)
+        _, _, self.source_mtime_ns, self.source_size, self.key_count, self.slot_count = HEADER.unpack_from(self.buffer, 0)
+        self.mask = self.slot_count - 1
+
+    def is_current(self):
+        """Return True if the JSON source has not changed since the catalog was compiled."""
+        try:
+            stat = os.stat(self.source_path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (self.source_mtime_ns, self.source_size)
+
+    def open_cache(self, stat):
+        """Map the cached catalog if it was compiled from the current source, else return None."""
+        try:
+            file = open(self.cache_path, "rb")
+        except OSError:
+            return None
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # Empty or unreadable file
+            file.close()
+            return None
+        if len(buffer) >= HEADER.size:
+            magic, version, mtime_ns, size, _, _ = HEADER.unpack_from(buffer, 0)
+            if magic == CATALOG_MAGIC and version == CATALOG_VERSION and mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                self.file = file
+                return buffer
+        buffer.close()
+        file.close()
+        return None
+
+    def compile(self, stat):
+        """Compile the JSON source, write the cache atomically and map it (in memory if not writable)."""
+        with open(self.source_path, "r", encoding="utf-8") as file:
+            translations = json.load(file)
+        data = compile_catalog(translations, stat.st_mtime_ns, stat.st_size)
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self.cache_path)  # Other processes see the old or the new file, never half of one
+        except OSError:
+            return data
+        return self.open_cache(stat) or data
+
+    def lookup(self, key):
+        """Return the text of key, or None if this language does not define it."""
+        if key in self.memo:
+            return self.memo[key]
+        key_bytes = key.encode("utf-8")
+        buffer = self.buffer
+        index = key_hash(key_bytes) & self.mask
+        text = None
+        while True:
+            key_offset, key_length, value_offset, value_length = SLOT.unpack_from(buffer, HEADER.size + index * SLOT.size)
+            if key_length == 0:
+                break
+            if key_length == len(key_bytes) and buffer[key_offset:key_offset + key_length] == key_bytes:
+                text = buffer[value_offset:value_offset + value_length].decode("utf-8")
+                break
+            index = (index + 1) & self.mask
+        self.memo[key] = text
+        return text
+
+    def get(self, key, default=None):
+        text = self.lookup(key)
+        return default if text is None else text
+
+    def __contains__(self, key):
+        return self.lookup(key) is not None
+
+    def __len__(self):
+        return self.key_count
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self.file is not None:
+            self.file.close()
+        self.buffer = self.file = None
+
+_catalogs = {}
+
+def get_translation_catalog(language_code, directory=LOCALIZATION_DIR):
+    """Return the catalog of a language shared by the whole process, recompiled if its JSON changed."""
+    source_path = os.path.join(directory, f"{language_code}.json")
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"Language file '{language_code}.json' not found.")
+    catalog = _catalogs.get(source_path)
+    if catalog is None or not catalog.is_current():
+        catalog = TranslationCatalog(language_code, source_path, os.path.join(directory, ".cache"))
+        _catalogs[source_path] = catalog  # The old mapping is released once nothing references it
+    return catalog
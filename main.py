@@ -1,19 +1,20 @@
+from components.startup_profiler import get_startup_profiler  # First import: starts the startup clock
 import os
-from PyQt6 import QtWidgets
-from components.main_window import MainWindow
-from components.splash_screen import SplashScreen
-from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QFontDatabase, QFont
-import os
-from localization.language import Language
 import sys
 
 if __name__ == "__main__":
-    from PyQt6.QtCore import Qt
+    profiler = get_startup_profiler()
+    with profiler.phase("qt_import"):
+        from PyQt6 import QtWidgets
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtGui import QFontDatabase, QFont
+    from localization.language import Language
+    from components.splash_screen import SplashScreen
 
     # Define base_path before using it
     base_path = os.path.dirname(__file__)
     LANGUAGE_FILE = os.path.join(base_path, "config", "language.txt")  # Path to the language file
+    PROFILE_STARTUP = "--profile-startup" in sys.argv  # Print the startup phases once the editor is ready
 
     def read_language_from_file():
         """Read the selected language from the file."""
@@ -34,34 +35,68 @@ if __name__ == "__main__":
             selected_language = arg.split("=")[1]
             write_language_to_file(selected_language)  # Save the language to the file
 
-    app = QtWidgets.QApplication(sys.argv)
+    with profiler.phase("qapplication"):
+        app = QtWidgets.QApplication(sys.argv)
 
-    # Register the Poppins font using relative paths
-    QFontDatabase.addApplicationFont(os.path.join(base_path, "assets/fonts/Poppins/Poppins-Regular.ttf"))
-    QFontDatabase.addApplicationFont(os.path.join(base_path, "assets/fonts/Poppins/Poppins-Bold.ttf"))
-    QFontDatabase.addApplicationFont(os.path.join(base_path, "assets/fonts/Poppins/Poppins-Italic.ttf"))
-    app.setFont(QFont("Poppins"))
+    # Initialize language
+    with profiler.phase("language"):
+        language = Language()
+        language.set_language(selected_language)
 
-    # Apply the theme stylesheet globally
-    stylesheet_path = os.path.join(base_path, "styles/blue_theme.qss")
-    with open(stylesheet_path, "r") as file:
-        app.setStyleSheet(file.read())
+    def register_fonts():
+        """Register the Poppins font using relative paths."""
+        QFontDatabase.addApplicationFont(os.path.join(base_path, "assets/fonts/Poppins/Poppins-Regular.ttf"))
+        QFontDatabase.addApplicationFont(os.path.join(base_path, "assets/fonts/Poppins/Poppins-Bold.ttf"))
+        QFontDatabase.addApplicationFont(os.path.join(base_path, "assets/fonts/Poppins/Poppins-Italic.ttf"))
+        app.setFont(QFont("Poppins"))
+
+    def apply_theme():
+        """Apply the theme stylesheet globally."""
+        stylesheet_path = os.path.join(base_path, "styles/blue_theme.qss")
+        with open(stylesheet_path, "r") as file:
+            app.setStyleSheet(file.read())
+
+    def import_main_window():
+        global MainWindow
+        from components.main_window import MainWindow
 
-    # Initialize language
-    language = Language()
-    language.set_language(selected_language)
-
-    # Show the splash screen
-    splash_screen_duration = 0
-    splash = SplashScreen()
-    splash.show_splash(duration=splash_screen_duration)
-    
-    # Keep a reference to the main window
     def show_main_window():
+        # Keep a reference to the main window
         global main_window
         main_window = MainWindow(language)
+        main_window.ready.connect(startup_finished)
         main_window.show()
+
+    def startup_finished():
+        profiler.mark("editor_ready")
         splash.close()
+        if PROFILE_STARTUP:
+            print(profiler.report())
+
+    # Each phase runs in its own event loop iteration, so the splash can repaint in between.
+    # The space editor is built by the MainWindow itself, after its first frame is on screen.
+    STARTUP_PHASES = [
+        ("theme", apply_theme, "splash_loading_theme"),
+        ("main_window_import", import_main_window, "splash_loading_modules"),
+        ("main_window", show_main_window, "splash_creating_window"),
+    ]
+
+    def run_phase(index=0):
+        name, function, message_key = STARTUP_PHASES[index]
+        splash.set_progress(int(100 * index / (len(STARTUP_PHASES) + 1)), language.get(message_key))
+        with profiler.phase(name):
+            function()
+        if index + 1 < len(STARTUP_PHASES):
+            QTimer.singleShot(0, lambda: run_phase(index + 1))
+        else:
+            splash.set_progress(int(100 * (index + 1) / (len(STARTUP_PHASES) + 1)), language.get("splash_loading_editor"))
+
+    # Show the splash screen until the editor is ready (the fonts are needed by its labels)
+    with profiler.phase("fonts"):
+        register_fonts()
+    with profiler.phase("splash"):
+        splash = SplashScreen()
+        splash.show()
 
-    QTimer.singleShot(splash_screen_duration, show_main_window)
+    QTimer.singleShot(0, run_phase)
     sys.exit(app.exec())
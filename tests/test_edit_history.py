@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.space.edit_history import EditCommand, EditHistory
+
+def hue_edit(before, after):
+    return EditCommand("state", 0, {"hue": before}, {"hue": after}, "color")
+
+def test_slider_drag_merges_into_one_entry():
+    history = EditHistory()
+    for hue in range(10):
+        history.push(hue_edit(float(hue), float(hue + 1)))
+    assert len(history) == 1
+    assert history.entries[0].before == {"hue": 0.0}
+    assert history.entries[0].after == {"hue": 10.0}
+
+def test_drag_back_to_start_does_not_merge_into_older_entry():
+    history = EditHistory()
+    history.push(hue_edit(0.0, 10.0))
+    history.seal()  # Slider released: the first drag is one entry
+
+    # Second drag returns to where it started, so its entry empties and is dropped
+    history.push(hue_edit(10.0, 20.0))
+    history.push(hue_edit(20.0, 10.0))
+    assert len(history) == 1
+
+    # A third drag is its own entry, not merged into the first drag
+    history.push(hue_edit(10.0, 30.0))
+    assert len(history) == 2
+    assert history.entries[0].after == {"hue": 10.0}
+    assert history.undo().before == {"hue": 10.0}
+    assert history.undo().before == {"hue": 0.0}
+
+def test_memory_cap_evicts_oldest_entries():
+    history = EditHistory(max_bytes=5000)
+    for width in range(200):
+        history.push(EditCommand("state", 0, {"width": float(width)}, {"width": float(width + 1)}))
+    assert history.bytes <= 5000
+    assert history.cursor == len(history)
+    assert history.entries[-1].after == {"width": 200.0}
@@ -0,0 +1,50 @@
+"""
+Convert saved spaces between the binary format and the JSON format of older versions.
+
+    python tools/convert_spaces.py --to spb                 # Import the JSON spaces of a library
+    python tools/convert_spaces.py --to json --keep         # Export every space as JSON, keeping the binary files
+    python tools/convert_spaces.py --to json --spaces /tmp/spaces "Lab 1" "Studio 2"
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.space.space_file import SPACE_FILE_EXTENSION, read_space, write_space_file
+
+def convert_space(space_folder, name, target, keep=False):
+    """Convert one space to target ("spb" or "json"); return False if it has no file in the other format."""
+    binary_path = os.path.join(space_folder, f"{name}{SPACE_FILE_EXTENSION}")
+    json_path = os.path.join(space_folder, f"{name}.json")
+    source, destination = (json_path, binary_path) if target == "spb" else (binary_path, json_path)
+    if not os.path.exists(source):
+        return False
+
+    space_data = read_space(source)
+    if target == "spb":
+        write_space_file(destination, space_data)
+    else:
+        with open(destination, "w") as file:
+            json.dump(space_data, file, indent=4)
+    if not keep:
+        os.remove(source)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert saved spaces between the binary (.spb) and JSON formats.")
+    parser.add_argument("names", nargs="*", help="Spaces to convert (default: all)")
+    parser.add_argument("--to", choices=("spb", "json"), required=True, help="Target format")
+    parser.add_argument("--spaces", default="spaces", help="Spaces folder (default: spaces)")
+    parser.add_argument("--keep", action="store_true", help="Keep the source files")
+    args = parser.parse_args()
+
+    names = args.names or sorted(
+        entry.name for entry in os.scandir(args.spaces) if entry.is_dir() and not entry.name.startswith(".")
+    )
+    converted = [name for name in names if convert_space(os.path.join(args.spaces, name), name, args.to, args.keep)]
+    print(f"Converted {len(converted)} of {len(names)} spaces to {args.to}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Generate a synthetic library of spaces for scale testing.
+
+Writes N spaces in the layout used by SaveSpaceFrame (<name>/<name>.spb, or
+<name>.json like older versions with --format json, plus an images/ folder)
+with random dimensions, colours, doors and photos:
+
+    python tools/generate_spaces.py --count 1000 --output /tmp/spaces
+    python tools/generate_spaces.py --count 200 --photos 2 6 --photo-size 4000x3000 --photo-format mixed
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QColor, QGuiApplication, QImage, QLinearGradient, QPainter
+from components.space.space_file import SPACE_FILE_EXTENSION, write_space_file
+
+PHOTO_FORMATS = ("jpg", "png", "mixed")
+SPACE_FORMATS = ("spb", "json")
+WORDS = ("Lab", "Studio", "Room", "Hall", "Booth", "Chamber", "Sala", "Aula", "Garage", "Stage")
+
+def parse_size(text):
+    """Parse a WIDTHxHEIGHT photo size."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}', expected WIDTHxHEIGHT")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}', dimensions must be positive")
+    return width, height
+
+def random_space(rng, index, door_probability=0.5):
+    """Return the JSON data of a random space, with the same keys and rounding as SaveSpaceFrame."""
+    name = f"{rng.choice(WORDS)} {index:05d}"
+    width, length, height = rng.uniform(2, 15), rng.uniform(2, 15), rng.uniform(2.2, 6)
+    data = {
+        "name": name,
+        "description": f"Synthetic {name.split()[0].lower()} generated for scale testing",
+        "coordinates": {"width": round(width, 2), "length": round(length, 2), "height": round(height, 2)},
+        "color": {"hue": rng.randrange(360), "saturation": rng.randrange(101), "value": rng.randrange(30, 101)},
+    }
+    if rng.random() < door_probability:
+        wall_index = rng.randrange(4)
+        wall_length = width if wall_index in (0, 2) else length  # Walls 0 and 2 run along the width
+        door_width = round(rng.uniform(0.7, min(2.0, wall_length)), 2)
+        data["door"] = {
+            "width": door_width,
+            "height": round(rng.uniform(1.9, min(2.5, height)), 2),
+            "offset": round(rng.uniform(0, wall_length - door_width), 2),
+            "wall_index": wall_index,
+        }
+    return data
+
+def generate_photo(path, width, height, rng):
+    """Draw a photo-like image (gradient and soft shapes, so it compresses like a real picture) and save it."""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    gradient = QLinearGradient(QPointF(0, 0), QPointF(width, height))
+    gradient.setColorAt(0, QColor.fromHsv(rng.randrange(360), rng.randrange(40, 200), rng.randrange(60, 255)))
+    gradient.setColorAt(1, QColor.fromHsv(rng.randrange(360), rng.randrange(40, 200), rng.randrange(60, 255)))
+    painter.fillRect(image.rect(), gradient)
+    painter.setPen(Qt.PenStyle.NoPen)
+    for _ in range(rng.randrange(8, 24)):
+        painter.setBrush(QColor.fromHsv(rng.randrange(360), rng.randrange(256), rng.randrange(256), rng.randrange(60, 200)))
+        w, h = rng.uniform(0.05, 0.4) * width, rng.uniform(0.05, 0.4) * height
+        rect = QRectF(rng.uniform(0, width - w), rng.uniform(0, height - h), w, h)
+        if rng.random() < 0.5:
+            painter.drawEllipse(rect)
+        else:
+            painter.drawRect(rect)
+    painter.end()
+    file_format = "PNG" if path.lower().endswith(".png") else "JPG"
+    if not image.save(path, file_format, 90 if file_format == "JPG" else -1):
+        raise OSError(f"Could not write {path}")
+
+def generate_spaces(directory, count, seed=0, photos=(0, 0), photo_size=(1600, 1200), photo_format="jpg", door_probability=0.5, start=0,
+                    space_format="spb"):
+    """
+    Write count random spaces in directory and return their names.
+
+    Parameters:
+        directory: Spaces folder to fill (created if needed).
+        count: Number of spaces to write.
+        seed: Seed of the random generator, so a library can be regenerated identically.
+        photos: (min, max) number of photos per space.
+        photo_size: (width, height) of the photos in pixels.
+        photo_format: "jpg", "png" or "mixed".
+        door_probability: Probability that a space has a door.
+        start: Index of the first space, to grow an existing library.
+        space_format: "spb" (binary, as saved by the editor) or "json" (as saved by older versions).
+    """
+    rng = random.Random(seed)
+    names = []
+    for index in range(start, start + count):
+        data = random_space(rng, index, door_probability)
+        name = data["name"]
+        space_folder = os.path.join(directory, name)
+        images_folder = os.path.join(space_folder, "images")
+        os.makedirs(images_folder, exist_ok=True)
+        if space_format == "json":
+            with open(os.path.join(space_folder, f"{name}.json"), "w") as file:
+                json.dump(data, file, indent=4)
+        else:
+            write_space_file(os.path.join(space_folder, f"{name}{SPACE_FILE_EXTENSION}"), data)
+
+        for photo in range(rng.randint(*photos)):
+            extension = photo_format if photo_format != "mixed" else rng.choice(("jpg", "png"))
+            generate_photo(os.path.join(images_folder, f"photo_{photo + 1:03d}.{extension}"), *photo_size, rng)
+        names.append(name)
+    return names
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic library of spaces for scale testing.")
+    parser.add_argument("--count", type=int, required=True, help="Number of spaces to generate")
+    parser.add_argument("--output", default="spaces", help="Spaces folder to write into (default: spaces)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--photos", type=int, nargs=2, default=(0, 0), metavar=("MIN", "MAX"), help="Photos per space")
+    parser.add_argument("--photo-size", type=parse_size, default=(1600, 1200), help="Photo size as WIDTHxHEIGHT")
+    parser.add_argument("--photo-format", choices=PHOTO_FORMATS, default="jpg", help="Photo file format")
+    parser.add_argument("--door-probability", type=float, default=0.5, help="Probability that a space has a door")
+    parser.add_argument("--start", type=int, default=0, help="Index of the first space (to add to an existing library)")
+    parser.add_argument("--format", choices=SPACE_FORMATS, default="spb", help="Space file format (default: spb)")
+    args = parser.parse_args()
+
+    if args.count < 0 or args.photos[0] < 0 or args.photos[0] > args.photos[1]:
+        parser.error("--count must be positive and --photos MIN MAX must satisfy 0 <= MIN <= MAX")
+
+    app = QGuiApplication(sys.argv[:1])  # Needed by QPainter
+    names = generate_spaces(
+        args.output, args.count, seed=args.seed, photos=tuple(args.photos), photo_size=args.photo_size,
+        photo_format=args.photo_format, door_probability=args.door_probability, start=args.start,
+        space_format=args.format,
+    )
+    print(f"Generated {len(names)} spaces in {os.path.abspath(args.output)}")
+
+if __name__ == "__main__":
+    main()
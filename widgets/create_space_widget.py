@@ -76,57 +76,20 @@ class CreateSpaceWidget(QWidget):
         # Collega il segnale dei pulsanti della tool palette alle funzioni dello SpaceCreationFrame
         tool_palette.button_pressed.connect(lambda key: self.handle_tool_palette_action(key, central_frame))
 
-        # Connect spinbox signals to update the room plot
-        tool_palette.width_spinbox.valueChanged.connect(lambda value: central_frame.update_room_plot(
-            tool_palette.width_spinbox.value(),
-            tool_palette.length_spinbox.value(),
-            tool_palette.height_spinbox.value(),
-            tool_palette.hue_slider.value(),
-            tool_palette.saturation_slider.value(),
-            tool_palette.value_slider.value()
-        ))
-        tool_palette.length_spinbox.valueChanged.connect(lambda value: central_frame.update_room_plot(
-            tool_palette.width_spinbox.value(),
-            tool_palette.length_spinbox.value(),
-            tool_palette.height_spinbox.value(),
-            tool_palette.hue_slider.value(),
-            tool_palette.saturation_slider.value(),
-            tool_palette.value_slider.value()
-        ))
-        tool_palette.height_spinbox.valueChanged.connect(lambda value: central_frame.update_room_plot(
-            tool_palette.width_spinbox.value(),
-            tool_palette.length_spinbox.value(),
-            tool_palette.height_spinbox.value(),
-            tool_palette.hue_slider.value(),
-            tool_palette.saturation_slider.value(),
-            tool_palette.value_slider.value()
-        ))
+        # Connect spinbox signals to update the room plot (coalesced to one update per frame)
+        tool_palette.width_spinbox.valueChanged.connect(central_frame.schedule_room_update)
+        tool_palette.length_spinbox.valueChanged.connect(central_frame.schedule_room_update)
+        tool_palette.height_spinbox.valueChanged.connect(central_frame.schedule_room_update)
 
         # Connect HSV sliders to update the room plot color
-        tool_palette.hue_slider.valueChanged.connect(lambda value: central_frame.update_room_color(
-            tool_palette.width_spinbox.value(),
-            tool_palette.length_spinbox.value(),
-            tool_palette.height_spinbox.value(),
-            tool_palette.hue_slider.value(),
-            tool_palette.saturation_slider.value(),
-            tool_palette.value_slider.value()
-        ))
-        tool_palette.saturation_slider.valueChanged.connect(lambda value: central_frame.update_room_color(
-            tool_palette.width_spinbox.value(),
-            tool_palette.length_spinbox.value(),
-            tool_palette.height_spinbox.value(),
-            tool_palette.hue_slider.value(),
-            tool_palette.saturation_slider.value(),
-            tool_palette.value_slider.value()
-        ))
-        tool_palette.value_slider.valueChanged.connect(lambda value: central_frame.update_room_color(
-            tool_palette.width_spinbox.value(),
-            tool_palette.length_spinbox.value(),
-            tool_palette.height_spinbox.value(),
-            tool_palette.hue_slider.value(),
-            tool_palette.saturation_slider.value(),
-            tool_palette.value_slider.value()
-        ))
+        tool_palette.hue_slider.valueChanged.connect(central_frame.schedule_color_update)
+        tool_palette.saturation_slider.valueChanged.connect(central_frame.schedule_color_update)
+        tool_palette.value_slider.valueChanged.connect(central_frame.schedule_color_update)
+
+        # A slider drag is one undoable edit, closed when the slider is released
+        tool_palette.hue_slider.sliderReleased.connect(central_frame.end_edit)
+        tool_palette.saturation_slider.sliderReleased.connect(central_frame.end_edit)
+        tool_palette.value_slider.sliderReleased.connect(central_frame.end_edit)
 
         # Plot the initial room
         central_frame.update_room_plot(
@@ -165,6 +128,17 @@ class CreateSpaceWidget(QWidget):
         shortcut_toggle_properties = QShortcut(QKeySequence("R"), self)
         shortcut_toggle_properties.activated.connect(self.toggle_properties_frame)
 
+        # Add shortcut for the performance overlay of the 3D view
+        shortcut_toggle_hud = QShortcut(QKeySequence("F3"), self)
+        shortcut_toggle_hud.activated.connect(central_frame.toggle_performance_hud)
+
+        # Undo and redo of the room edits (Ctrl+Z, Ctrl+Y / Ctrl+Shift+Z)
+        shortcut_undo = QShortcut(QKeySequence.StandardKey.Undo, self)
+        shortcut_undo.activated.connect(central_frame.undo)
+
+        shortcut_redo = QShortcut(QKeySequence.StandardKey.Redo, self)
+        shortcut_redo.activated.connect(central_frame.redo)
+
     def toggle_save_space_frame(self):
         """Toggle the visibility of the save space frame."""
         sizes = self.vertical_splitter.sizes()
@@ -191,7 +165,7 @@ class CreateSpaceWidget(QWidget):
                 self.central_frame.start_smooth_zoom("out")
                 return True
 
-        if event.type() == QEvent.Type.KeyRelease:
+        if event.type() == QEvent.Type.KeyRelease and not event.isAutoRepeat():
             if event.key() in (Qt.Key.Key_Plus, Qt.Key.Key_Equal):  # "+" key
                 self.central_frame.stop_smooth_zoom()
                 return True
@@ -1,10 +1,14 @@
 import os
 import json
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QPushButton, QSpacerItem, QSizePolicy, QLabel, QScrollArea, QWidget, QMessageBox, QLineEdit
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QPushButton, QSpacerItem, QSizePolicy, QLabel, QWidget, QMessageBox, QLineEdit
 from PyQt6.QtGui import QColor
-from PyQt6.QtCore import Qt
-import pyqtgraph.opengl as gl
-from components.space.room_plot import plot_room, create_door  # Import the function to plot the room
+from PyQt6.QtCore import Qt, QTimer
+from components.space.space_loader import SpaceLoader
+from components.space.space_file import space_file_path
+from components.space.space_model import SpaceModel
+from components.space.space_writer import delete_space_files
+from components.space.space_search import SpaceSearchIndex, SEARCH_DEBOUNCE_MS
+from widgets.space_gallery import SpaceListModel, SpaceFilterProxyModel, SpaceCardDelegate, SpaceGalleryView
 
 class PropertiesFrame(QFrame):
     def __init__(self, space_creation_frame, tool_palette, language, main_window):
@@ -24,37 +28,59 @@ class PropertiesFrame(QFrame):
         layout.setSpacing(10)
 
         # Add "New Space" button at the top
-        self.new_space_button = QPushButton(self.language.get("button_new_space"))
+        self.new_space_button = QPushButton()
         self.new_space_button.clicked.connect(self.reset_space)
         layout.addWidget(self.new_space_button)
 
         # Add a button to refresh the gallery
-        self.gallery_button = QPushButton(self.language.get("label_gallery"))
-        self.gallery_button.setToolTip(self.language.get("tooltip_refresh_gallery"))
+        self.gallery_button = QPushButton()
         self.gallery_button.clicked.connect(self.load_saved_spaces)
         layout.addWidget(self.gallery_button)
 
         # Add search bar above the gallery
         self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText(self.language.get("placeholder_search_spaces"))
-        self.search_bar.textChanged.connect(self.filter_spaces)
         layout.addWidget(self.search_bar)
 
-        # Add a scrollable gallery for saved spaces
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area_widget = QWidget()
-        self.scroll_area_layout = QVBoxLayout(self.scroll_area_widget)
-        self.scroll_area_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_area_layout.setSpacing(10)
-        self.scroll_area_layout.setAlignment(Qt.AlignmentFlag.AlignTop)  # Align items to the top
-        self.scroll_area.setWidget(self.scroll_area_widget)
-
-        # Add the scroll area to the layout and make it expand to fill the remaining space
-        layout.addWidget(self.scroll_area, stretch=1)
-
-        # Load saved spaces into the gallery
-        self.load_saved_spaces()
+        # Debounce keystrokes: the search runs once typing pauses
+        self.search_index = SpaceSearchIndex()
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(lambda: self.filter_spaces(self.search_bar.text()))
+        self.search_bar.textChanged.connect(self.search_timer.start)
+
+        # Add a virtualized gallery for saved spaces (cards are painted, not built as widgets)
+        self.gallery_model = SpaceListModel("spaces", self)
+        self.gallery_proxy = SpaceFilterProxyModel(self)
+        self.gallery_proxy.setSourceModel(self.gallery_model)
+        self.gallery_delegate = SpaceCardDelegate(self.language, 200, self)
+        self.gallery_delegate.open_requested.connect(self.confirm_and_load_model)
+        self.gallery_delegate.delete_requested.connect(self.confirm_and_delete_space)
+        self.gallery_view = SpaceGalleryView(self.gallery_delegate)
+        self.gallery_view.setModel(self.gallery_proxy)
+
+        # Add the gallery to the layout and make it expand to fill the remaining space
+        layout.addWidget(self.gallery_view, stretch=1)
+
+        # Load saved spaces into the gallery in the background, once the panel is on screen
+        self.all_spaces = []
+        self.all_images = {}
+        self.load_pending = True
+        self.space_loader = SpaceLoader("spaces", self)
+        self.space_loader.batch_loaded.connect(self.add_loaded_spaces)
+        self.space_loader.finished.connect(self.spaces_loaded)
+
+        # Apply the strings now and again whenever the language changes
+        self.retranslate_ui()
+        self.language.language_changed.connect(self.retranslate_ui)
+
+    def retranslate_ui(self):
+        """Re-apply the labels in the current language; the cards are repainted with it."""
+        self.new_space_button.setText(self.language.get("button_new_space"))
+        self.gallery_button.setText(self.language.get("label_gallery"))
+        self.gallery_button.setToolTip(self.language.get("tooltip_refresh_gallery"))
+        self.search_bar.setPlaceholderText(self.language.get("placeholder_search_spaces"))
+        self.gallery_view.viewport().update()
 
     def reset_space(self):
         """Reset the entire CreateSpaceWidget by reloading it."""
@@ -78,90 +104,48 @@ class PropertiesFrame(QFrame):
 
     def load_saved_spaces(self):
         """Load saved spaces from the 'spaces' directory and display them in the gallery."""
+        # The cards are filled in batch by batch by the background loader
         self.all_spaces = []  # Store all spaces for filtering
-        # Clear the current gallery
-        while self.scroll_area_layout.count():
-            item = self.scroll_area_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        # Load spaces from the directory
-        spaces_dir = "spaces"
-        if not os.path.exists(spaces_dir):
-            return
-
-        for space_name in os.listdir(spaces_dir):
-            space_path = os.path.join(spaces_dir, space_name, f"{space_name}.json")
-            if os.path.isfile(space_path):
-                with open(space_path, "r") as file:
-                    space_data = json.load(file)
-                    self.all_spaces.append(space_data)
-                    self.add_space_to_gallery(space_data)
-
-    def add_space_to_gallery(self, space_data):
-        """Add a space preview to the gallery."""
-        # Create a container widget for the space preview
-        space_widget = QWidget()
-        space_layout = QVBoxLayout(space_widget)
-        space_layout.setContentsMargins(10, 10, 10, 10)
-        space_layout.setSpacing(5)
-
-        # Add the name of the space as a button
-        name_button = QPushButton(space_data.get("name", "Unnamed Space"))
-        name_button.setObjectName("new_space_button")  # Use the same object name as new_space_button
-        name_button.setToolTip(self.language.get("tooltip_open_model"))  # Add a tooltip
-        name_button.clicked.connect(lambda: self.confirm_and_load_model(space_data))  # Connect to confirmation dialog
-        space_layout.addWidget(name_button)
-
-        # Create a static OpenGL view for the space
-        gl_view = gl.GLViewWidget()
-        gl_view.setFixedSize(200, 200)  # Set a fixed size for the preview
-        gl_view.setCameraPosition(distance=10, elevation=17, azimuth=295)
-        space_layout.addWidget(gl_view)
-
-        # Add a grid to the OpenGL view
-        grid = gl.GLGridItem()
-        grid.setSize(x=10, y=10)
-        grid.setSpacing(x=1, y=1)
-        gl_view.addItem(grid)
-
-        # Plot the room in the OpenGL view
-        dimensions = space_data.get("coordinates", {})
-        color = space_data.get("color", {})
-        plot_room(
-            gl_view,
-            dimensions.get("width", 0),
-            dimensions.get("length", 0),
-            dimensions.get("height", 0),
-            None,  # No axes for the preview
-            h=color.get("hue", 0) / 360.0,
-            s=color.get("saturation", 0) / 100.0,
-            v=color.get("value", 0) / 100.0
-        )
-
-        # Plot the door in the OpenGL view if door data is present
-        door_data = space_data.get("door", None)
-        if door_data:
-            create_door(
-                gl_view,
-                door_data.get("width", 0),
-                door_data.get("height", 0),
-                door_data.get("offset", 0),
-                door_data.get("wall_index", 0),
-                dimensions,
-                color
-            )
-
-        # Add the delete button below the OpenGL view
-        delete_button = QPushButton(self.language.get("button_delete"))
-        delete_button.setObjectName("delete_space_button")  # Updated object name for QSS styling
-        delete_button.setToolTip(self.language.get("dialog_delete_message"))
-        delete_button.clicked.connect(lambda: self.confirm_and_delete_space(space_data))
-        space_layout.addWidget(delete_button)
-
-        # Add the space widget to the gallery
-        self.scroll_area_layout.addWidget(space_widget)
+        self.all_images = {}
+        self.gallery_model.set_spaces([])
+        self.load_pending = False
+        self.space_loader.load()
+
+    def add_loaded_spaces(self, entries):
+        """Append a batch of spaces streamed in by the loader."""
+        spaces = [space for space, _ in entries]
+        images = {space.get("name", ""): paths for space, paths in entries}
+        self.all_spaces.extend(spaces)
+        self.all_images.update(images)
+        self.search_index.merge(spaces)
+        self.gallery_model.append_spaces(spaces, images)
+        if self.search_bar.text():
+            self.filter_spaces(self.search_bar.text())
+
+    def spaces_loaded(self):
+        """Drop the search entries of the spaces that no longer exist."""
+        self.search_index.update(self.all_spaces)
+        self.filter_spaces(self.search_bar.text())
+
+    def hideEvent(self, event):
+        """Cancel a load still in progress; it restarts when the gallery is shown again."""
+        if self.space_loader.loading:
+            self.space_loader.cancel()
+            self.load_pending = True
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load_if_open()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.load_if_open()
+
+    def load_if_open(self):
+        """Start a pending load once the panel is visible and not collapsed by the splitter."""
+        if self.load_pending and self.isVisible() and self.width() > 0:
+            self.load_saved_spaces()
 
     def confirm_and_load_model(self, space_data):
         """Show a confirmation dialog before loading the model."""
@@ -176,17 +160,8 @@ class PropertiesFrame(QFrame):
 
     def load_model_to_view(self, space_data):
         """Load the selected model into the SpaceCreationFrame."""
-        # Update the SpaceCreationFrame
         dimensions = space_data.get("coordinates", {})
         color = space_data.get("color", {})
-        self.space_creation_frame.update_room_plot(
-            dimensions.get("width", 0),
-            dimensions.get("length", 0),
-            dimensions.get("height", 0),
-            color.get("hue", 0),
-            color.get("saturation", 0),
-            color.get("value", 0)
-        )
 
         # Update the ToolPaletteFrame
         self.tool_palette.width_spinbox.setValue(dimensions.get("width", 0))
@@ -209,24 +184,12 @@ class PropertiesFrame(QFrame):
         save_space_frame = self.main_window.widget_cache["CreateSpaceWidget"].save_space_frame
         save_space_frame.name_input.setText(space_data.get("name", ""))
         save_space_frame.description_input.setText(space_data.get("description", ""))
-        save_space_frame.file_path = os.path.join("spaces", space_data.get("name", ""), f"{space_data.get('name', '')}.json")  # Set file path
+        save_space_frame.file_path = space_file_path(os.path.join("spaces", space_data.get("name", "")), space_data.get("name", ""))  # Set file path
         save_space_frame.images_folder = images_folder  # Set images folder
         save_space_frame.model_saved = True  # Mark the model as saved
 
-        # Load door data if present
-        door_data = space_data.get("door", None)
-        print(f"Loading door data: {door_data}")
-        if door_data:
-            self.space_creation_frame.update_room_plot(
-                dimensions.get("width", 0),
-                dimensions.get("length", 0),
-                dimensions.get("height", 0),
-                color.get("hue", 0),
-                color.get("saturation", 0),
-                color.get("value", 0),
-                door_data=door_data,
-                render_door=True
-            )
+        # Load every room and opening (single-room files included) and show the first room
+        self.space_creation_frame.set_space_model(SpaceModel.from_dict(space_data))
 
         # Lock dimensions in the tool palette when loading a model
         self.tool_palette.lock_dimensions()
@@ -243,28 +206,12 @@ class PropertiesFrame(QFrame):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            # Delete the space directory
-            space_name = space_data.get("name", "")
-            space_dir = os.path.join("spaces", space_name)
-            if os.path.exists(space_dir):
-                import shutil
-                shutil.rmtree(space_dir)
+            # Delete the space directory, its catalog entry and the photos no other space links to
+            delete_space_files("spaces", space_data.get("name", ""))
 
             # Reload the gallery
             self.load_saved_spaces()
 
     def filter_spaces(self, text):
-        """Filter spaces based on the search text."""
-        filtered_spaces = [
-            space for space in self.all_spaces if text.lower() in space.get("name", "").lower()
-        ]
-        # Clear the current gallery
-        while self.scroll_area_layout.count():
-            item = self.scroll_area_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        # Add filtered spaces to the gallery
-        for space in filtered_spaces:
-            self.add_space_to_gallery(space)
+        """Filter spaces based on the search text (name and description) by hiding non-matching cards."""
+        self.gallery_proxy.set_matches(self.search_index.search(text))
@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QLineEdit, QTextEdit, QPushButton, QMessageBox
 import os
-import json
-import shutil  # Import shutil for copying files
+from components.space.image_store import get_image_importer
+from components.space.space_file import SPACE_FILE_EXTENSION
+from components.space.space_writer import SpaceWriteJob, get_space_writer
 
 class SaveSpaceFrame(QFrame):
     def __init__(self, language, space_creation_frame):
@@ -18,22 +19,38 @@ class SaveSpaceFrame(QFrame):
         layout.setSpacing(5)
 
         # Name input
-        self.name_label = QLabel(self.language.get("label_name"))
+        self.name_label = QLabel()
         self.name_input = QLineEdit()
         layout.addWidget(self.name_label)
         layout.addWidget(self.name_input)
 
         # Description input
-        self.description_label = QLabel(self.language.get("label_description"))
+        self.description_label = QLabel()
         self.description_input = QTextEdit()
         layout.addWidget(self.description_label)
         layout.addWidget(self.description_input)
 
         # Save button
-        self.save_button = QPushButton(self.language.get("button_save"))
+        self.save_button = QPushButton()
         self.save_button.clicked.connect(self.save_model)
         layout.addWidget(self.save_button)
 
+        # Saves are written in the background; the frame reacts when its own saves complete
+        self.submitted = set()  # Names of the spaces saved from this frame and not written yet
+        self.writer = get_space_writer()
+        self.writer.saved.connect(self.space_saved)
+        self.writer.failed.connect(self.space_save_failed)
+
+        # Apply the strings now and again whenever the language changes
+        self.retranslate_ui()
+        self.language.language_changed.connect(self.retranslate_ui)
+
+    def retranslate_ui(self):
+        """Re-apply the labels in the current language."""
+        self.name_label.setText(self.language.get("label_name"))
+        self.description_label.setText(self.language.get("label_description"))
+        self.save_button.setText(self.language.get("button_save"))
+
     def save_model(self):
         """Save the model's properties to a file."""
         name = self.name_input.text().strip()
@@ -43,47 +60,37 @@ class SaveSpaceFrame(QFrame):
             QMessageBox.warning(self, self.language.get("error_title"), self.language.get("error_name_required"))
             return
 
-        # Retrieve actual dimensions and color from SpaceCreationFrame
-        dimensions = {
-            "width": round(self.space_creation_frame.room_dimensions["width"], 2),
-            "length": round(self.space_creation_frame.room_dimensions["length"], 2),
-            "height": round(self.space_creation_frame.room_dimensions["height"], 2)
-        }
-        color = {
-            "hue": round(self.space_creation_frame.room_color["hue"], 0),
-            "saturation": round(self.space_creation_frame.room_color["saturation"], 0),
-            "value": round(self.space_creation_frame.room_color["value"], 0)
-        }
+        # Retrieve the rooms, openings and color from SpaceCreationFrame
+        self.space_creation_frame.update_scheduler.flush()  # Apply edits still waiting for the next frame
+        space_model = self.space_creation_frame.space_model
+
+        # Rooms sharing a wall are fine, overlapping volumes are most likely a mistake
+        overlapping = space_model.overlapping_rooms()
+        if overlapping:
+            rooms = ", ".join(f"{i + 1}-{j + 1}" for i, j in overlapping)
+            reply = QMessageBox.question(
+                self,
+                self.language.get("warning_rooms_overlap_title"),
+                self.language.get("warning_rooms_overlap").format(rooms=rooms),
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
 
         model_data = {
             "name": name,
             "description": description,
-            "coordinates": dimensions,  # Use rounded dimensions
-            "color": color  # Use rounded color values
+            **space_model.to_dict()  # Rounded dimensions, color and doors; extra rooms only when present
         }
 
-        # Retrieve door data if present
-        door_data = None
-        if self.space_creation_frame.view.door_mesh:
-            door_data = {
-                "width": round(self.space_creation_frame.view.door_mesh.width, 2),
-                "height": round(self.space_creation_frame.view.door_mesh.height, 2),
-                "offset": round(self.space_creation_frame.view.door_mesh.offset, 2),
-                "wall_index": self.space_creation_frame.view.door_mesh.wall_index
-            }
-
-        # Add door data to model_data if present
-        if door_data:
-            model_data["door"] = door_data
-
-        # Create a subfolder for the space
+        # The subfolder of the space is created by the writer
         space_folder = os.path.join("spaces", name)
-        images_folder = os.path.join(space_folder, "images")
-        os.makedirs(space_folder, exist_ok=True)
-        file_path = os.path.join(space_folder, f"{name}.json")
+        file_path = os.path.join(space_folder, f"{name}{SPACE_FILE_EXTENSION}")
+        legacy_path = os.path.join(space_folder, f"{name}.json")  # Saved by older versions
 
         # Check if the file already exists
-        if os.path.exists(file_path):
+        overwrite = os.path.exists(file_path) or os.path.exists(legacy_path)
+        if overwrite:
             reply = QMessageBox.question(
                 self,
                 self.language.get("overwrite_title"),
@@ -93,31 +100,40 @@ class SaveSpaceFrame(QFrame):
             if reply == QMessageBox.StandardButton.No:
                 return
 
-            # Delete the existing images folder only if the tool palette has no images
-            if not self.space_creation_frame.tool_palette.images and os.path.exists(images_folder):
-                shutil.rmtree(images_folder)
-
-        # Write the JSON file
-        try:
-            with open(file_path, "w") as file:
-                json.dump(model_data, file, indent=4)
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                self.language.get("error_title"),
-                self.language.get("error_saving_file").format(error=str(e))
-            )
-            return
-
-        # Enable image addition in ToolPaletteFrame
-        self.space_creation_frame.tool_palette.enable_image_addition(images_folder)
-
-        # Do not modify the images folder if the tool palette contains images
-        if not self.space_creation_frame.tool_palette.images:
-            os.makedirs(images_folder, exist_ok=True)
+        # Write the space in the background (temporary file, fsync, rename); a save of
+        # the same space still waiting is replaced by this one. The images folder of an
+        # overwritten space is emptied only if the tool palette has no images and no
+        # photo is still being imported into it.
+        images_folder = os.path.join(space_folder, "images")
+        reset_images = (
+            overwrite and not self.space_creation_frame.tool_palette.images
+            and not get_image_importer().is_busy(images_folder)
+        )
+        self.submitted.add(name)
+        self.writer.submit(SpaceWriteJob(name, space_folder, model_data, reset_images=reset_images))
+
+    def space_saved(self, name, path):
+        """Finish a save once the writer has replaced the file."""
+        if name not in self.submitted or self.writer.has_pending(name):
+            return  # Saved from another frame, or a newer save of the space is still being written
+        self.submitted.discard(name)
+
+        # Enable image addition in ToolPaletteFrame, now that the images folder exists
+        if self.name_input.text().strip() == name:
+            self.space_creation_frame.tool_palette.enable_image_addition(os.path.join(os.path.dirname(path), "images"))
 
         # Notify the PropertiesFrame to reload the gallery
         if hasattr(self.space_creation_frame, 'properties_frame'):
             self.space_creation_frame.properties_frame.load_saved_spaces()
 
         QMessageBox.information(self, self.language.get("success_title"), self.language.get("success_message"))
+
+    def space_save_failed(self, name, error):
+        if name not in self.submitted:
+            return
+        self.submitted.discard(name)
+        QMessageBox.critical(
+            self,
+            self.language.get("error_title"),
+            self.language.get("error_saving_file").format(error=error)
+        )
@@ -1,11 +1,22 @@
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QPushButton, QHBoxLayout, QWidget, QMessageBox
-from PyQt6.QtCore import Qt, QEvent, QTimer
+from contextlib import contextmanager
+from PyQt6.QtCore import Qt, QEvent
 from PyQt6.QtGui import QMouseEvent, QVector3D, QPaintEvent, QPainter, QColor  # Import for custom drawing
 import pyqtgraph.opengl as gl
 from components.space.gizmo import create_axes 
-from components.space.room_plot import plot_room, create_translucent_wall, create_door
+from components.space.edit_history import EditCommand, EditHistory
+from components.space.room_scene import RoomScene
+from components.space.space_model import SpaceModel
+from components.space.update_scheduler import SceneUpdateScheduler
+from components.space.camera_animator import CameraAnimator
+from components.space.zoom_controller import ZoomController
+from widgets.performance_hud import PerformanceStats, TimedGLViewWidget, PerformanceHud
 import numpy as np
 
+CLICK_TOLERANCE = 4  # Pixels the cursor may move between press and release for a click
+DIMENSION_FIELDS = ("width", "length", "height")
+COLOR_FIELDS = ("hue", "saturation", "value")
+
 class TargetButton(QPushButton):
     """Custom button with a target icon drawn inside."""
     def __init__(self, parent):
@@ -57,20 +68,32 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        # 3D view
-        self.view = gl.GLViewWidget()
+        # 3D view (reports its repaint times to the performance HUD)
+        self.performance_stats = PerformanceStats()
+        self.view = TimedGLViewWidget(self.performance_stats)
         self.view.setCameraPosition(distance=10, elevation=17, azimuth=295)
+        self.view.setMouseTracking(True)  # Mouse moves without a button pressed drive the hover highlight
         layout.addWidget(self.view)
 
-        # Grid
-        grid = gl.GLGridItem()
-        grid.setSize(x=10, y=10)
-        grid.setSpacing(x=1, y=1)
-        self.view.addItem(grid)
-
         # Axes
         self.gizmo = create_axes(self.view)
 
+        # Rooms and openings of the space; the tool palette edits the active room
+        self.space_model = SpaceModel()
+        self.active_room = 0
+
+        # Persistent room scene (edges, floors, grid, doors, wall overlay)
+        self.scene = RoomScene(self.view, self.space_model)
+        self.view.door_mesh = None
+
+        # Spinbox and slider edits are applied at most once per frame
+        self.update_scheduler = SceneUpdateScheduler(self.apply_pending_updates, self)
+
+        # Undo/redo of the edits, stored as deltas of the changed fields
+        self.history = EditHistory()
+        self.edit_before = None  # State of the edited room while an edit is being recorded
+        self.replaying = False  # Undo and redo are not recorded again
+
         # Event filters
         self.view.installEventFilter(self)
         self.installEventFilter(self)
@@ -78,18 +101,10 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         # Initial mode
         self.mode = "orbitate"
         self.last_mouse_pos = None
+        self.press_pos = None  # Where the left button went down, to tell clicks from drags
 
-        # Zoom timer
-        self.zoom_timer = QTimer()
-        self.zoom_timer.setInterval(30)  # Adjust interval for smoothness
-        self.zoom_timer.timeout.connect(self.perform_zoom)
-        self.zoom_direction = None  # "in" or "out"
-
-        # Timer for smooth zoom
-        self.smooth_zoom_timer = QTimer()
-        self.smooth_zoom_timer.setInterval(10)  # Short interval for smooth zoom
-        self.smooth_zoom_timer.timeout.connect(self.perform_smooth_zoom)
-        self.smooth_zoom_direction = None  # "in" or "out"
+        # Inertial zoom for the +/- buttons and keys and the mouse wheel
+        self.zoom_controller = ZoomController(self.zoom, self)
 
         # Camera settings
         self.camera_settings = {
@@ -97,14 +112,8 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
             "orbitate": {"distance": 10, "elevation": 17, "azimuth": 295, "center": QVector3D(0, 0, 0)},
         }
 
-        # Animation time
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.animate_camera)
-        self.animation_steps = 10
-        self.current_step = 0
-        self.start_camera_settings = {}
-        self.target_camera_settings = {}
-        self.is_animating = False
+        # Camera transitions (mode switch, centering, framing) follow elapsed time
+        self.camera_animator = CameraAnimator(self.view, parent=self)
 
         # Overlay container for buttons
         self.overlay_widget = QWidget(self)
@@ -125,10 +134,6 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         self.minus_button.setFixedSize(40, 40)  # Set button size
         overlay_layout.addWidget(self.minus_button)
 
-        # Add tooltips to the buttons using the language object
-        self.plus_button.setToolTip(self.language.get("tooltip_zoom_in"))  # Tooltip for zoom in
-        self.minus_button.setToolTip(self.language.get("tooltip_zoom_out"))  # Tooltip for zoom out
-
         # Connect buttons to zoom actions
         self.plus_button.pressed.connect(lambda: self.start_smooth_zoom("in"))
         self.plus_button.released.connect(self.stop_smooth_zoom)
@@ -149,7 +154,6 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
 
         # Replace center button with TargetButton
         self.center_button = TargetButton(self.bottom_left_widget)
-        self.center_button.setToolTip(self.language.get("tooltip_center_view"))  # Tooltip for centering the view
         self.center_button.clicked.connect(self.center_view)  # Connect to the centering function
         bottom_left_layout.addWidget(self.center_button)
 
@@ -157,9 +161,11 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         self.bottom_left_widget.setFixedSize(self.bottom_left_widget.sizeHint())
         self.bottom_left_widget.raise_()
 
-        # Room plot reference
-        self.room_item = None
-        self.axes_items = create_axes(self.view)  # Create axes items for the room plot
+        # Performance overlay in the top-right corner, toggled with F3
+        self.performance_hud = PerformanceHud(self.view, self.performance_stats, self.language, self)
+
+        # Axes items are created once and stay in the view
+        self.axes_items = self.gizmo
 
         self.room_dimensions = {"width": 3.0, "length": 3.0, "height": 2.0}  # Store room dimensions globally
         self.room_color = {"hue": 216, "saturation": 50, "value": 100}  # Store room color globally
@@ -174,6 +180,18 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         # Stato per la gestione della superficie della porta
         self.door_surface = None
 
+        # Apply the tooltips now and again whenever the language changes
+        self.retranslate_ui()
+        self.language.language_changed.connect(self.retranslate_ui)
+
+    def retranslate_ui(self):
+        """Re-apply the tooltips in the current language (the HUD reads its labels on refresh)."""
+        self.plus_button.setToolTip(self.language.get("tooltip_zoom_in"))
+        self.minus_button.setToolTip(self.language.get("tooltip_zoom_out"))
+        self.center_button.setToolTip(self.language.get("tooltip_center_view"))
+        if self.performance_stats.enabled:
+            self.performance_hud.refresh()
+
     # Calculate camera vectors (right, up).
     def get_camera_vectors(self):
         camera_pos = QVector3D(*self.view.cameraPosition())
@@ -198,95 +216,76 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
 
         return right_vector, up_vector
 
-    # Zoom in or out.
-    def perform_zoom(self):
-        if self.zoom_direction == "in":
-            self.zoom(0.95)  # Adjust factor for faster/slower zoom in
-        elif self.zoom_direction == "out":
-            self.zoom(1.05)  # Adjust factor for faster/slower zoom out
+    # Unproject a point of the view into a ray.
+    def cursor_ray(self, pos):
+        """Return the ray (origin, unit direction) through a point of the view, in scene coordinates."""
+        width, height = max(1, self.view.width()), max(1, self.view.height())
+        viewport = (0, 0, width, height)
+        inverse, invertible = (self.view.projectionMatrix(viewport, viewport) * self.view.viewMatrix()).inverted()
+        if not invertible:
+            return None
+        # Normalized device coordinates of the cursor on the near plane
+        near = inverse.map(QVector3D(2.0 * pos.x() / width - 1.0, 1.0 - 2.0 * pos.y() / height, -1.0))
+        camera = self.view.cameraPosition()
+        origin = np.array([camera.x(), camera.y(), camera.z()])
+        direction = np.array([near.x(), near.y(), near.z()]) - origin
+        length = np.linalg.norm(direction)
+        if length == 0:
+            return None
+        return origin, direction / length
+
+    def pick_surface(self, pos):
+        """Return the wall or door under a point of the view (see SpaceModel.pick_surface), or None."""
+        with self.performance_stats.measure("picking"):
+            ray = self.cursor_ray(pos)
+            return self.space_model.pick_surface(*ray) if ray is not None else None
+
+    def update_hover(self, pos):
+        """Highlight the wall or door under the cursor with the hover overlay."""
+        hit = self.pick_surface(pos)
+        if hit is None:
+            self.scene.hide_hover()
+        else:
+            self.scene.show_hover((hit["kind"], hit["room"], hit["wall_index"], hit["opening"]), hit["quad"])
 
-    # Perform smooth zoom
-    def perform_smooth_zoom(self):
-        if self.smooth_zoom_direction == "in":
-            self.zoom(0.98)  # Smaller factor for smoother zoom in
-        elif self.smooth_zoom_direction == "out":
-            self.zoom(1.02)  # Smaller factor for smoother zoom out
+    def select_surface_at(self, pos):
+        """Select the room and wall of the surface clicked (a door selects the wall it is on)."""
+        hit = self.pick_surface(pos)
+        if hit is None:
+            return False
+        if hit["room"] != self.active_room:
+            self.select_room(hit["room"])
+        self.current_wall_index = hit["wall_index"]
+        self.update_translucent_wall()
+        return True
 
     # Start smooth zoom
     def start_smooth_zoom(self, direction):
-        self.smooth_zoom_direction = direction
-        if not self.smooth_zoom_timer.isActive():
-            self.smooth_zoom_timer.start()
+        self.zoom_controller.hold(direction)
 
     # Stop smooth zoom
     def stop_smooth_zoom(self):
-        self.smooth_zoom_timer.stop()
-        self.smooth_zoom_direction = None
+        self.zoom_controller.release()
 
     # Adjust camera distance.
     def zoom(self, factor):
+        if self.camera_animator.running and "distance" in self.camera_animator.target_state:
+            # Zoom relative to where the running transition is heading
+            self.camera_animator.retarget(distance=self.camera_animator.target("distance") * factor)
+            return
         current_distance = self.view.opts['distance']
         self.view.setCameraPosition(distance=current_distance * factor)
 
-    # Smooth camera transition.
-    def animate_camera(self):
-        t = self.current_step / self.animation_steps
-        interpolated_settings = {}
-
-        interpolated_settings = {}
-
-        for key in self.start_camera_settings:
-            start = self.start_camera_settings[key]
-            end = self.target_camera_settings[key]
-
-            if key in ["azimuth", "elevation"]:
-                # Normalize angle difference to shortest path
-                delta = (end - start + 180) % 360 - 180
-                interpolated_value = start + t * delta
-            elif key == "center":
-                interpolated_value = QVector3D(
-                    start.x() + t * (end.x() - start.x()),
-                    start.y() + t * (end.y() - start.y()),
-                    start.z() + t * (end.z() - start.z()),
-                )
-            else:
-                interpolated_value = start + t * (end - start)
-
-            interpolated_settings[key] = interpolated_value
-
-        self.view.setCameraPosition(
-            distance=interpolated_settings["distance"],
-            elevation=interpolated_settings["elevation"],
-            azimuth=interpolated_settings["azimuth"]
-        )
-        self.view.opts['center'] = QVector3D(
-            interpolated_settings["center"].x(),
-            interpolated_settings["center"].y(),
-            interpolated_settings["center"].z()
-        )
-        self.current_step += 1
-        if self.current_step > self.animation_steps:
-            self.animation_timer.stop()
-            self.is_animating = False
-
     # Switch camera mode.
     def switch_mode(self, mode):
-        if self.is_animating:
-            return
-        self.is_animating = True
         self.mode = mode
-        self.start_camera_settings = {
-            "distance": self.view.opts['distance'],
-            "elevation": self.view.opts['elevation'],
-            "azimuth": self.view.opts['azimuth'],
-            "center": self.view.opts['center'],
-        }
-        self.target_camera_settings = self.camera_settings[mode]
-        self.current_step = 0
-        self.animation_timer.start(30)
+        # Retargets a transition already in progress
+        self.camera_animator.animate_to(**self.camera_settings[mode])
 
     # Save current camera settings.
     def save_camera_settings(self):
+        if self.camera_animator.running:
+            return  # A camera half-way through a transition is not a view to restore
         self.camera_settings[self.mode] = {
             "distance": self.view.opts['distance'],
             "elevation": self.view.opts['elevation'],
@@ -296,22 +295,31 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
 
     # Filter events.
     def eventFilter(self, source, event):
-        if self.is_animating:
-            if event.type() in (QEvent.Type.Paint, QEvent.Type.UpdateRequest):
-                return False
+        with self.performance_stats.measure("event_filter"):
+            return self.filter_event(source, event)
+
+    def filter_event(self, source, event):
+        # Grabbing the view hands the camera back to the user
+        if source == self.view and self.camera_animator.running and event.type() == QEvent.Type.MouseButtonPress:
+            self.camera_animator.stop()
+
+        # Wheel and trackpad zoom go through the inertial controller (Ctrl+wheel still changes the field of view)
+        if source == self.view and event.type() == QEvent.Type.Wheel and event.modifiers() == Qt.KeyboardModifier.NoModifier:
+            self.zoom_controller.impulse(event.angleDelta().y() / 120)
+            event.accept()
             return True
 
         if source == self.view and event.type() == QEvent.Type.MouseButtonDblClick:
             if event.button() == Qt.MouseButton.LeftButton:
                 # Check the current mode and set the center accordingly
+                box_min, box_max = self.space_model.bounds()
+                max_dimension = max(box_max - box_min)
+                center_x, center_y, center_z = (box_min + box_max) / 2
                 if self.mode == "move":
-                    max_dimension = max(self.room_dimensions["width"], self.room_dimensions["length"], self.room_dimensions["height"])
-                    self.view.setCameraPosition(distance=max_dimension * 2)
-                    self.view.opts['center'] = QVector3D(self.room_dimensions["width"]/2, self.room_dimensions["length"]/2, 0)
-                elif self.mode == "orbitate":
-                    max_dimension = max(self.room_dimensions["width"], self.room_dimensions["length"], self.room_dimensions["height"])
-                    self.view.setCameraPosition(distance=max_dimension * 2)
-                    self.view.opts['center'] = QVector3D(self.room_dimensions["width"]/2, self.room_dimensions["length"]/2, self.room_dimensions["height"]/2)
+                    center = QVector3D(center_x, center_y, 0)
+                else:
+                    center = QVector3D(center_x, center_y, center_z)
+                self.camera_animator.animate_to(distance=max_dimension * 2, center=center)
                 event.accept()
                 return True
 
@@ -332,13 +340,27 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
                 event.accept()
                 return True
 
-        if event.type() == QEvent.Type.KeyRelease:
+        if event.type() == QEvent.Type.KeyRelease and not event.isAutoRepeat():
             key = event.key()
             if key in (Qt.Key.Key_Plus, Qt.Key.Key_Equal, Qt.Key.Key_Minus):  # Stop zoom on key release
                 self.stop_smooth_zoom()
                 event.accept()
                 return True
 
+        # Hovering (no button held) highlights the wall or door under the cursor
+        if source == self.view and event.type() == QEvent.Type.MouseMove and event.buttons() == Qt.MouseButton.NoButton:
+            self.update_hover(event.position())
+        if source == self.view and event.type() == QEvent.Type.Leave:
+            self.scene.hide_hover()
+
+        # A left click that did not drag the camera selects the wall or door under the cursor
+        if source == self.view and event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            self.press_pos = event.position()
+        if source == self.view and event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if self.press_pos is not None and (event.position() - self.press_pos).manhattanLength() <= CLICK_TOLERANCE:
+                self.select_surface_at(event.position())
+            self.press_pos = None
+
         if event.type() == QEvent.Type.MouseMove and self.mode == "move":
             if self.last_mouse_pos is not None:
                 delta = event.position() - self.last_mouse_pos
@@ -366,16 +388,15 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
 
     # Zoom in
     def zoom_in(self):
-        self.zoom_direction = "in"
-        self.perform_zoom()
+        self.zoom_controller.impulse(1)
 
     # Zoom out
     def zoom_out(self):
-        self.zoom_direction = "out"
-        self.perform_zoom()
+        self.zoom_controller.impulse(-1)
 
     def update_room_plot(self, width, length, height, hue, saturation, value, door_data=None, render_door=False):
         """Update the room plot with the given dimensions, HSV color, and door data."""
+        self.update_scheduler.discard()  # This full update supersedes any pending edit
         # Save dimensions and color globally
         self.room_dimensions = {"width": width, "length": length, "height": height}
         self.room_color = {"hue": hue, "saturation": saturation, "value": value}
@@ -383,6 +404,8 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         h = hue / 360.0  # Normalize hue to [0, 1]
         s = saturation / 100.0  # Normalize saturation to [0, 1]
         v = value / 100.0  # Normalize value to [0, 1]
+        with self.performance_stats.measure("scene_update"):
+            self.scene.update(width, length, height, h=h, s=s, v=v, room=self.active_room)
         if render_door:
             self.door_mesh_width = door_data["width"]
             self.door_mesh_height = door_data["height"]
@@ -391,13 +414,13 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
             new_door = self.create_door_surface(
                 self.door_mesh_width, 
                 self.door_mesh_height,
-                self.door_mesh_offset
+                self.door_mesh_offset,
+                self.door_mesh_wall_index
             )
             self.view.door_mesh = new_door
         else:
-            self.view.door_mesh = None
-        # print(door)
-        plot_room(self.view, width, length, height, self.axes_items, h=h, s=s, v=v)
+            self.remove_door_surface()
+        self.set_room_center()
 
 
     def update_room_color(self, width, length, height, hue, saturation, value, door_data=None):
@@ -409,19 +432,9 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         s = saturation / 100.0  # Normalize saturation to [0, 1]
         v = value / 100.0  # Normalize value to [0, 1]
 
-        if self.mode == "move":
-            # Preserve the current camera center in move mode
-            current_center = self.view.opts['center']
-            if self.room_item:
-                self.view.removeItem(self.room_item)  # Remove the existing room plot
-            plot_room(self.view, width, length, height, self.axes_items, h=h, s=s, v=v, set_center=False, door=False)
-            # Restore the camera center
-            self.view.opts['center'] = current_center
-        else:
-            # Default behavior for orbitate mode
-            if self.room_item:
-                self.view.removeItem(self.room_item)  # Remove the existing room plot
-            plot_room(self.view, width, length, height, self.axes_items, h=h, s=s, v=v, door=False)
+        # Only the item colours change: geometry, door and camera are left as they are
+        with self.performance_stats.measure("scene_update"):
+            self.scene.set_color(h, s, v)
 
         # # Render the door if door data is provided
         # if door_data:
@@ -435,29 +448,213 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         #         self.room_color
         #     )
 
+    def schedule_room_update(self):
+        """Mark the room dimensions as edited; the scene is rebuilt on the next frame."""
+        self.update_scheduler.mark_dirty("geometry")
+
+    def schedule_color_update(self):
+        """Mark the room color as edited; the scene is recolored on the next frame."""
+        self.update_scheduler.mark_dirty("color")
+
+    def apply_pending_updates(self, dirty):
+        """Apply the coalesced edits using the current values of the tool palette."""
+        values = (
+            self.tool_palette.width_spinbox.value(),
+            self.tool_palette.length_spinbox.value(),
+            self.tool_palette.height_spinbox.value(),
+            self.tool_palette.hue_slider.value(),
+            self.tool_palette.saturation_slider.value(),
+            self.tool_palette.value_slider.value()
+        )
+        with self.recorded_edit(("room", self.active_room) if "geometry" in dirty else "color"):
+            if "geometry" in dirty:
+                self.update_room_plot(*values)  # Also applies the color
+            elif "color" in dirty:
+                self.update_room_color(*values)
+
+    def set_room_center(self):
+        """Set the camera center to the middle of the space."""
+        self.view.opts['center'] = QVector3D(*self.space_model.center())
+        self.view.update()
+
+    def set_space_model(self, model):
+        """Show a loaded space, replacing the rooms and openings being edited."""
+        self.update_scheduler.discard()  # Pending palette edits belong to the previous space
+        self.history.clear()
+        self.space_model = model
+        self.room_color = dict(model.color)
+        self.update_target_button_color()
+        self.scene.set_model(model)
+        self.select_room(0)
+        self.set_room_center()
+
+    def select_room(self, index):
+        """Make a room the one edited by the tool palette."""
+        self.update_scheduler.flush()  # Edits made so far belong to the previous room
+        self.history.seal()
+        self.active_room = index
+        self.room_dimensions = dict(self.space_model.rooms[index]["coordinates"])
+        self.door_surface = self.scene.door_mesh if self.space_model.room_openings(index) else None
+        self.view.door_mesh = self.door_surface
+        if self.translucent_wall:
+            self.update_translucent_wall()
+        self.tool_palette.set_rooms(len(self.space_model.rooms), index, self.room_dimensions)
+
+    def add_room(self):
+        """Add a room as large as the active one against the first free wall of it."""
+        width, length, height = (self.space_model.rooms[self.active_room]["coordinates"][key] for key in ("width", "length", "height"))
+        for wall_index in (1, 2, 3, 0):  # Right, back, left, front
+            origin = self.space_model.adjacent_origin(self.active_room, wall_index, width, length)
+            if not self.space_model.room_overlaps(width, length, height, origin):
+                break
+        else:
+            QMessageBox.warning(self, self.language.get("warning_title"), self.language.get("warning_no_room_space"))
+            return
+        index = self.space_model.add_room(width, length, height, origin)
+        self.history.push(EditCommand("add_room", index, {}, {"room": self.room_copy(index)}))
+        self.scene.refresh()
+        self.select_room(index)
+        self.center_view()
+
+    def remove_room(self):
+        """Remove the active room and its doors (a space keeps at least one room)."""
+        if len(self.space_model.rooms) <= 1:
+            return
+        self.update_scheduler.flush()
+        removed = self.active_room
+        before = {"room": self.room_copy(removed), "openings": self.space_model.room_openings(removed)}
+        self.space_model.remove_room(removed)
+        self.history.push(EditCommand("remove_room", removed, before, {}))
+        if self.scene.wall is not None and self.scene.wall[0] == removed:
+            self.scene.hide_wall()
+            self.translucent_wall = None
+        self.scene.refresh()
+        self.select_room(max(0, removed - 1))
+
+    # Undo and redo
+
+    def room_copy(self, index):
+        room = self.space_model.rooms[index]
+        return {"origin": dict(room["origin"]), "coordinates": dict(room["coordinates"])}
+
+    def room_state(self, room):
+        """Fields an edit of a room can change: its dimensions and doors, and the space colour."""
+        state = dict(self.space_model.rooms[room]["coordinates"])
+        state.update((key, float(self.space_model.color[key])) for key in COLOR_FIELDS)
+        state["openings"] = tuple(
+            tuple(opening[key] for key in ("width", "height", "offset", "wall_index"))
+            for opening in self.space_model.room_openings(room)
+        )
+        return state
+
+    @contextmanager
+    def recorded_edit(self, merge_key):
+        """Record the fields of the active room changed inside the block as one undoable edit."""
+        if self.replaying or self.edit_before is not None:
+            yield  # Part of an edit already being recorded (or of an undo)
+            return
+        room = self.active_room
+        self.edit_before = self.room_state(room)
+        try:
+            yield
+        finally:
+            before, self.edit_before = self.edit_before, None
+        after = self.room_state(room)
+        changed = [key for key in after if after[key] != before[key]]
+        if changed:
+            self.history.push(EditCommand(
+                "state", room, {key: before[key] for key in changed}, {key: after[key] for key in changed}, merge_key
+            ))
+
+    def end_edit(self):
+        """Close the running edit (a slider was released): the next change starts a new history entry."""
+        self.update_scheduler.flush()
+        self.history.seal()
+
+    def undo(self):
+        self.update_scheduler.flush()  # A pending edit is recorded first, then undone
+        command = self.history.undo()
+        if command is not None:
+            self.replay(command, command.before, undo=True)
+
+    def redo(self):
+        self.update_scheduler.flush()
+        command = self.history.redo()
+        if command is not None:
+            self.replay(command, command.after, undo=False)
+
+    def replay(self, command, fields, undo):
+        """
+        Apply the recorded fields of an edit to the model and push them through
+        the incremental scene update (colour only, or the geometry of the items).
+        """
+        model = self.space_model
+        room = command.target
+        self.replaying = True
+        try:
+            if command.kind == "state":
+                dimensions = {key: fields[key] for key in DIMENSION_FIELDS if key in fields}
+                if dimensions:
+                    model.set_room(room, **dimensions)
+                model.color.update((key, fields[key]) for key in COLOR_FIELDS if key in fields)
+                if "openings" in fields:
+                    model.clear_openings(room)
+                    model.openings += [
+                        {"room": room, "width": width, "height": height, "offset": offset, "wall_index": wall_index}
+                        for width, height, offset, wall_index in fields["openings"]
+                    ]
+            elif (command.kind == "add_room") == undo:
+                model.remove_room(room)  # Undo of an added room, redo of a removed one
+                room = max(0, room - 1)
+            else:
+                model.insert_room(room, fields["room"], fields.get("openings", ()))
+
+            if self.scene.wall is not None and self.scene.wall[0] >= len(model.rooms):
+                self.scene.hide_wall()
+                self.translucent_wall = None
+            with self.performance_stats.measure("scene_update"):
+                if command.kind == "state" and set(fields) <= set(COLOR_FIELDS):
+                    self.scene.set_color(*model.hsv())
+                else:
+                    self.scene.refresh()
+
+            self.room_color = dict(model.color)
+            self.update_target_button_color()
+            self.show_color_in_palette()
+            self.select_room(room)
+        finally:
+            self.replaying = False
+
+    def show_color_in_palette(self):
+        """Move the colour sliders to the space colour without scheduling an update."""
+        for slider, key in (
+            (self.tool_palette.hue_slider, "hue"),
+            (self.tool_palette.saturation_slider, "saturation"),
+            (self.tool_palette.value_slider, "value"),
+        ):
+            slider.blockSignals(True)
+            slider.setValue(int(round(self.space_model.color[key])))
+            slider.blockSignals(False)
+        self.tool_palette.update_slider_colors()
+
     def update_target_button_color(self):
         """Update the color of the target button based on the current room color."""
         h = self.room_color["hue"] / 360.0
         s = self.room_color["saturation"] / 100.0
         v = self.room_color["value"] / 100.0
         color = QColor.fromHsvF(h, s, v)
-        self.center_button.set_color(color)
+        if color != self.center_button.color:
+            self.center_button.set_color(color)
 
     def center_view(self):
         """Center the view when the center button is clicked."""
-        max_dimension = max(
-            self.room_dimensions["width"],
-            self.room_dimensions["length"],
-            self.room_dimensions["height"]
-        )
-        # Calcola il centro corretto basandoti sulle dimensioni della stanza
-        center_x = self.room_dimensions["width"] / 2
-        center_y = self.room_dimensions["length"] / 2
-        center_z = self.room_dimensions["height"] / 2
+        box_min, box_max = self.space_model.bounds()
+        max_dimension = max(box_max - box_min)
+        # Calcola il centro corretto basandoti sull'ingombro di tutte le stanze
+        center_x, center_y, center_z = (box_min + box_max) / 2
 
-        # Imposta la posizione della telecamera e il centro della vista
-        self.view.setCameraPosition(distance=max_dimension * 2)
-        self.view.opts['center'] = QVector3D(center_x, center_y, center_z)
+        # Porta la telecamera sulla stanza con una transizione
+        self.camera_animator.animate_to(distance=max_dimension * 2, center=QVector3D(center_x, center_y, center_z))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -466,33 +663,24 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         margin = 10
         w = self.bottom_left_widget
         w.move(margin, self.height() - w.height() - margin)
+        if self.performance_stats.enabled:
+            self.performance_hud.refresh()  # Keep it in the top-right corner
+
+    def toggle_performance_hud(self):
+        """Show or hide the performance overlay."""
+        self.performance_hud.toggle()
 
     def toggle_wall_selection(self):
         """Toggle the visibility of the translucent wall selection."""
         if self.translucent_wall:
-            self.view.removeItem(self.translucent_wall)
+            self.scene.hide_wall()
             self.translucent_wall = None
         else:
             self.update_translucent_wall()
 
     def update_translucent_wall(self):
         """Update the translucent wall overlay based on the current wall index."""
-        if self.translucent_wall:
-            self.view.removeItem(self.translucent_wall)
-
-        room_dims = self.room_dimensions
-        room_color = self.room_color
-        self.translucent_wall = create_translucent_wall(
-            self.view,
-            self.current_wall_index,
-            room_dims["width"],
-            room_dims["length"],
-            room_dims["height"],
-            h=room_color["hue"] / 360,
-            s=room_color["saturation"] / 100,
-            v=room_color["value"] / 100,
-            alpha=0.3
-        )
+        self.translucent_wall = self.scene.show_wall(self.current_wall_index, self.active_room)
 
     def select_next_wall(self):
         """Select the next wall in clockwise order."""
@@ -509,14 +697,14 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
     def hideEvent(self, event):
         """Remove the translucent wall when the frame is hidden."""
         if self.translucent_wall:
-            self.view.removeItem(self.translucent_wall)
+            self.scene.hide_wall()
             self.translucent_wall = None
         super().hideEvent(event)
 
     def create_initial_translucent_wall(self):
-        """Crea la superficie iniziale sopra la prima parete."""
+        """Crea la superficie iniziale sopra la parete selezionata."""
         if not self.translucent_wall_active:
-            self.current_wall_index = 0  # Imposta la prima parete
+            # Parte dalla parete scelta per ultima (frecce o clic nella vista)
             self.update_translucent_wall()
             self.translucent_wall_active = True
 
@@ -524,28 +712,18 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
         """Rimuove la superficie traslucida."""
         if self.translucent_wall_active:
             if self.translucent_wall:
-                self.view.removeItem(self.translucent_wall)
+                self.scene.hide_wall()
                 self.translucent_wall = None
             self.translucent_wall_active = False
 
-    def create_door_surface(self, width, height, offset):
-        """Create a translucent surface to represent the door."""
-        # Remove the existing door, if present
-        if self.door_surface:
-            if self.door_surface in self.view.items:
-                self.view.removeItem(self.door_surface)
-            self.door_surface = None
+    def create_door_surface(self, width, height, offset, wall_index=None):
+        """Show the translucent surface that represents the door."""
+        if wall_index is None:
+            wall_index = self.current_wall_index
 
-        # Use the centralized function to create the door
-        self.door_surface = create_door(
-            self.view,
-            width,
-            height,
-            offset,
-            self.current_wall_index,
-            self.room_dimensions,
-            self.room_color
-        )
+        # The scene reuses the same door item, only its geometry changes
+        with self.recorded_edit(("openings", self.active_room)):
+            self.door_surface = self.scene.set_door(width, height, offset, wall_index, room=self.active_room)
         return self.door_surface
 
     def warn_and_remove_door(self):
@@ -565,28 +743,22 @@ class SpaceCreationFrame(QFrame):  # Renamed from CentralFrame
 
     def get_current_wall_length(self):
         """Restituisce la lunghezza della parete attualmente selezionata."""
-        if self.current_wall_index in [0, 2]:  # Pareti 0 e 2 si sviluppano lungo la larghezza
-            return self.room_dimensions["width"]
-        elif self.current_wall_index in [1, 3]:  # Pareti 1 e 3 si sviluppano lungo la lunghezza
-            return self.room_dimensions["length"]
+        self.update_scheduler.flush()  # Usa le dimensioni appena modificate
+        if self.current_wall_index in range(4):  # Pareti 0 e 2 lungo la larghezza, 1 e 3 lungo la lunghezza
+            return self.space_model.wall_length(self.active_room, self.current_wall_index)
         return 0.0
 
     def remove_door_surface(self):
         """Rimuove la superficie della porta, se presente."""
         if self.door_surface:
-            try:
-                self.view.removeItem(self.door_surface)
-            except ValueError:
-                pass  # Silently handle the case where the door_surface is not in view items
+            with self.recorded_edit(("openings", self.active_room)):
+                self.scene.clear_door(self.active_room)
             self.door_surface = None
+        self.view.door_mesh = None
 
     def get_door_data(self):
         """Retrieve the current door data if a door is present."""
-        if self.door_surface:
-            return {
-                "width": self.door_surface.width,
-                "height": self.door_surface.height,
-                "offset": self.door_surface.offset,
-                "wall_index": self.door_surface.wall_index
-            }
+        openings = self.space_model.room_openings(self.active_room)
+        if openings:
+            return {key: openings[0][key] for key in ("width", "height", "offset", "wall_index")}
         return None
\ No newline at end of file
@@ -1,9 +1,11 @@
-from PyQt6.QtWidgets import QFrame, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QDoubleSpinBox, QSlider, QListWidget, QListWidgetItem, QFileDialog, QLabel, QScrollArea, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QDialog, QMessageBox, QMenu
+from PyQt6.QtWidgets import QFrame, QComboBox, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QDoubleSpinBox, QSlider, QListWidget, QListWidgetItem, QFileDialog, QLabel, QScrollArea, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QDialog, QMessageBox, QMenu
 from PyQt6.QtGui import QPainter, QPaintEvent, QColor, QFont, QPixmap, QIcon, QGuiApplication, QBrush, QPolygon
 from PyQt6.QtCore import QSize, pyqtSignal, Qt, QPoint, QRect
+from PyQt6 import sip
 import os
-import shutil
 import subprocess  # Import subprocess for opening files
+from components.space.image_store import get_image_importer
+from components.space.photo_thumbnails import get_photo_thumbnails
 
 class ToolPaletteFrame(QFrame):
     button_pressed = pyqtSignal(str)
@@ -30,11 +32,9 @@ class ToolPaletteFrame(QFrame):
         button_layout.setSpacing(0)
 
         self.cube_button = ShapeButton(self, "cube")
-        self.cube_button.setToolTip(self.language.get("tooltip_orbitate"))  # Correct tooltip key
         self.cube_button.clicked.connect(self.select_cube)
 
         self.square_button = ShapeButton(self, "square")
-        self.square_button.setToolTip(self.language.get("tooltip_floor_plan"))  # Correct tooltip key
         self.square_button.clicked.connect(self.select_square)
 
         button_layout.addWidget(self.cube_button)
@@ -46,7 +46,7 @@ class ToolPaletteFrame(QFrame):
 
         label_font = QFont("Poppins", 12)
 
-        self.height_label = QLabel(self.language.get("label_height"))
+        self.height_label = QLabel()
         self.height_label.setFont(label_font)
         self.height_spinbox = QDoubleSpinBox()
         self.height_spinbox.setRange(0.1, 9999.99)
@@ -54,7 +54,7 @@ class ToolPaletteFrame(QFrame):
         self.height_spinbox.setSuffix(" m")
         self.height_spinbox.setValue(2.0)
 
-        self.length_label = QLabel(self.language.get("label_length"))
+        self.length_label = QLabel()
         self.length_label.setFont(label_font)
         self.length_spinbox = QDoubleSpinBox()
         self.length_spinbox.setRange(0.1, 9999.99)
@@ -62,7 +62,7 @@ class ToolPaletteFrame(QFrame):
         self.length_spinbox.setSuffix(" m")
         self.length_spinbox.setValue(3.0)
 
-        self.width_label = QLabel(self.language.get("label_width"))
+        self.width_label = QLabel()
         self.width_label.setFont(label_font)
         self.width_spinbox = QDoubleSpinBox()
         self.width_spinbox.setRange(0.1, 9999.99)
@@ -70,7 +70,27 @@ class ToolPaletteFrame(QFrame):
         self.width_spinbox.setSuffix(" m")
         self.width_spinbox.setValue(3.0)
 
+        # Room selector: the spinboxes edit the selected room of the space
+        self.rooms_label = QLabel()
+        self.rooms_label.setFont(label_font)
+        self.room_combo = QComboBox()
+        self.room_combo.currentIndexChanged.connect(self.room_selected)
+        self.add_room_button = QPushButton("+")
+        self.add_room_button.setObjectName("addRoomButton")
+        self.add_room_button.setFixedSize(30, 30)
+        self.add_room_button.clicked.connect(lambda: self.parent_frame.add_room())
+        self.remove_room_button = QPushButton("−")
+        self.remove_room_button.setObjectName("removeRoomButton")
+        self.remove_room_button.setFixedSize(30, 30)
+        self.remove_room_button.clicked.connect(lambda: self.parent_frame.remove_room())
+        room_layout = QHBoxLayout()
+        room_layout.addWidget(self.room_combo, stretch=1)
+        room_layout.addWidget(self.add_room_button)
+        room_layout.addWidget(self.remove_room_button)
+
         dimension_layout = QVBoxLayout()  # Define dimension_layout before usage
+        dimension_layout.addWidget(self.rooms_label)
+        dimension_layout.addLayout(room_layout)
         dimension_layout.addWidget(self.width_label)
         dimension_layout.addWidget(self.width_spinbox)
         dimension_layout.addWidget(self.length_label)
@@ -82,7 +102,6 @@ class ToolPaletteFrame(QFrame):
         dimension_layout.addSpacing(10)
         door_button_layout = QHBoxLayout()  # Create a horizontal layout to center the button
         self.insert_door_button = ShapeButton(self, "door")  # Use ShapeButton for the door
-        self.insert_door_button.setToolTip(self.language.get("tooltip_insert_main_entrance"))  # Add tooltip
         self.insert_door_button.setFixedSize(50, 50)
         self.insert_door_button.clicked.connect(self.toggle_menu)  # Connect to toggle menu
         door_button_layout.addStretch()  # Add stretch before the button
@@ -96,7 +115,7 @@ class ToolPaletteFrame(QFrame):
         # Add HSV sliders and labels
         hsv_layout = QVBoxLayout()
 
-        self.hue_label = QLabel(self.language.get("label_hue"))
+        self.hue_label = QLabel()
         self.hue_label.setFont(label_font)
         self.hue_slider = QSlider(Qt.Orientation.Horizontal)
         self.hue_slider.setRange(0, 360)  # Hue range in degrees
@@ -105,7 +124,7 @@ class ToolPaletteFrame(QFrame):
         hsv_layout.addWidget(self.hue_label)
         hsv_layout.addWidget(self.hue_slider)
 
-        self.saturation_label = QLabel(self.language.get("label_saturation"))
+        self.saturation_label = QLabel()
         self.saturation_label.setFont(label_font)
         self.saturation_slider = QSlider(Qt.Orientation.Horizontal)
         self.saturation_slider.setRange(0, 100)  # Saturation range as percentage
@@ -114,7 +133,7 @@ class ToolPaletteFrame(QFrame):
         hsv_layout.addWidget(self.saturation_label)
         hsv_layout.addWidget(self.saturation_slider)
 
-        self.value_label = QLabel(self.language.get("label_value"))
+        self.value_label = QLabel()
         self.value_label.setFont(label_font)
         self.value_slider = QSlider(Qt.Orientation.Horizontal)
         self.value_slider.setRange(0, 100)  # Value range as percentage
@@ -129,14 +148,14 @@ class ToolPaletteFrame(QFrame):
         # main_layout.addStretch()  # Push everything else to the bottom
 
         # Image gallery section
-        self.image_gallery_label = QLabel(self.language.get("label_image_gallery"))
+        self.image_gallery_label = QLabel()
         self.image_gallery_scroll_area = QScrollArea()
         self.image_gallery_scroll_area.setWidgetResizable(True)
         self.image_gallery_widget = QWidget()
         self.image_gallery_layout = QVBoxLayout(self.image_gallery_widget)
         self.image_gallery_scroll_area.setWidget(self.image_gallery_widget)
 
-        self.add_image_button = QPushButton(self.language.get("button_add_image"))
+        self.add_image_button = QPushButton()
         self.add_image_button.clicked.connect(self.add_image)
         self.add_image_button.setEnabled(False)  # Disable the button initially
         self.add_image_button.setObjectName("addImageButton")
@@ -152,10 +171,66 @@ class ToolPaletteFrame(QFrame):
         self.images_folder = None  # Folder to save images after model is saved
         self.add_image_button.setEnabled(False)  # Disable the button initially
 
+        # Photos are hashed, stored once and linked into the space on worker threads
+        self.image_importer = get_image_importer()
+        self.image_importer.imported.connect(self.image_imported)
+        self.image_importer.failed.connect(self.image_import_failed)
+
+        # Apply the strings now and again whenever the language changes
+        self.retranslate_ui()
+        self.language.language_changed.connect(self.retranslate_ui)
+
         # Set default mode and update slider colors
         self.select_cube()  # Select "Orbitate" mode by default
         self.update_slider_colors()  # Update slider handle colors based on default HSV values
 
+    def retranslate_ui(self):
+        """Re-apply the labels and tooltips in the current language."""
+        self.cube_button.setToolTip(self.language.get("tooltip_orbitate"))
+        self.square_button.setToolTip(self.language.get("tooltip_floor_plan"))
+        self.rooms_label.setText(self.language.get("label_rooms"))
+        self.add_room_button.setToolTip(self.language.get("tooltip_add_room"))
+        self.remove_room_button.setToolTip(self.language.get("tooltip_remove_room"))
+        self.set_rooms(max(1, self.room_combo.count()), max(0, self.room_combo.currentIndex()))
+        self.height_label.setText(self.language.get("label_height"))
+        self.length_label.setText(self.language.get("label_length"))
+        self.width_label.setText(self.language.get("label_width"))
+        self.insert_door_button.setToolTip(self.language.get("tooltip_insert_main_entrance"))
+        self.hue_label.setText(self.language.get("label_hue"))
+        self.saturation_label.setText(self.language.get("label_saturation"))
+        self.value_label.setText(self.language.get("label_value"))
+        self.image_gallery_label.setText(self.language.get("label_image_gallery"))
+        self.add_image_button.setText(self.language.get("button_add_image"))
+        for image_label in self.image_gallery_widget.findChildren(ClickableImageLabel):
+            image_label.setToolTip(self.language.get("tooltip_open_image"))
+
+        # The door menu is built the first time it is opened
+        if self.menu_widget:
+            self.confirm_button.setToolTip(self.language.get("tooltip_confirm_selection"))
+            self.door_height_label.setText(self.language.get("label_door_height"))
+            self.door_width_label.setText(self.language.get("label_door_width"))
+            self.door_offset_label.setText(self.language.get("label_door_offset"))
+
+    def set_rooms(self, count, active, dimensions=None):
+        """List the rooms of the space, select the active one and show its dimensions."""
+        self.room_combo.blockSignals(True)
+        self.room_combo.clear()
+        self.room_combo.addItems([self.language.get("room_item").format(number=i + 1) for i in range(count)])
+        self.room_combo.setCurrentIndex(active)
+        self.room_combo.blockSignals(False)
+        self.remove_room_button.setEnabled(count > 1)
+
+        if dimensions is not None:
+            # Showing another room is not an edit: no update is scheduled and its door stays
+            for spinbox, key in ((self.width_spinbox, "width"), (self.length_spinbox, "length"), (self.height_spinbox, "height")):
+                spinbox.blockSignals(True)
+                spinbox.setValue(dimensions[key])
+                spinbox.blockSignals(False)
+
+    def room_selected(self, index):
+        if index >= 0 and self.parent_frame:
+            self.parent_frame.select_room(index)
+
     def enable_image_addition(self, images_folder):
         """Enable the 'Add Image' button and set the folder for saving images."""
         self.model_saved = True
@@ -197,31 +272,28 @@ class ToolPaletteFrame(QFrame):
         self.value_slider.setStyleSheet(f"QSlider::handle:horizontal {{ background: {rgb}; }}")
 
     def add_image(self):
-        """Open a file dialog to add an image and save it directly."""
+        """Open a file dialog to add images; they are imported in the background."""
         if not self.model_saved:
             QMessageBox.warning(self, self.language.get("error_title"), self.language.get("error_save_model_first"))
             return
 
-        image_path, _ = QFileDialog.getOpenFileName(self, self.language.get("dialog_select_image"), "", "Images (*.png *.jpg *.jpeg)")
-        if image_path:
-            # Ensure the images folder exists
-            if self.images_folder is not None and not os.path.exists(self.images_folder):
-                os.makedirs(self.images_folder, exist_ok=True)
-
-            # Generate a unique name for the image
-            original_name = os.path.basename(image_path)
-            name, ext = os.path.splitext(original_name)
-            counter = 1
-            new_name = original_name
-            images_folder_str = str(self.images_folder)
-            while os.path.exists(os.path.join(images_folder_str, new_name)):
-                new_name = f"{name}_{counter}{ext}"
-                counter += 1
-
-            saved_image_path = os.path.join(str(self.images_folder), new_name)
-            shutil.copy(image_path, saved_image_path)  # Save the image without compression
-            self.images.append(saved_image_path)  # Store the saved image path
-            self.display_image(saved_image_path)
+        image_paths, _ = QFileDialog.getOpenFileNames(self, self.language.get("dialog_select_image"), "", "Images (*.png *.jpg *.jpeg)")
+        if image_paths:
+            self.image_importer.import_images(image_paths, str(self.images_folder))
+
+    def image_imported(self, images_folder, image_path):
+        """Show a photo once it has been imported, if it belongs to the space being edited."""
+        if images_folder != str(self.images_folder) or image_path in self.images:
+            return
+        self.images.append(image_path)  # Store the saved image path
+        self.display_image(image_path)
+
+    def image_import_failed(self, source, error):
+        QMessageBox.warning(
+            self,
+            self.language.get("error_title"),
+            self.language.get("error_importing_image").format(image=os.path.basename(source), error=error)
+        )
 
     def display_image(self, image_path):
         """Display a saved image in the gallery."""
@@ -229,10 +301,9 @@ class ToolPaletteFrame(QFrame):
         image_item_layout = QVBoxLayout(image_item_widget)  # Use vertical layout for full width
         image_item_layout.setContentsMargins(0, 0, 0, 0)
 
-        # Image preview
-        pixmap = QPixmap(image_path).scaled(self.image_gallery_scroll_area.width(), 125, Qt.AspectRatioMode.KeepAspectRatio)
+        # Image preview, decoded in the background
         image_label = ClickableImageLabel(image_path, self)
-        image_label.setPixmap(pixmap)
+        image_label.load_thumbnail(self.image_gallery_scroll_area.width(), 125)
         image_item_layout.addWidget(image_label)
 
         self.image_gallery_layout.addWidget(image_item_widget)
@@ -271,7 +342,9 @@ class ToolPaletteFrame(QFrame):
             image_item_widget.deleteLater()
             self.images.remove(image_path)
             if os.path.exists(image_path):
-                os.remove(image_path)  # Delete the saved image file
+                # Delete the saved image file; the stored photo goes in the background unless another space uses it
+                os.remove(image_path)
+                self.image_importer.collect_unused()
 
     def load_images(self, images):
         """Load saved images into the tool palette."""
@@ -361,33 +434,33 @@ class ToolPaletteFrame(QFrame):
         door_controls_layout.setSpacing(10)
 
         # Height control
-        height_label = QLabel(self.language.get("label_door_height"), self.door_controls_widget)
+        self.door_height_label = QLabel(self.language.get("label_door_height"), self.door_controls_widget)
         height_spinbox = QDoubleSpinBox(self.door_controls_widget)
         height_spinbox.setRange(0.1, 10.0)
         height_spinbox.setSingleStep(0.1)
         height_spinbox.setSuffix(" m")
         height_spinbox.setValue(2.0)
-        door_controls_layout.addWidget(height_label)
+        door_controls_layout.addWidget(self.door_height_label)
         door_controls_layout.addWidget(height_spinbox)
 
         # Width control
-        width_label = QLabel(self.language.get("label_door_width"), self.door_controls_widget)
+        self.door_width_label = QLabel(self.language.get("label_door_width"), self.door_controls_widget)
         width_spinbox = QDoubleSpinBox(self.door_controls_widget)
         width_spinbox.setRange(0.1, 10.0)
         width_spinbox.setSingleStep(0.1)
         width_spinbox.setSuffix(" m")
         width_spinbox.setValue(1.0)
-        door_controls_layout.addWidget(width_label)
+        door_controls_layout.addWidget(self.door_width_label)
         door_controls_layout.addWidget(width_spinbox)
 
         # Position control
-        offset_label = QLabel(self.language.get("label_door_offset"), self.door_controls_widget)
+        self.door_offset_label = QLabel(self.language.get("label_door_offset"), self.door_controls_widget)
         offset_spinbox = QDoubleSpinBox(self.door_controls_widget)
         offset_spinbox.setRange(0.0, 100.0)  # Assuming wall length in meters
         offset_spinbox.setSingleStep(0.1)
         offset_spinbox.setSuffix(" m")
         offset_spinbox.setValue(0.0)
-        door_controls_layout.addWidget(offset_label)
+        door_controls_layout.addWidget(self.door_offset_label)
         door_controls_layout.addWidget(offset_spinbox)
 
         # Add validation logic for door dimensions and offset
@@ -449,15 +522,8 @@ class ToolPaletteFrame(QFrame):
 
             self.parent_frame.view.door_mesh = None
 
-            # Aggiorna le dimensioni della stanza
-            self.parent_frame.update_room_plot(
-                width=self.width_spinbox.value(),
-                length=self.length_spinbox.value(),
-                height=self.height_spinbox.value(),
-                hue=self.hue_slider.value(),
-                saturation=self.saturation_slider.value(),
-                value=self.value_slider.value()
-            )
+            # Aggiorna le dimensioni della stanza al prossimo frame
+            self.parent_frame.schedule_room_update()
 
         # Connetti le spinbox al gestore delle modifiche
         self.width_spinbox.valueChanged.connect(handle_room_dimension_change)
@@ -549,11 +615,55 @@ class ToolPaletteFrame(QFrame):
         self.height_spinbox.style().polish(self.height_spinbox)
 
 class ClickableImageLabel(QLabel):
+    # Labels waiting for a thumbnail by (path, width, height); a single connection to the
+    # service hands each decoded photo to its own labels only
+    waiting = {}
+    dispatching = False
+
     def __init__(self, image_path, parent=None):
         super().__init__(parent)
         self.image_path = image_path
         self.parent_frame = parent
         self.setToolTip(self.parent_frame.language.get("tooltip_open_image"))  # Add tooltip
+        self.thumbnail_key = None  # Thumbnail the label is waiting for
+
+    def load_thumbnail(self, width, height):
+        """Show a placeholder and fill in the thumbnail once it has been decoded."""
+        self.stop_waiting()
+        width, height = max(1, int(width)), max(1, int(height))
+        pixmap = get_photo_thumbnails().thumbnail(self.image_path, width, height)
+        if pixmap is None:
+            self.setText("...")
+            self.setMinimumHeight(height)
+            if not ClickableImageLabel.dispatching:
+                get_photo_thumbnails().thumbnail_ready.connect(ClickableImageLabel.thumbnail_ready)
+                ClickableImageLabel.dispatching = True
+            self.thumbnail_key = (self.image_path, width, height)
+            ClickableImageLabel.waiting.setdefault(self.thumbnail_key, []).append(self)
+        else:
+            self.setPixmap(pixmap)
+
+    def stop_waiting(self):
+        labels = ClickableImageLabel.waiting.get(self.thumbnail_key)
+        if labels is not None:
+            labels.remove(self)
+            if not labels:
+                del ClickableImageLabel.waiting[self.thumbnail_key]
+        self.thumbnail_key = None
+
+    @staticmethod
+    def thumbnail_ready(path, width, height):
+        """Fill in the labels waiting for a decoded photo."""
+        labels = ClickableImageLabel.waiting.pop((path, width, height), ())
+        if not labels:
+            return
+        pixmap = get_photo_thumbnails().thumbnail(path, width, height)
+        for label in labels:
+            if sip.isdeleted(label):
+                continue  # Removed from the gallery meanwhile
+            label.thumbnail_key = None
+            label.setText("")
+            label.setPixmap(pixmap if pixmap is not None else QPixmap())
 
     def contextMenuEvent(self, event):
         """Show a context menu for the image."""
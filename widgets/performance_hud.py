@@ -0,0 +1,138 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+import pyqtgraph.opengl as gl
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QTimer
+
+SAMPLE_COUNT = 240  # Samples kept per measurement (about 4 s of frames at 60 Hz)
+HUD_REFRESH_MS = 500
+
+class PerformanceStats:
+    """Rolling timings of the 3D editor, recorded only while enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.samples = {}  # Name -> deque of durations in milliseconds
+        self.frame_stamps = deque(maxlen=SAMPLE_COUNT)  # Monotonic time of the last repaints
+
+    def record(self, name, seconds):
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=SAMPLE_COUNT)
+        self.samples[name].append(seconds * 1000.0)
+
+    @contextmanager
+    def measure(self, name):
+        """Time the enclosed block under name (no-op while disabled)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record_frame(self, seconds):
+        self.record("frame", seconds)
+        self.frame_stamps.append(time.monotonic())
+
+    def percentiles(self, name, q=(50, 95, 99)):
+        """Return the requested percentiles of a measurement in ms, or None without samples."""
+        values = self.samples.get(name)
+        if not values:
+            return None
+        return np.percentile(np.fromiter(values, dtype=float), q)
+
+    def repaints_per_second(self, window=1.0):
+        now = time.monotonic()
+        return sum(1 for stamp in self.frame_stamps if now - stamp <= window) / window
+
+    def clear(self):
+        self.samples.clear()
+        self.frame_stamps.clear()
+
+class TimedGLViewWidget(gl.GLViewWidget):
+    """GLViewWidget that reports how long each repaint takes to a PerformanceStats."""
+
+    def __init__(self, stats, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+
+    def paintGL(self, *args, **kwargs):
+        if not self.stats.enabled:
+            return super().paintGL(*args, **kwargs)
+        start = time.perf_counter()
+        super().paintGL(*args, **kwargs)
+        self.stats.record_frame(time.perf_counter() - start)
+
+def item_vertex_count(item):
+    """Number of vertices uploaded by a GL item (0 for items generated at draw time, like the grid)."""
+    pos = getattr(item, "pos", None)
+    if pos is not None:
+        return len(pos)
+    opts = getattr(item, "opts", {})
+    meshdata = opts.get("meshdata") if isinstance(opts, dict) else None
+    if meshdata is not None and meshdata.vertexes() is not None:
+        return len(meshdata.vertexes())
+    return 0
+
+class PerformanceHud(QLabel):
+    """Overlay listing frame times, repaint rate, scene size and editor timings."""
+
+    def __init__(self, view, stats, language, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.stats = stats
+        self.language = language
+        self.setObjectName("performanceHud")  # Use QSS styling
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self.hide()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(HUD_REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def toggle(self):
+        self.set_active(not self.stats.enabled)
+
+    def set_active(self, active):
+        """Show the overlay and start collecting timings, or hide it and stop."""
+        self.stats.enabled = active
+        if active:
+            self.stats.clear()
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+            self.hide()
+
+    def format_timing(self, label, name):
+        values = self.stats.percentiles(name)
+        if values is None:
+            return f"{label}: -"
+        p50, p95, p99 = values
+        return f"{label}: {p50:.2f} / {p95:.2f} / {p99:.2f} ms"
+
+    def refresh(self):
+        items = [item for item in self.view.items if item.visible()]
+        vertices = sum(item_vertex_count(item) for item in items)
+        lines = [
+            self.language.get("hud_percentiles"),
+            self.format_timing(self.language.get("hud_frame_time"), "frame"),
+            f"{self.language.get('hud_repaints')}: {self.stats.repaints_per_second():.0f}/s",
+            f"{self.language.get('hud_items')}: {len(items)} / {len(self.view.items)}",
+            f"{self.language.get('hud_vertices')}: {vertices}",
+            self.format_timing(self.language.get("hud_scene_update"), "scene_update"),
+            self.format_timing(self.language.get("hud_event_filter"), "event_filter"),
+            self.format_timing(self.language.get("hud_picking"), "picking"),
+        ]
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        if self.parentWidget() is not None:
+            margin = 10
+            self.move(self.parentWidget().width() - self.width() - margin, margin)
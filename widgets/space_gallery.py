@@ -0,0 +1,455 @@
+import os
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView, QToolTip
+from PyQt6.QtCore import Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex, QPersistentModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen
+from components.space.photo_thumbnails import get_photo_thumbnails
+from components.space.thumbnail_renderer import get_thumbnail_renderer
+from widgets.space_preview import SpacePreview
+
+SPACE_ROLE = Qt.ItemDataRole.UserRole + 1  # The space dictionary
+IMAGES_ROLE = Qt.ItemDataRole.UserRole + 2  # Paths of the space photos
+IMAGE_INDEX_ROLE = Qt.ItemDataRole.UserRole + 3  # Photo currently shown in the card
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Colours of the blue theme (see styles/blue_theme.qss)
+CARD_COLORS = {
+    "card": QColor("#1a2733"),
+    "border": QColor("#415a77"),
+    "button": QColor("#2a3c50"),
+    "hover": QColor("#009999"),
+    "text": QColor("#f0f0f0"),
+    "delete": QColor("#8B0000"),
+    "delete_border": QColor("#B22222"),
+}
+
+class SpaceListModel(QAbstractListModel):
+    """List model of saved spaces shared by the galleries."""
+
+    def __init__(self, spaces_directory="spaces", parent=None):
+        super().__init__(parent)
+        self.spaces_directory = spaces_directory
+        self.spaces = []
+        self.rows = {}  # Space name -> row, so a single card can be refreshed without a scan
+        self.image_cache = {}  # Space name -> list of photo paths, scanned on first use
+        self.image_indexes = {}  # Space name -> photo shown in the card
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.spaces)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.spaces):
+            return None
+        space = self.spaces[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return space.get("name", "")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return space.get("description", "")
+        if role == SPACE_ROLE:
+            return space
+        if role == IMAGES_ROLE:
+            return self.images(space)
+        if role == IMAGE_INDEX_ROLE:
+            return self.image_indexes.get(space.get("name", ""), 0)
+        return None
+
+    def set_spaces(self, spaces, images=None):
+        """Replace the spaces shown by the model, optionally with their known photo paths by name."""
+        self.beginResetModel()
+        self.spaces = list(spaces)
+        self.rows = {}
+        self.index_rows()
+        self.image_cache = dict(images) if images else {}
+        self.endResetModel()
+
+    def append_spaces(self, spaces, images=None):
+        """Add spaces at the end of the model (used while a load is streaming in)."""
+        if not spaces:
+            return
+        first = len(self.spaces)
+        self.beginInsertRows(QModelIndex(), first, first + len(spaces) - 1)
+        self.spaces.extend(spaces)
+        self.index_rows(first)
+        if images:
+            self.image_cache.update(images)
+        self.endInsertRows()
+
+    def space(self, row):
+        return self.spaces[row]
+
+    def index_rows(self, first=0):
+        """Record the row of the spaces from first on (the first space of a name wins)."""
+        for row in range(first, len(self.spaces)):
+            self.rows.setdefault(self.spaces[row].get("name", ""), row)
+
+    def remove_space(self, name):
+        """Remove a space from the model by name."""
+        row = self.rows.get(name)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.spaces[row]
+        self.rows = {}
+        self.index_rows()  # The rows after the removed one moved up
+        self.image_cache.pop(name, None)
+        self.image_indexes.pop(name, None)
+        self.endRemoveRows()
+
+    def images(self, space):
+        """Return the photo paths of a space, scanning its images folder only once."""
+        name = space.get("name", "")
+        if name not in self.image_cache:
+            images_folder = os.path.join(self.spaces_directory, name, "images")
+            images = []
+            if os.path.isdir(images_folder):
+                images = [
+                    os.path.join(images_folder, img)
+                    for img in sorted(os.listdir(images_folder))
+                    if img.lower().endswith(IMAGE_EXTENSIONS)
+                ]
+            self.image_cache[name] = images
+        return self.image_cache[name]
+
+    def space_changed(self, name):
+        """Repaint the card of a space (e.g. once its preview has been rendered)."""
+        row = self.rows.get(name)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [SPACE_ROLE])
+
+    def step_image(self, row, step):
+        """Show the next (step=1) or previous (step=-1) photo of a space."""
+        space = self.spaces[row]
+        images = self.images(space)
+        if images:
+            name = space.get("name", "")
+            self.image_indexes[name] = (self.image_indexes.get(name, 0) + step) % len(images)
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [IMAGE_INDEX_ROLE])
+
+class SpaceFilterProxyModel(QSortFilterProxyModel):
+    """Shows only the spaces matched by the search index; the source rows are never rebuilt."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.matches = None  # Names of the visible spaces, None for all
+
+    def set_matches(self, matches):
+        """Show only the spaces whose name is in matches (None shows every space)."""
+        if matches == self.matches:
+            return
+        self.matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matches is None:
+            return True
+        return self.sourceModel().space(source_row).get("name", "") in self.matches
+
+def source_index(index):
+    """Map an index of a proxy model back to the SpaceListModel."""
+    model = index.model()
+    while isinstance(model, QSortFilterProxyModel):
+        index = model.mapToSource(index)
+        model = index.model()
+    return index
+
+class SpaceCardDelegate(QStyledItemDelegate):
+    """
+    Custom-painted card for a space in the properties gallery.
+
+    Only visible rows are painted; clicks are mapped to the card parts, so no
+    widgets are created per space. The preview becomes an interactive GL view
+    (a persistent editor) only when the user clicks it.
+    """
+    open_requested = pyqtSignal(dict)
+    delete_requested = pyqtSignal(dict)
+    preview_requested = pyqtSignal(QModelIndex)
+
+    margin = 10
+    spacing = 5
+    button_height = 36
+
+    def __init__(self, language, preview_size=200, parent=None):
+        super().__init__(parent)
+        self.language = language
+        self.preview_size = preview_size
+        self.hover_pos = None
+
+    def sizeHint(self, option, index):
+        return QSize(self.preview_size + 2 * self.margin, 2 * self.margin + 2 * self.spacing + 2 * self.button_height + self.preview_size)
+
+    def card_rects(self, rect):
+        """Return the rectangles of the card parts inside the item rectangle."""
+        inner = rect.adjusted(self.margin, self.margin, -self.margin, -self.margin)
+        top = inner.top()
+        name = QRect(inner.left(), top, inner.width(), self.button_height)
+        top += self.button_height + self.spacing
+        preview = QRect(inner.center().x() - self.preview_size // 2, top, self.preview_size, self.preview_size)
+        top += self.preview_size + self.spacing
+        delete = QRect(inner.left(), top, inner.width(), self.button_height)
+        return {"name": name, "preview": preview, "delete": delete}
+
+    def paint(self, painter, option, index):
+        space = index.data(SPACE_ROLE)
+        rects = self.card_rects(option.rect)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        self.draw_button(painter, rects["name"], space.get("name", "Unnamed Space"), CARD_COLORS["button"], CARD_COLORS["border"])
+        self.draw_preview(painter, rects["preview"], space)
+        self.draw_button(painter, rects["delete"], self.language.get("button_delete"), CARD_COLORS["delete"], CARD_COLORS["delete_border"])
+
+        painter.restore()
+
+    def draw_preview(self, painter, rect, space):
+        """Draw the cached offscreen preview of a space (a placeholder while it is being rendered)."""
+        pixmap = get_thumbnail_renderer().request(space, self.preview_size)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(rect, pixmap)
+        else:
+            painter.fillRect(rect, CARD_COLORS["card"])
+
+    def draw_button(self, painter, rect, text, fill, border, font_size=14):
+        """Draw a rounded button-like rectangle, highlighted when hovered."""
+        hovered = self.hover_pos is not None and rect.contains(self.hover_pos)
+        painter.setPen(QPen(border, 1))
+        painter.setBrush(CARD_COLORS["hover"] if hovered else fill)
+        painter.drawRoundedRect(rect, 6, 6)
+        painter.setPen(CARD_COLORS["text"])
+        painter.setFont(QFont("Poppins", font_size))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+    def part_tooltips(self):
+        """Return the tooltip of each clickable card part."""
+        return {
+            "name": self.language.get("tooltip_open_model"),
+            "preview": self.language.get("tooltip_interactive_preview"),
+        }
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            text = self.part_tooltips().get(self.part_at(option.rect, event.pos()))
+            if text:
+                QToolTip.showText(event.globalPos(), text, view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def part_at(self, rect, pos):
+        """Return the name of the card part under pos, or None."""
+        for name, part in self.card_rects(rect).items():
+            if part.contains(pos):
+                return name
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseMove:
+            self.hover_pos = event.position().toPoint()
+            return False
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            part = self.part_at(option.rect, event.position().toPoint())
+            if part is not None:
+                self.handle_click(part, index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def handle_click(self, part, index):
+        space = index.data(SPACE_ROLE)
+        if part == "name":
+            self.open_requested.emit(space)
+        elif part == "delete":
+            self.delete_requested.emit(space)
+        elif part == "preview":
+            self.preview_requested.emit(index)
+
+    def createEditor(self, parent, option, index):
+        """Create the interactive GL preview for a card."""
+        return SpacePreview(index.data(SPACE_ROLE), self.preview_size, self.language, parent, interactive=True)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(self.card_rects(option.rect)["preview"])
+
+class SpaceGalleryCardDelegate(SpaceCardDelegate):
+    """Larger card used by the space gallery, with a photo carousel and description."""
+    image_requested = pyqtSignal(str)
+
+    image_size = 200
+    arrow_width = 30
+    label_height = 32
+    description_height = 60
+
+    def __init__(self, language, preview_size=250, parent=None):
+        super().__init__(language, preview_size, parent)
+        self.spacing = 10
+
+    def sizeHint(self, option, index):
+        width = max(self.preview_size, self.image_size + 2 * (self.arrow_width + self.spacing)) + 2 * self.margin
+        height = (2 * self.margin + 5 * self.spacing + self.preview_size + self.image_size
+                  + self.label_height + self.description_height + self.button_height)
+        return QSize(width, height)
+
+    def card_rects(self, rect):
+        inner = rect.adjusted(self.margin, self.margin, -self.margin, -self.margin)
+        center_x = inner.center().x()
+        top = inner.top()
+        preview = QRect(center_x - self.preview_size // 2, top, self.preview_size, self.preview_size)
+        top += self.preview_size + self.spacing
+        image = QRect(center_x - self.image_size // 2, top, self.image_size, self.image_size)
+        previous = QRect(image.left() - self.spacing - self.arrow_width, top, self.arrow_width, self.image_size)
+        following = QRect(image.right() + 1 + self.spacing, top, self.arrow_width, self.image_size)
+        top += self.image_size + self.spacing
+        name = QRect(inner.left(), top, inner.width(), self.label_height)
+        top += self.label_height + self.spacing
+        description = QRect(inner.left(), top, inner.width(), self.description_height)
+        top += self.description_height + self.spacing
+        delete = QRect(inner.left(), top, inner.width(), self.button_height)
+        return {
+            "preview": preview, "image": image, "previous": previous, "next": following,
+            "name": name, "description": description, "delete": delete,
+        }
+
+    def paint(self, painter, option, index):
+        space = index.data(SPACE_ROLE)
+        rects = self.card_rects(option.rect)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Card frame
+        painter.setPen(QPen(CARD_COLORS["border"], 1))
+        painter.setBrush(CARD_COLORS["card"])
+        painter.drawRoundedRect(option.rect.adjusted(2, 2, -2, -2), 8, 8)
+
+        self.draw_preview(painter, rects["preview"], space)
+        self.draw_image(painter, rects["image"], index)
+        self.draw_button(painter, rects["previous"], "<", CARD_COLORS["button"], CARD_COLORS["border"])
+        self.draw_button(painter, rects["next"], ">", CARD_COLORS["button"], CARD_COLORS["border"])
+
+        painter.setPen(QPen(CARD_COLORS["border"], 1))
+        painter.setBrush(CARD_COLORS["card"])
+        painter.drawRoundedRect(rects["name"], 6, 6)
+        painter.drawRoundedRect(rects["description"], 6, 6)
+        painter.setPen(CARD_COLORS["text"])
+        painter.setFont(QFont("Poppins", 14))
+        painter.drawText(rects["name"], Qt.AlignmentFlag.AlignCenter, space.get("name", ""))
+        painter.setFont(QFont("Poppins", 12))
+        description = space.get("description") or self.language.get("label_no_description")
+        painter.drawText(rects["description"].adjusted(6, 6, -6, -6), Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, description)
+
+        self.draw_button(painter, rects["delete"], self.language.get("button_delete"), CARD_COLORS["button"], CARD_COLORS["border"])
+        painter.restore()
+
+    def draw_image(self, painter, rect, index):
+        """Draw the photo currently selected in the card carousel."""
+        painter.setPen(QPen(CARD_COLORS["border"], 1))
+        painter.setBrush(CARD_COLORS["card"])
+        painter.drawRoundedRect(rect, 6, 6)
+
+        images = index.data(IMAGES_ROLE)
+        if not images:
+            return
+        path = images[index.data(IMAGE_INDEX_ROLE) % len(images)]
+        pixmap = get_photo_thumbnails().thumbnail(path, self.image_size, self.image_size)
+        if pixmap is None:
+            # Placeholder until the background decode finishes and the view repaints
+            painter.setPen(CARD_COLORS["text"])
+            painter.setFont(QFont("Poppins", 12))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "...")
+            return
+        target = QRect(0, 0, pixmap.width(), pixmap.height())
+        target.moveCenter(rect.center())
+        painter.drawPixmap(target, pixmap)
+
+    def part_tooltips(self):
+        return {
+            "preview": self.language.get("tooltip_interactive_preview"),
+            "image": self.language.get("tooltip_open_image"),
+        }
+
+    def handle_click(self, part, index):
+        if part == "previous":
+            source = source_index(index)
+            source.model().step_image(source.row(), -1)
+        elif part == "next":
+            source = source_index(index)
+            source.model().step_image(source.row(), 1)
+        elif part == "image":
+            images = index.data(IMAGES_ROLE)
+            if images:
+                self.image_requested.emit(images[index.data(IMAGE_INDEX_ROLE) % len(images)])
+        elif part in ("delete", "preview"):
+            super().handle_click(part, index)
+
+class SpaceGalleryView(QListView):
+    """
+    Virtualized list of space cards.
+
+    Items have a uniform size, so only the cards inside the viewport are laid
+    out and painted, whatever the number of spaces. At most one card at a time
+    hosts an interactive GL preview.
+    """
+
+    def __init__(self, delegate, horizontal=False, parent=None):
+        super().__init__(parent)
+        self.setObjectName("spaceGallery")  # Use QSS styling
+        self.setItemDelegate(delegate)
+        delegate.preview_requested.connect(self.show_interactive_preview)
+        self.active_preview = None
+        self.hover_index = QPersistentModelIndex()
+        get_photo_thumbnails().thumbnail_ready.connect(self.photo_ready)
+        get_thumbnail_renderer().thumbnail_ready.connect(self.preview_ready)
+
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSpacing(5)
+        if horizontal:
+            self.setFlow(QListView.Flow.LeftToRight)
+            self.setWrapping(False)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.modelAboutToBeReset.connect(self.close_interactive_preview)
+
+    def show_interactive_preview(self, index):
+        """Open the interactive GL preview on a card, closing the previous one."""
+        self.close_interactive_preview()
+        self.active_preview = QPersistentModelIndex(index)
+        self.openPersistentEditor(index)
+
+    def close_interactive_preview(self):
+        if self.active_preview is not None:
+            if self.active_preview.isValid():
+                self.closePersistentEditor(QModelIndex(self.active_preview))
+            self.active_preview = None
+
+    def photo_ready(self, path, width, height):
+        """Repaint the visible cards once a photo thumbnail has been decoded."""
+        self.viewport().update()
+
+    def preview_ready(self, name, size):
+        """Repaint the card of a space once its offscreen preview is available."""
+        model = self.model()
+        while isinstance(model, QSortFilterProxyModel):
+            model = model.sourceModel()
+        if model is not None:
+            model.space_changed(name)
+
+    def update_hover(self, index):
+        """Repaint only the cards whose hover state changed."""
+        if self.hover_index.isValid():
+            self.viewport().update(self.visualRect(QModelIndex(self.hover_index)))
+        self.hover_index = QPersistentModelIndex(index)
+        if index.isValid():
+            self.viewport().update(self.visualRect(index))
+
+    def leaveEvent(self, event):
+        self.itemDelegate().hover_pos = None
+        self.update_hover(QModelIndex())
+        super().leaveEvent(event)
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        self.update_hover(self.indexAt(event.position().toPoint()))
@@ -0,0 +1,92 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QVector3D
+import pyqtgraph.opengl as gl
+from components.space.room_scene import RoomScene
+from components.space.space_model import SpaceModel
+from components.space.thumbnail_renderer import get_thumbnail_renderer, PREVIEW_CAMERA
+
+class SpacePreview(QWidget):
+    """
+    Gallery preview that shows a cached image and turns into a live 3D view when clicked.
+
+    With interactive=True the live view is shown at once and no image is rendered.
+    """
+
+    def __init__(self, space_data, size, language, parent=None, interactive=False):
+        super().__init__(parent)
+        self.space_data = space_data
+        self.language = language
+        self.preview_size = size
+        self.gl_view = None
+        self.image_label = None
+        self.waiting = False  # Connected to the renderer until the image is ready
+        self.setFixedSize(size, size)
+
+        self.preview_layout = QVBoxLayout(self)
+        self.preview_layout.setContentsMargins(0, 0, 0, 0)
+
+        if interactive:
+            self.activate()
+        else:
+            # Static image from the shared offscreen renderer, filled in once it is ready
+            self.image_label = QLabel()
+            self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.image_label.setCursor(Qt.CursorShape.PointingHandCursor)
+            self.preview_layout.addWidget(self.image_label)
+            renderer = get_thumbnail_renderer()
+            pixmap = renderer.request(space_data, size)
+            if pixmap is None:
+                renderer.thumbnail_ready.connect(self.thumbnail_ready)
+                self.waiting = True
+            else:
+                self.image_label.setPixmap(pixmap)
+
+        self.retranslate_ui()
+        language.language_changed.connect(self.retranslate_ui)
+
+    def thumbnail_ready(self, name, size):
+        """Show the rendered image once the renderer has it."""
+        if self.image_label is None or name != self.space_data.get("name", "") or size != self.preview_size:
+            return
+        renderer = get_thumbnail_renderer()
+        pixmap = renderer.request(self.space_data, self.preview_size)
+        if pixmap is not None:
+            self.stop_waiting()
+            self.image_label.setPixmap(pixmap)
+
+    def stop_waiting(self):
+        if self.waiting:
+            get_thumbnail_renderer().thumbnail_ready.disconnect(self.thumbnail_ready)
+            self.waiting = False
+
+    def retranslate_ui(self):
+        if self.gl_view is None:
+            self.image_label.setToolTip(self.language.get("tooltip_interactive_preview"))
+
+    def mousePressEvent(self, event):
+        """Switch to the interactive view on left click."""
+        if event.button() == Qt.MouseButton.LeftButton and self.gl_view is None:
+            self.activate()
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def activate(self):
+        """Replace the cached image with an interactive OpenGL view."""
+        self.gl_view = gl.GLViewWidget()
+        self.gl_view.setFixedSize(self.preview_size, self.preview_size)
+        self.gl_view.setCameraPosition(**PREVIEW_CAMERA)
+
+        # Plot the rooms and doors of the space in the OpenGL view
+        model = SpaceModel.from_dict(self.space_data)
+        self.scene = RoomScene(self.gl_view, model)
+        self.scene.refresh()
+        self.gl_view.opts['center'] = QVector3D(*model.center())
+
+        if self.image_label is not None:
+            self.stop_waiting()
+            self.preview_layout.removeWidget(self.image_label)
+            self.image_label.deleteLater()
+            self.image_label = None
+        self.preview_layout.addWidget(self.gl_view)